@@ -6,6 +6,7 @@ Versión 4.0 - Inicialización optimizada con splash screen
 """
 
 import sys
+import multiprocessing
 from pathlib import Path
 
 # Agregar el directorio raíz al path de Python
@@ -78,4 +79,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Necesario en el ejecutable de PyInstaller para los procesos trabajadores
+    # (optimización de PDF)
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
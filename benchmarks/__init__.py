@@ -0,0 +1 @@
+"""Benchmarks de rendimiento (sin interfaz gráfica)"""
@@ -0,0 +1,245 @@
+"""
+Benchmark de la capa de conversión a PDF sin MS Word.
+Usa FakeBackend: el motor Word real (reintentos, clasificación de errores,
+sesión con watchdog y pool de trabajadores) sobre una instancia de Word falsa
+con latencia, fallos y cuelgues simulados. Mide el costo de planificación de
+convert_batch frente al motor directo, la escala con trabajadores en paralelo
+y el costo de los fallos transitorios, permanentes y de los cuelgues.
+
+Uso:
+    python -m benchmarks.conversion [--docs 200] [--latency 0.01]
+        [--workers 1 2 4 8] [--failure-rates 0 0.1 0.3] [--permanent-rate 0.05]
+        [--hang 0.02] [--stuck 0.01] [--timeout 0.1] [--seed 0]
+        [--output resultados.json]
+"""
+
+import os
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List
+
+from benchmarks.pipeline import _git_commit
+from core.certificates.pdf_converter import PDFConverter
+from core.certificates.converter_backends import FakeBackend
+
+
+# Espera tras el primer fallo en el benchmark (la real es de segundos)
+RETRY_DELAY = 0.005
+
+# Contadores de la sesión de Word incluidos en cada resultado
+SESSION_STATS = ('started', 'discarded', 'abandoned')
+
+
+def _make_docs(folder: str, docs: int) -> List[str]:
+    """Docx vacíos: el motor falso no los lee, solo comprueba que existan"""
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for idx in range(docs):
+        path = os.path.join(folder, f"Certificado_{idx:05d}.docx")
+        open(path, 'wb').close()
+        paths.append(path)
+    return paths
+
+
+def _measure(backend: FakeBackend, word_files: List[str], pdf_folder: str,
+             workers: int, retry: int = 3) -> Dict[str, Any]:
+    """
+    Ejecuta convert_batch y resume tiempos y contadores.
+    
+    Returns:
+        Segundos, documentos por segundo, exitosos, fallidos, intentos,
+        timeouts, instancias de Word y trabajadores reemplazados
+    """
+    shutil.rmtree(pdf_folder, ignore_errors=True)
+    converter = PDFConverter(backend=backend, workers=workers)
+    
+    start = time.perf_counter()
+    results = converter.convert_batch(
+        os.path.dirname(word_files[0]),
+        pdf_folder,
+        progress_callback=lambda *args: None,
+        retry=retry,
+        word_files=word_files
+    )
+    seconds = time.perf_counter() - start
+    
+    description = results['backend'] or {}
+    session = description.get('word_session') or {}
+    
+    return {
+        'workers': converter.workers,
+        'seconds': round(seconds, 4),
+        'docs_per_second': round(len(word_files) / seconds, 2) if seconds else 0.0,
+        'exitosos': results['exitosos'],
+        'fallidos': results['fallidos'],
+        'permanentes': sum(1 for error in results['errores'] if error.get('tipo') == 'permanente'),
+        'intentos': description.get('intentos', 0),
+        'timeouts': results['timeouts'],
+        **{f'word_{key}': session.get(key, 0) for key in SESSION_STATS},
+        'trabajadores_reemplazados': sum(1 for health in results['workers']
+                                         if health['estado'] == 'abandonado')
+    }
+
+
+def bench_overhead(word_files: List[str], work_folder: str) -> Dict[str, Any]:
+    """Costo por documento de convert_batch y del pool con un motor sin latencia"""
+    pdf_folder = os.path.join(work_folder, "pdf_directo")
+    os.makedirs(pdf_folder)
+    items = [(path, os.path.join(pdf_folder, os.path.basename(path)[:-5] + '.pdf'))
+             for path in word_files]
+    
+    start = time.perf_counter()
+    for _ in FakeBackend().convert_many(items):
+        pass
+    direct = time.perf_counter() - start
+    
+    sequential = _measure(FakeBackend(), word_files, os.path.join(work_folder, "pdf_1"), 1)
+    pooled = _measure(FakeBackend(), word_files, os.path.join(work_folder, "pdf_4"), 4)
+    docs = len(word_files)
+    
+    return {
+        'direct_ms_per_doc': round(direct / docs * 1000, 4),
+        'batch_ms_per_doc': round(sequential['seconds'] / docs * 1000, 4),
+        'pool_ms_per_doc': round(pooled['seconds'] / docs * 1000, 4),
+        'batch_overhead_ms_per_doc': round((sequential['seconds'] - direct) / docs * 1000, 4)
+    }
+
+
+def bench_scaling(word_files: List[str], work_folder: str, latency: float,
+                  workers_list: List[int]) -> List[Dict[str, Any]]:
+    """Tiempo con latencia fija por documento según el número de trabajadores"""
+    results = []
+    base = None
+    
+    for workers in workers_list:
+        result = _measure(FakeBackend(latency=latency), word_files,
+                          os.path.join(work_folder, f"pdf_w{workers}"), workers)
+        base = base or result['seconds']
+        result['speedup'] = round(base / result['seconds'], 2) if result['seconds'] else 0.0
+        result['efficiency'] = round(result['speedup'] / result['workers'], 2)
+        results.append(result)
+    
+    return results
+
+
+def bench_failures(word_files: List[str], work_folder: str, latency: float, workers: int,
+                   failure_rates: List[float], permanent_rate: float, hang: float,
+                   stuck: float, timeout: float, seed: int) -> List[Dict[str, Any]]:
+    """
+    Costo de los fallos: transitorios (reintentos con backoff), permanentes
+    (sin reintento), cuelgues que el watchdog termina y cuelgues que no
+    pueden terminarse (el pool abandona y reemplaza al trabajador).
+    """
+    scenarios = [{'failure_rate': rate} for rate in failure_rates]
+    if permanent_rate:
+        scenarios.append({'permanent_rate': permanent_rate})
+    if hang:
+        scenarios.append({'hang_probability': hang})
+    if stuck:
+        scenarios.append({'hang_probability': stuck, 'killable': False})
+    
+    results = []
+    base = None
+    
+    for idx, scenario in enumerate(scenarios):
+        backend = FakeBackend(latency=latency, seed=seed, timeout=timeout,
+                              retry_delay=RETRY_DELAY, **scenario)
+        result = _measure(backend, word_files, os.path.join(work_folder, f"pdf_s{idx}"), workers)
+        base = base or result['seconds']
+        result['escenario'] = scenario
+        result['overhead_pct'] = round((result['seconds'] / base - 1) * 100, 1) if base else 0.0
+        results.append(result)
+    
+    return results
+
+
+def run(docs: int, latency: float, workers_list: List[int], failure_rates: List[float],
+        permanent_rate: float, hang: float, stuck: float, timeout: float,
+        seed: int) -> Dict[str, Any]:
+    """
+    Ejecuta el benchmark completo en una carpeta temporal.
+    
+    Args:
+        docs: Documentos por escenario
+        latency: Segundos por conversión en los escenarios de escala y reintentos
+        workers_list: Trabajadores a medir
+        failure_rates: Probabilidades de fallo transitorio por intento
+        permanent_rate: Probabilidad de fallo permanente (0 = sin escenario)
+        hang: Probabilidad de cuelgue por intento (0 = sin escenario de cuelgues)
+        stuck: Probabilidad de cuelgue que no puede terminarse (0 = sin escenario)
+        timeout: Segundos máximos por documento (watchdog)
+        seed: Semilla de los fallos simulados
+    
+    Returns:
+        Resultados con metadatos del entorno para comparar entre commits
+    """
+    work_root = tempfile.mkdtemp(prefix="bench_conversion_")
+    
+    try:
+        word_files = _make_docs(os.path.join(work_root, "word"), docs)
+        overhead = bench_overhead(word_files, work_root)
+        scaling = bench_scaling(word_files, work_root, latency, workers_list)
+        failures = bench_failures(word_files, work_root, latency, max(workers_list),
+                                  failure_rates, permanent_rate, hang, stuck, timeout, seed)
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+    
+    return {
+        'benchmark': 'conversion',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'params': {
+            'docs': docs,
+            'latency': latency,
+            'timeout': timeout,
+            'retry_delay': RETRY_DELAY,
+            'seed': seed
+        },
+        'overhead': overhead,
+        'scaling': scaling,
+        'failures': failures
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de la conversión a PDF (motor falso)")
+    parser.add_argument('--docs', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.01,
+                        help="Segundos por conversión simulada")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--failure-rates', type=float, nargs='+', default=[0.0, 0.1, 0.3],
+                        help="Probabilidades de fallo transitorio por intento")
+    parser.add_argument('--permanent-rate', type=float, default=0.05,
+                        help="Probabilidad de fallo permanente por intento (0 = omitir)")
+    parser.add_argument('--hang', type=float, default=0.02,
+                        help="Probabilidad de cuelgue por intento (0 = omitir)")
+    parser.add_argument('--stuck', type=float, default=0.01,
+                        help="Probabilidad de cuelgue que kill() no termina (0 = omitir)")
+    parser.add_argument('--timeout', type=float, default=0.1,
+                        help="Segundos máximos por documento (watchdog)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None,
+                        help="Archivo JSON de resultados (por defecto solo se imprime)")
+    args = parser.parse_args()
+    
+    report = run(args.docs, args.latency, args.workers, args.failure_rates,
+                 args.permanent_rate, args.hang, args.stuck, args.timeout, args.seed)
+    content = json.dumps(report, indent=2, ensure_ascii=False)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(content)
+    
+    print(content)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+"""
+Benchmark y control de regresiones del ETL.
+Genera exports RAW sintéticos, mide cada paso de ETLService y el
+procesar_completo, registra el pico de memoria y compara contra una línea
+base guardada. Termina con código 1 si hay regresión o si ningún tamaño medido
+tiene línea base (2 si el ETL falla); los tamaños o pasos sin comparar se avisan.
+
+Uso:
+    python -m benchmarks.etl [--rows 10000 100000] [--format xlsx|parquet]
+                             [--baseline base.json] [--tolerance 0.25]
+                             [--save-baseline base.json] [--output resultados.json]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.synthetic import make_raw_export_df, write_raw_export
+from benchmarks.pipeline import _git_commit
+from core.etl.etl_service import ETLService
+
+
+DEFAULT_SIZES = [10000, 100000]
+
+# Pasos más rápidos que esto no se comparan (ruido de medición)
+MIN_SECONDS = 0.05
+
+
+def _run_etl(input_path: str, output_folder: str) -> Dict[str, Any]:
+    """Ejecuta el ETL completo y retorna sus estadísticas (falla si el ETL falla)"""
+    service = ETLService()
+    exito, mensaje, estadisticas = service.procesar_completo(input_path, output_folder)
+    if not exito:
+        raise RuntimeError(mensaje)
+    return estadisticas
+
+
+def run_size(rows: int, file_format: str, work_folder: str, repeat: int = 1) -> Dict[str, Any]:
+    """
+    Mide el ETL para un tamaño de export.
+    
+    Args:
+        rows: Filas del export RAW
+        file_format: 'xlsx' o 'parquet'
+        work_folder: Carpeta temporal de trabajo
+        repeat: Repeticiones de la medición de tiempos (se toma el mejor)
+    
+    Returns:
+        Tiempos por paso, tiempo total, pico de memoria y registros
+    """
+    input_path = write_raw_export(
+        make_raw_export_df(rows),
+        os.path.join(work_folder, f"raw_{rows}.{file_format}")
+    )
+    output_folder = os.path.join(work_folder, "clean")
+    
+    # Tiempos sin tracemalloc (que ralentiza las asignaciones)
+    best_total = None
+    stages: Dict[str, float] = {}
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        estadisticas = _run_etl(input_path, output_folder)
+        total = time.perf_counter() - start
+        
+        best_total = total if best_total is None else min(best_total, total)
+        for stage, seconds in estadisticas['tiempos_etapas'].items():
+            stages[stage] = min(stages.get(stage, seconds), seconds)
+    
+    # Pico de memoria en una ejecución aparte
+    tracemalloc.start()
+    try:
+        _run_etl(input_path, output_folder)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        'rows': rows,
+        'format': file_format,
+        'registros_finales': estadisticas['registros_finales'],
+        'total_seconds': round(best_total, 4),
+        'peak_memory_mb': round(peak / (1024 * 1024), 2),
+        'stages': stages
+    }
+
+
+def run(sizes: List[int], file_format: str = 'xlsx', repeat: int = 1) -> Dict[str, Any]:
+    """
+    Ejecuta el benchmark para cada tamaño en una carpeta temporal.
+    
+    Args:
+        sizes: Filas de cada export
+        file_format: 'xlsx' o 'parquet'
+        repeat: Repeticiones por tamaño
+    
+    Returns:
+        Resultados con metadatos del entorno
+    """
+    work_root = tempfile.mkdtemp(prefix="bench_etl_")
+    
+    try:
+        results = [run_size(rows, file_format, work_root, repeat) for rows in sizes]
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+    
+    return {
+        'benchmark': 'etl',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+
+
+def compare(current: Dict[str, Any],
+            baseline: Dict[str, Any],
+            tolerance: float,
+            min_seconds: float = MIN_SECONDS) -> Tuple[List[str], List[str]]:
+    """
+    Compara resultados contra la línea base.
+    
+    Args:
+        current: Resultados de esta ejecución
+        baseline: Resultados guardados
+        tolerance: Aumento relativo admitido (0.25 = 25%)
+        min_seconds: Tiempo base mínimo para comparar un paso
+    
+    Returns:
+        Tupla (regresiones, avisos). Si ningún tamaño medido tiene línea base
+        se reporta como regresión: la comparación no habría verificado nada
+    """
+    base_by_key = {(r['rows'], r['format']): r for r in baseline.get('results', [])}
+    regresiones = []
+    avisos = []
+    comparados = 0
+    
+    for result in current['results']:
+        etiqueta = f"{result['rows']} filas ({result['format']})"
+        base = base_by_key.pop((result['rows'], result['format']), None)
+        if base is None:
+            avisos.append(f"{etiqueta}: sin línea base, no se compara")
+            continue
+        comparados += 1
+        
+        metricas = [('total', base['total_seconds'], result['total_seconds'], 's')]
+        metricas += [
+            (stage, seconds, result['stages'].get(stage), 's')
+            for stage, seconds in base['stages'].items()
+        ]
+        metricas.append(('peak_memory', base['peak_memory_mb'], result['peak_memory_mb'], 'MB'))
+        
+        for nombre, anterior, actual, unidad in metricas:
+            if actual is None:
+                avisos.append(f"{etiqueta} {nombre}: no se midió en esta ejecución")
+                continue
+            if unidad == 's' and anterior < min_seconds:
+                continue
+            if actual > anterior * (1 + tolerance):
+                regresiones.append(
+                    f"{etiqueta} {nombre}: {anterior} -> {actual} {unidad} "
+                    f"(+{(actual / anterior - 1) * 100:.0f}%)"
+                )
+    
+    for rows, fmt in base_by_key:
+        avisos.append(f"{rows} filas ({fmt}): en la línea base pero no medido")
+    
+    if current['results'] and comparados == 0:
+        regresiones.append("Ningún tamaño medido tiene línea base (revise --rows y --format)")
+    
+    return regresiones, avisos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark y regresiones del ETL")
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--format', choices=['xlsx', 'parquet'], default='xlsx')
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--baseline', default=None,
+                        help="JSON de línea base con el que comparar")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Aumento relativo admitido antes de fallar (0.25 = 25%%)")
+    parser.add_argument('--min-seconds', type=float, default=MIN_SECONDS)
+    parser.add_argument('--save-baseline', default=None,
+                        help="Guarda los resultados como nueva línea base")
+    parser.add_argument('--output', default=None, help="Archivo JSON de resultados")
+    args = parser.parse_args()
+    
+    try:
+        report = run(args.rows, args.format, args.repeat)
+    except Exception as e:
+        print(f"Error en el benchmark ETL: {e}", file=sys.stderr)
+        sys.exit(2)
+    
+    content = json.dumps(report, indent=2, ensure_ascii=False)
+    print(content)
+    
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+    
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        
+        regresiones, avisos = compare(report, baseline, args.tolerance, args.min_seconds)
+        for aviso in avisos:
+            print(f"AVISO: {aviso}", file=sys.stderr)
+        for regresion in regresiones:
+            print(f"REGRESIÓN: {regresion}", file=sys.stderr)
+        
+        if regresiones:
+            sys.exit(1)
+        print(f"Sin regresiones (tolerancia {args.tolerance:.0%})", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
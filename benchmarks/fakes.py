@@ -0,0 +1,13 @@
+"""
+Dobles de prueba para benchmarks sin MS Word.
+"""
+
+from core.certificates.pdf_converter import PDFConverter
+from core.certificates.converter_backends import FakeWordAutomation
+
+
+class FakePDFConverter(PDFConverter):
+    """Conversor con la sesión de Word sustituida por FakeWordAutomation"""
+    
+    def __init__(self, recycle_after=None):
+        super().__init__(automation_factory=FakeWordAutomation, recycle_after=recycle_after)
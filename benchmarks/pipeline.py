@@ -0,0 +1,184 @@
+"""
+Benchmark del pipeline de certificados con datos y plantilla sintéticos.
+Mide generate_batch, la asignación de nombres de archivo, el reporte JSON y
+convert_batch con un conversor falso, sin MS Word ni interfaz gráfica.
+
+Uso:
+    python -m benchmarks.pipeline [--rows 100 1000 10000] [--output resultados.json]
+"""
+
+import os
+import json
+import time
+import shutil
+import argparse
+import platform
+import subprocess
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from benchmarks.synthetic import make_certificates_df, make_template
+from benchmarks.fakes import FakePDFConverter
+from core.certificates.batch_processor import CertificateBatchProcessor
+from core.certificates.template_cache import TemplateCache
+from core.certificates.word_generator import WordCertificateGenerator
+
+
+DEFAULT_SIZES = [100, 1000, 10000]
+
+
+def _git_commit() -> Optional[str]:
+    """Commit actual del repositorio (None si no hay git)"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _stage(seconds: float, rows: int) -> Dict[str, float]:
+    """Resultado de una etapa: segundos totales, ms por fila y filas por segundo"""
+    return {
+        'seconds': round(seconds, 4),
+        'ms_per_row': round(seconds / rows * 1000, 4) if rows else 0.0,
+        'rows_per_second': round(rows / seconds, 2) if seconds else 0.0
+    }
+
+
+def _assign_filenames(generator: WordCertificateGenerator, df, folder: str) -> int:
+    """Asignación de nombres como en generate_batch (sanitización + duplicados)"""
+    reservadas = set()
+    nombres_sanitizados = generator._sanitize_filenames(df['APELLIDOS Y NOMBRES'])
+    
+    for nombre in nombres_sanitizados:
+        path = generator._handle_duplicate_filename(
+            folder,
+            f"Certificado_{nombre}",
+            exists=lambda candidate: candidate in reservadas or os.path.exists(candidate)
+        )
+        reservadas.add(path)
+    
+    return len(reservadas)
+
+
+def run_size(rows: int, template_path: str, work_folder: str) -> Dict[str, Any]:
+    """
+    Ejecuta todas las etapas para un tamaño de lote.
+    
+    Args:
+        rows: Número de filas sintéticas
+        template_path: Plantilla generada
+        work_folder: Carpeta temporal de trabajo
+    
+    Returns:
+        Diccionario con los tiempos de cada etapa
+    """
+    df = make_certificates_df(rows)
+    generator = WordCertificateGenerator(template_path)
+    stages = {}
+    
+    processor = CertificateBatchProcessor(template_path, work_folder)
+    word_folder = processor.word_folder
+    pdf_folder = processor.pdf_folder
+    
+    # Asignación de nombres de archivo
+    start = time.perf_counter()
+    _assign_filenames(generator, df, word_folder)
+    stages['filenames'] = _stage(time.perf_counter() - start, rows)
+    
+    # Generación Word (render + escritura)
+    start = time.perf_counter()
+    word_results = generator.generate_batch(df, word_folder)
+    stages['generate_batch'] = _stage(time.perf_counter() - start, rows)
+    stages['generate_batch']['exitosos'] = word_results['exitosos']
+    
+    # Conversión con conversor falso (mide el bucle, la E/S y el callback)
+    converter = FakePDFConverter()
+    start = time.perf_counter()
+    pdf_results = converter.convert_batch(
+        word_folder,
+        pdf_folder,
+        progress_callback=lambda *args: None,
+        word_files=word_results['archivos_generados']
+    )
+    stages['convert_batch'] = _stage(time.perf_counter() - start, rows)
+    stages['convert_batch']['exitosos'] = pdf_results['exitosos']
+    
+    # Reporte JSON final
+    results = {
+        'success': True,
+        'input_records': rows,
+        'word_results': word_results,
+        'pdf_results': pdf_results,
+        'total_time': 0,
+        'errors': []
+    }
+    start = time.perf_counter()
+    processor._generate_report_json(results, processor._validate_options({}))
+    stages['report'] = _stage(time.perf_counter() - start, rows)
+    
+    return {'rows': rows, 'stages': stages}
+
+
+def run(sizes: List[int]) -> Dict[str, Any]:
+    """
+    Ejecuta el benchmark completo en una carpeta temporal.
+    
+    Args:
+        sizes: Números de filas a medir
+    
+    Returns:
+        Resultados con metadatos del entorno para comparar entre commits
+    """
+    work_root = tempfile.mkdtemp(prefix="bench_pipeline_")
+    
+    try:
+        template_path = make_template(os.path.join(work_root, "plantilla.docx"))
+        
+        TemplateCache.clear()
+        start = time.perf_counter()
+        TemplateCache.get(template_path)
+        template_load = time.perf_counter() - start
+        
+        results = []
+        for rows in sizes:
+            size_folder = os.path.join(work_root, f"rows_{rows}")
+            os.makedirs(size_folder)
+            results.append(run_size(rows, template_path, size_folder))
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+    
+    return {
+        'benchmark': 'pipeline',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'template_load_seconds': round(template_load, 4),
+        'results': results
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline de certificados")
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--output', default=None,
+                        help="Archivo JSON de resultados (por defecto solo se imprime)")
+    args = parser.parse_args()
+    
+    report = run(args.rows)
+    content = json.dumps(report, indent=2, ensure_ascii=False)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(content)
+    
+    print(content)
+
+
+if __name__ == '__main__':
+    main()
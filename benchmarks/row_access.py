@@ -0,0 +1,91 @@
+"""
+Micro-benchmark del acceso a filas en generate_batch.
+Compara el camino por filas (iterrows + diccionario por fila + sanitización
+por llamada) con el camino por columnas, sin incluir el renderizado.
+
+Uso:
+    python -m benchmarks.row_access [--rows 1000 10000] [--repeat 3]
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List
+
+from benchmarks.synthetic import make_certificates_df
+from core.certificates.word_generator import WordCertificateGenerator
+
+
+def _row_path(generator: WordCertificateGenerator, df) -> int:
+    """Camino por filas (implementación anterior de generate_batch)"""
+    count = 0
+    for _, row in df.iterrows():
+        apellidos_nombres = row.get('APELLIDOS Y NOMBRES', 'SIN_NOMBRE')
+        generator._sanitize_filename(apellidos_nombres)
+        generator._prepare_data_dict(row)
+        count += 1
+    return count
+
+
+def _columnar_path(generator: WordCertificateGenerator, df) -> int:
+    """Camino por columnas (implementación actual de generate_batch)"""
+    count = 0
+    nombres = df['APELLIDOS Y NOMBRES']
+    sanitizados = generator._sanitize_filenames(nombres)
+    for _ in zip(nombres.tolist(), sanitizados, generator._iter_data_dicts(df)):
+        count += 1
+    return count
+
+
+def _best_time(func, generator, df, repeat: int) -> float:
+    """Mejor tiempo (segundos) entre varias repeticiones"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(generator, df)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: List[int], repeat: int = 3) -> List[Dict[str, float]]:
+    """
+    Ejecuta el benchmark para cada tamaño.
+    
+    Args:
+        sizes: Números de filas a medir
+        repeat: Repeticiones por medición
+    
+    Returns:
+        Lista de resultados por tamaño (microsegundos por fila)
+    """
+    # El acceso a filas no necesita la plantilla cargada
+    generator = WordCertificateGenerator.__new__(WordCertificateGenerator)
+    
+    results = []
+    for rows in sizes:
+        df = make_certificates_df(rows)
+        por_filas = _best_time(_row_path, generator, df, repeat)
+        por_columnas = _best_time(_columnar_path, generator, df, repeat)
+        
+        results.append({
+            'rows': rows,
+            'row_path_us_per_row': round(por_filas / rows * 1e6, 2),
+            'columnar_us_per_row': round(por_columnas / rows * 1e6, 2),
+            'speedup': round(por_filas / por_columnas, 1) if por_columnas else None
+        })
+    
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmark de acceso a filas")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    for result in run(args.rows, args.repeat):
+        print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""
+Datos sintéticos para benchmarks.
+Genera DataFrames con la estructura de los datos limpios de certificados.
+"""
+
+import random
+import numpy as np
+import pandas as pd
+from docx import Document
+
+
+APELLIDOS = ['PÉREZ', 'GÓMEZ', 'QUISPE', 'MAMANI', 'RODRÍGUEZ', 'FLORES',
+             'HUAMÁN', 'SÁNCHEZ', 'DÍAZ', 'TORRES', 'ROJAS', 'VARGAS']
+NOMBRES = ['JUAN', 'MARÍA', 'JOSÉ', 'ROSA', 'LUIS', 'ANA', 'CARLOS', 'CARMEN']
+CARGOS = ['OPERARIO', 'AUXILIAR', 'SUPERVISOR', 'TÉCNICO', 'ASISTENTE']
+CLIENTES = ['CLIENTE A', 'CLIENTE B', 'CLIENTE C', 'CLIENTE D']
+MESES = ['ENERO', 'FEBRERO', 'MARZO', 'ABRIL', 'MAYO', 'JUNIO']
+
+
+def make_certificates_df(rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Genera un DataFrame sintético de certificados.
+    Incluye nombres repetidos y caracteres inválidos para archivos para
+    ejercitar el manejo de duplicados y la sanitización.
+    
+    Args:
+        rows: Número de filas
+        seed: Semilla del generador aleatorio
+    
+    Returns:
+        DataFrame con las columnas requeridas y de filtrado
+    """
+    rnd = random.Random(seed)
+    
+    nombres = []
+    for i in range(rows):
+        nombre = f"{rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}  {rnd.choice(NOMBRES)}"
+        if i % 50 == 0:
+            nombre += ' / "ALIAS"'
+        nombres.append(nombre)
+    
+    meses = [rnd.choice(MESES) for _ in range(rows)]
+    
+    return pd.DataFrame({
+        'DNI': [f"{rnd.randint(10000000, 99999999)}" for _ in range(rows)],
+        'APELLIDOS Y NOMBRES': nombres,
+        'FECHAS_CERTIFICADO': [f"01 de {m.lower()} de 2025 al 28 de {m.lower()} de 2025"
+                               for m in meses],
+        'DÍAS_LABORADOS': [rnd.randint(1, 31) for _ in range(rows)],
+        'CARGO': [rnd.choice(CARGOS) for _ in range(rows)],
+        'CLIENTE': [rnd.choice(CLIENTES) for _ in range(rows)],
+        'MES_ANALIZADO': meses,
+        'FECHA_GENERAR': ['15 de julio de 2025'] * rows
+    })
+
+
+def make_template(path: str) -> str:
+    """
+    Genera una plantilla Word de prueba con todos los placeholders del
+    generador en el cuerpo, una tabla y el encabezado.
+    
+    Args:
+        path: Ruta del .docx a crear
+    
+    Returns:
+        Ruta de la plantilla generada
+    """
+    doc = Document()
+    
+    doc.sections[0].header.paragraphs[0].text = "Certificado para {{CLIENTE}}"
+    
+    doc.add_heading("CERTIFICADO DE TRABAJO", level=1)
+    doc.add_paragraph(
+        "Se certifica que {{APELLIDOS_Y_NOMBRES}} laboró en el cargo de "
+        "{{CARGO}} durante {{DÍAS_LABORADOS}} días, del {{FECHAS_CERTIFICADO}}."
+    )
+    
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Cliente"
+    table.cell(0, 1).text = "{{CLIENTE}}"
+    table.cell(1, 0).text = "Cargo"
+    table.cell(1, 1).text = "{{CARGO}}"
+    
+    doc.add_paragraph("Lima, {{FECHA_GENERAR}}")
+    doc.save(path)
+    
+    return path
+
+
+# Columnas del export RAW que el ETL descarta
+COLUMNAS_EXTRA_RAW = ['N°', 'AREA', 'SEDE', 'ESTADO', 'OBSERVACIONES']
+
+# Valores sucios de fecha presentes en los exports reales
+FECHAS_SUCIAS = ['', '-', 'nan', '31/02/2025', 'PENDIENTE']
+
+
+def make_raw_export_df(rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Genera un export RAW sintético con distribuciones realistas: varias
+    contrataciones por persona, renovaciones contiguas, contratos de varios
+    meses, duplicados, anulados, nulos y fechas sucias.
+    
+    Args:
+        rows: Número de filas
+        seed: Semilla del generador aleatorio
+    
+    Returns:
+        DataFrame de texto con las columnas del export (requeridas y extra)
+    """
+    rng = np.random.default_rng(seed)
+    
+    # Unas tres contrataciones por persona en promedio
+    personas = max(1, rows // 3)
+    persona = rng.integers(0, personas, rows)
+    
+    # Duración: mayoría dentro del mes, una parte de 1 a 6 meses
+    tramo = rng.random(rows)
+    duracion = np.where(
+        tramo < 0.7, rng.integers(5, 31, rows),
+        np.where(tramo < 0.9, rng.integers(31, 91, rows), rng.integers(91, 181, rows))
+    )
+    inicio = (np.datetime64('2024-01-01')
+              + rng.integers(0, 540, rows).astype('timedelta64[D]'))
+    
+    # Renovaciones contiguas: la fila continúa el contrato anterior de la misma persona
+    renovacion = np.zeros(rows, dtype=bool)
+    renovacion[1:] = rng.random(rows - 1) < 0.15
+    idx = np.flatnonzero(renovacion)
+    persona[idx] = persona[idx - 1]
+    fin = inicio + (duracion - 1).astype('timedelta64[D]')
+    inicio[idx] = fin[idx - 1] + np.timedelta64(1, 'D')
+    fin[idx] = inicio[idx] + (duracion[idx] - 1).astype('timedelta64[D]')
+    
+    # Fin anterior al inicio (fecha lógicamente inválida)
+    invertidas = rng.random(rows) < 0.005
+    inicio[invertidas], fin[invertidas] = fin[invertidas], inicio[invertidas]
+    
+    # Fechas como texto dd/mm/aaaa (un solo formato por columna: pandas infiere
+    # el formato del primer valor y descarta los que no coinciden)
+    inicio_txt = pd.Series(pd.to_datetime(inicio)).dt.strftime('%d/%m/%Y')
+    fin_txt = pd.Series(pd.to_datetime(fin)).dt.strftime('%d/%m/%Y')
+    
+    sucias = rng.random(rows) < 0.01
+    inicio_txt[sucias] = rng.choice(FECHAS_SUCIAS, sucias.sum())
+    
+    apellido_1 = np.array(APELLIDOS)[persona % len(APELLIDOS)]
+    apellido_2 = np.array(APELLIDOS)[(persona // len(APELLIDOS)) % len(APELLIDOS)]
+    nombre = np.array(NOMBRES)[(persona // 144) % len(NOMBRES)]
+    nombres = pd.Series(apellido_1).str.cat([apellido_2, nombre], sep=' ')
+    
+    anulados = rng.random(rows) < 0.01
+    nombres[anulados] = rng.choice([
+        "ANULACION ADENDA DE RESOLUCION", "ANULACION RESOLUCION",
+        "ANULADO", "ANULADO RESOLUCION"
+    ], anulados.sum())
+    
+    dnis = pd.Series((10000000 + persona).astype(str), dtype=object)
+    dnis[rng.random(rows) < 0.005] = None
+    
+    df = pd.DataFrame({
+        'N°': np.arange(1, rows + 1).astype(str),
+        'DNI': dnis,
+        'APELLIDOS Y NOMBRES': nombres,
+        'INICIO CONTRATO': inicio_txt,
+        'FIN CONTRATO': fin_txt,
+        'CLIENTE': np.array(CLIENTES)[persona % len(CLIENTES)],
+        'CARGO': np.array(CARGOS)[(persona // 3) % len(CARGOS)],
+        'AREA': rng.choice(['OPERACIONES', 'ADMINISTRACIÓN', 'LOGÍSTICA'], rows),
+        'SEDE': rng.choice(['LIMA', 'AREQUIPA', 'TRUJILLO', 'PIURA'], rows),
+        'ESTADO': rng.choice(['VIGENTE', 'CESADO'], rows),
+        'OBSERVACIONES': ''
+    })
+    
+    # Duplicados exactos (reenvíos del mismo registro)
+    duplicados = rng.random(rows) < 0.02
+    origen = rng.integers(0, rows, duplicados.sum())
+    df.loc[duplicados, df.columns[1:]] = df.iloc[origen, 1:].values
+    
+    return df
+
+
+def write_raw_export(df: pd.DataFrame, path: str) -> str:
+    """
+    Escribe el export RAW en .xlsx o .parquet según la extensión.
+    El formato parquet requiere pyarrow o fastparquet.
+    
+    Args:
+        df: DataFrame generado por make_raw_export_df
+        path: Ruta de salida
+    
+    Returns:
+        Ruta escrita
+    """
+    if path.lower().endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_excel(path, index=False, engine='openpyxl')
+    return path
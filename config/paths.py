@@ -59,6 +59,16 @@ class AppPaths:
         """Carpeta data/templates/ para plantillas .docx"""
         return AppPaths.get_data_dir() / "templates"
     
+    @staticmethod
+    def get_cache_dir() -> Path:
+        """Carpeta data/cache/ para la caché de certificados renderizados"""
+        return AppPaths.get_data_dir() / "cache"
+    
+    @staticmethod
+    def get_state_dir() -> Path:
+        """Carpeta data/state/ para estado persistente (fuera del desalojo de la caché)"""
+        return AppPaths.get_data_dir() / "state"
+    
     @staticmethod
     def get_icons_dir() -> Path:
         """Carpeta gui/resources/ dentro del bundle"""
@@ -58,7 +58,8 @@ class CertificateWorker(QThread):
             # Crear procesador batch
             processor = CertificateBatchProcessor(
                 template_path=self.template_path,
-                output_base_folder=self.output_folder
+                output_base_folder=self.output_folder,
+                resume_folder=self.options.get('resume_folder')
             )
             
             # Callback para progreso
@@ -436,6 +437,14 @@ class CertificatesController(QObject):
                 self.error_occurred.emit("Error de Plantilla", error_msg)
                 return False
             
+            # Analizar la plantilla una sola vez: validador y generadores
+            # reutilizan la versión en caché mientras el archivo no cambie
+            success, placeholders = CertificateValidator.validate_template_placeholders(path)
+            if success:
+                self.logger.info(f"Placeholders de plantilla: {', '.join(placeholders)}")
+            else:
+                self.logger.warning(placeholders[0])
+            
             self.template_path = path
             self.logger.info(f"Plantilla establecida: {os.path.basename(path)}")
             return True
@@ -478,7 +487,8 @@ class CertificatesController(QObject):
         Inicia generación en thread separado.
         
         Args:
-            options: Opciones de generación {generate_word, convert_pdf, cleanup_word}
+            options: Opciones de generación {generate_word, convert_pdf, cleanup_word,
+                     resume_folder}
         """
         try:
             # Validaciones previas
@@ -0,0 +1,184 @@
+"""
+Punto de entrada de línea de comandos de la generación de certificados.
+Ejecuta CertificateDataFilter + CertificateBatchProcessor sin PyQt5, para
+tareas programadas (p. ej. certificados de cierre de mes en un servidor).
+
+El progreso se emite como líneas JSON en stdout:
+    {"event": "progress", "percent": 40, "message": "...", "eta_seconds": 12.5}
+    {"event": "result", "results": {...}}
+
+Uso:
+    python -m core.certificates datos_limpios.xlsx --template plantilla.docx
+        [--output carpeta] [--dni ...] [--cliente ...] [--mes 2025-08 ...]
+        [--workers N] [--backend word|native] [--output-mode files|zip]
+        [--converter auto|word|libreoffice|fake]
+        [--cache [--cache-folder carpeta] [--cache-max-mb N]] [--merge-docx]
+"""
+
+import sys
+import json
+import argparse
+import warnings
+from typing import Any, Dict, List, Optional
+
+from config.paths import AppPaths
+from core.certificates.data_filter import CertificateDataFilter
+from core.certificates.validator import CertificateValidator
+from core.certificates.batch_processor import CertificateBatchProcessor
+
+# Suprimir warnings de openpyxl
+warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
+
+
+def _emit(event: Dict[str, Any]) -> None:
+    """Escribe un evento como línea JSON en stdout"""
+    print(json.dumps(event, default=str), flush=True)
+
+
+def _progress(percent: int, message: str, tiempo_restante: float = 0) -> None:
+    """Callback de progreso del procesador"""
+    _emit({
+        'event': 'progress',
+        'percent': percent,
+        'message': message,
+        'eta_seconds': round(tiempo_restante or 0, 1)
+    })
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Parser de argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        prog="python -m core.certificates",
+        description="Genera certificados desde un archivo limpio sin interfaz gráfica"
+    )
+    parser.add_argument('archivo', help="Archivo limpio (.xlsx) generado por el ETL")
+    parser.add_argument('--template', required=True, help="Plantilla Word (.docx)")
+    parser.add_argument('--output', default=None,
+                        help="Carpeta base de salida (por defecto data/output)")
+    
+    filtros = parser.add_argument_group("filtros (OR dentro de cada uno, AND entre ellos)")
+    filtros.add_argument('--dni', nargs='+', default=None)
+    filtros.add_argument('--cliente', nargs='+', default=None)
+    filtros.add_argument('--mes', nargs='+', default=None, help="Meses YYYY-MM")
+    
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Trabajadores en paralelo (por defecto el de cada etapa)")
+    parser.add_argument('--backend', choices=['word', 'native'], default='word',
+                        help="Generación de PDF: conversión con Word o PDF nativo")
+    parser.add_argument('--converter', choices=['auto', 'word', 'libreoffice', 'fake'],
+                        default=None,
+                        help="Motor de conversión a PDF (por defecto el de settings.json)")
+    parser.add_argument('--output-mode', choices=['files', 'zip'], default='files')
+    parser.add_argument('--zip-max-mb', type=int, default=None)
+    parser.add_argument('--no-word', action='store_true', help="No generar los .docx")
+    parser.add_argument('--no-pdf', action='store_true', help="No generar PDF")
+    parser.add_argument('--cleanup-word', action='store_true',
+                        help="Eliminar los .docx tras convertirlos")
+    parser.add_argument('--cache', action='store_true', help="Usar la caché de renderizado")
+    parser.add_argument('--cache-folder', default=None,
+                        help="Carpeta de la caché (por defecto la de la aplicación)")
+    parser.add_argument('--cache-max-mb', type=int, default=2048,
+                        help="Tamaño máximo de la caché antes de descartar entradas")
+    parser.add_argument('--merge-by', choices=['CLIENTE', 'MES_ANALIZADO'], default=None)
+    parser.add_argument('--merge-docx', action='store_true',
+                        help="Generar un .docx unido por grupo de --merge-by (o uno solo)")
+    parser.add_argument('--resume', default=None,
+                        help="Carpeta certificates_<timestamp> a reanudar")
+    parser.add_argument('--optimize-pdf', choices=['files', 'merged', 'all'], default=None,
+                        help="Compactar los PDF (individuales, unidos o ambos) con PyMuPDF")
+    parser.add_argument('--incremental', choices=['mtime', 'hash'], default=None,
+                        help="Omitir los PDF vigentes según fecha o hash del docx")
+    
+    return parser
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Carga, filtra y genera los certificados.
+    
+    Args:
+        args: Argumentos de build_parser()
+    
+    Returns:
+        Diccionario de resultados de CertificateBatchProcessor.process
+    
+    Raises:
+        ValueError: Si el archivo, la plantilla o la carpeta no son válidos
+    """
+    ok, mensaje = CertificateValidator.validate_template_exists(args.template)
+    if not ok:
+        raise ValueError(mensaje)
+    
+    output_folder = args.output or str(AppPaths.get_output_dir())
+    ok, mensaje = CertificateValidator.validate_output_folder(output_folder)
+    if not ok:
+        raise ValueError(mensaje)
+    
+    df = CertificateDataFilter.load_clean_data(args.archivo)
+    df_filtered = CertificateDataFilter.apply_filter(
+        df,
+        dnis=args.dni,
+        clientes=args.cliente,
+        meses=args.mes
+    )
+    
+    _emit({
+        'event': 'loaded',
+        'records': len(df),
+        'filtered_records': len(df_filtered)
+    })
+    
+    options = {
+        'generate_word': not args.no_word,
+        'convert_pdf': not args.no_pdf,
+        'cleanup_word': args.cleanup_word,
+        'use_cache': args.cache,
+        'cache_folder': args.cache_folder,
+        'cache_max_mb': args.cache_max_mb,
+        'pdf_backend': args.backend,
+        'merge_by': args.merge_by,
+        'merge_docx': args.merge_docx,
+        'output_mode': args.output_mode,
+        'zip_max_mb': args.zip_max_mb,
+        'workers': args.workers,
+        'converter_backend': args.converter,
+        'incremental_pdf': args.incremental,
+        'optimize_pdf': args.optimize_pdf
+    }
+    
+    processor = CertificateBatchProcessor(
+        args.template,
+        output_folder,
+        resume_folder=args.resume
+    )
+    
+    results = processor.process(df_filtered, options, progress_callback=_progress)
+    results['output_folder'] = processor.output_folder
+    
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Ejecuta la generación y emite el resultado como última línea JSON.
+    
+    Args:
+        argv: Argumentos (None = sys.argv)
+    
+    Returns:
+        Código de salida (0 si la generación fue exitosa)
+    """
+    args = build_parser().parse_args(argv)
+    
+    try:
+        results = run(args)
+    except Exception as e:
+        _emit({'event': 'error', 'error': str(e)})
+        return 2
+    
+    _emit({'event': 'result', 'results': results})
+    return 0 if results.get('success') else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
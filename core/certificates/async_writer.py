@@ -0,0 +1,149 @@
+"""
+Módulo de escritura asíncrona de certificados.
+Desacopla el renderizado de la escritura en disco: el hilo que renderiza
+entrega (ruta, bytes) a una cola acotada atendida por hilos de E/S.
+"""
+
+import os
+import time
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class AsyncWriter:
+    """Etapa de escritura con cola acotada y escritura atómica"""
+    
+    def __init__(self,
+                 sink: Optional[Callable[[str, bytes], Any]] = None,
+                 workers: int = 2,
+                 max_pending: int = 32):
+        """
+        Inicializa la etapa de escritura e inicia los hilos de E/S.
+        
+        Args:
+            sink: Función destino(ruta, bytes); por defecto escritura atómica
+                  en disco (temporal + rename)
+            workers: Número de hilos de E/S
+            max_pending: Documentos en cola como máximo (limita la memoria)
+        """
+        self.sink = sink or self.write_atomic
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, max_pending))
+        self._lock = threading.Lock()
+        
+        self.errors: List[Tuple[Any, str, str]] = []
+        self.latencies: List[Tuple[Any, float]] = []
+        self.stats = {
+            'items': 0,
+            'bytes': 0,
+            'write_seconds': 0.0,
+            'queue_wait_seconds': 0.0
+        }
+        
+        self._start = time.perf_counter()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"cert-writer-{idx}", daemon=True)
+            for idx in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    @staticmethod
+    def write_atomic(path: str, content: bytes) -> None:
+        """
+        Escribe un archivo de forma atómica: temporal en la misma carpeta y rename.
+        Un lector nunca ve un certificado a medio escribir.
+        
+        Args:
+            path: Ruta destino
+            content: Contenido del archivo
+        """
+        output_dir = os.path.dirname(path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
+        
+        tmp_path = f"{path}.tmp{threading.get_ident()}"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def submit(self, path: str, content: bytes, tag: Any = None) -> None:
+        """
+        Encola un documento para escribirlo. Bloquea si la cola está llena.
+        
+        Args:
+            path: Ruta destino
+            content: Contenido del documento
+            tag: Dato opcional devuelto junto con el error si la escritura falla
+        """
+        start = time.perf_counter()
+        self._queue.put((path, content, tag))
+        waited = time.perf_counter() - start
+        
+        with self._lock:
+            self.stats['queue_wait_seconds'] += waited
+    
+    def _run(self) -> None:
+        """Bucle de un hilo de E/S"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            
+            path, content, tag = item
+            start = time.perf_counter()
+            
+            try:
+                self.sink(path, content)
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.stats['items'] += 1
+                    self.stats['bytes'] += len(content)
+                    self.stats['write_seconds'] += elapsed
+                    self.latencies.append((tag, elapsed))
+            except Exception as e:
+                with self._lock:
+                    self.errors.append((tag, path, str(e)))
+            finally:
+                self._queue.task_done()
+    
+    def close(self) -> List[Tuple[Any, str, str]]:
+        """
+        Espera a que se escriban todos los documentos y detiene los hilos.
+        
+        Returns:
+            Lista de errores (tag, ruta, mensaje)
+        """
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        
+        self.stats['elapsed_seconds'] = time.perf_counter() - self._start
+        return self.errors
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna los contadores de la etapa de escritura.
+        
+        Returns:
+            Diccionario con documentos, bytes, segundos y documentos por segundo
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        
+        write_seconds = stats['write_seconds']
+        stats['per_second'] = round(stats['items'] / write_seconds, 2) if write_seconds else 0.0
+        stats['mb'] = round(stats.pop('bytes') / (1024 * 1024), 2)
+        
+        for key in ('write_seconds', 'queue_wait_seconds', 'elapsed_seconds'):
+            if key in stats:
+                stats[key] = round(stats[key], 4)
+        
+        return stats
@@ -6,51 +6,73 @@ Coordina generación Word, conversión PDF y generación de reportes.
 import os
 import json
 import time
+import shutil
+import tempfile
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, Callable
 import pandas as pd
 
+from core.certificates.run_manifest import RunManifest
+from core.certificates.render_cache import RenderCache
+from core.certificates.zip_archive import ZipArchiveWriter
+from core.certificates.template_cache import TemplateCache
+from core.certificates.run_metrics import RunMetrics
+from core.certificates.eta_estimator import ETAEstimator
+
 
 class CertificateBatchProcessor:
     """Orquestador del proceso completo de generación de certificados"""
     
     def __init__(self,
                  template_path: str,
-                 output_base_folder: str):
+                 output_base_folder: str,
+                 resume_folder: Optional[str] = None):
         """
         Inicializa el procesador batch.
         
         Args:
             template_path: Ruta a la plantilla Word
             output_base_folder: Carpeta base de salida
+            resume_folder: Carpeta certificates_<timestamp> de una ejecución
+                           previa a reanudar (None = nueva ejecución)
         """
         self.template_path = template_path
         self.output_base_folder = output_base_folder
+        self.resume_folder = resume_folder
         
         # Carpetas de salida (se crearán automáticamente)
         self.word_folder = None
         self.pdf_folder = None
         self.output_folder = None
         
+        # Carpetas reales de la ejecución mientras se trabaja en una temporal (modo zip)
+        self._archive_folders = None
+        
         # Timestamp para esta ejecución
         self.timestamp = datetime.now().strftime("%d.%m.%Y_%H.%M.%S")
         
         # Variables para tracking de tiempo
         self.start_time = None
-        self.items_procesados = 0
-        self.total_items = 0
+        self.eta = ETAEstimator()
         
         # Crear estructura de carpetas
         self._create_output_structure()
     
     def _create_output_structure(self) -> None:
         """Crea estructura de carpetas con timestamp"""
-        # Crear carpeta principal con timestamp
-        self.output_folder = os.path.join(
-            self.output_base_folder,
-            f"certificates_{self.timestamp}"
-        )
+        if self.resume_folder:
+            # Reanudar: reutilizar la carpeta y el timestamp de la ejecución previa
+            self.output_folder = self.resume_folder
+            folder_name = os.path.basename(os.path.normpath(self.resume_folder))
+            if folder_name.startswith("certificates_"):
+                self.timestamp = folder_name[len("certificates_"):]
+        else:
+            # Crear carpeta principal con timestamp
+            self.output_folder = os.path.join(
+                self.output_base_folder,
+                f"certificates_{self.timestamp}"
+            )
         
         # Subcarpetas
         self.word_folder = os.path.join(self.output_folder, "word")
@@ -66,7 +88,7 @@ class CertificateBatchProcessor:
         
         Args:
             total_seconds: Tiempo total en segundos
-            
+        
         Returns:
             String formateado como HH:MM:SS o MM:SS
         """
@@ -81,25 +103,26 @@ class CertificateBatchProcessor:
         else:
             return f"{minutes:02d}:{seconds:02d}"
     
-    def _calculate_tiempo_restante(self, items_procesados: int, total_items: int) -> float:
+    def _plan_eta(self, plan: Dict[str, Any], options: dict) -> None:
         """
-        Calcula el tiempo restante estimado.
+        Registra en el estimador las fases de la ejecución con sus pendientes.
         
         Args:
-            items_procesados: Número de ítems procesados
-            total_items: Total de ítems a procesar
-            
-        Returns:
-            Segundos restantes estimados
+            plan: Plan de reanudación (_plan_resume)
+            options: Opciones validadas
         """
-        if items_procesados == 0 or self.start_time is None:
-            return 0
+        self.eta = ETAEstimator()
         
-        tiempo_transcurrido = time.time() - self.start_time
-        tiempo_por_item = tiempo_transcurrido / items_procesados
-        items_restantes = total_items - items_procesados
+        if options['generate_word']:
+            self.eta.add_phase('word', len(plan['pendientes_word']))
         
-        return tiempo_por_item * items_restantes
+        if options['convert_pdf'] and options['pdf_backend'] == 'native':
+            self.eta.add_phase('pdf', len(plan['pendientes_pdf']))
+        elif options['convert_pdf']:
+            self.eta.add_phase(
+                'conversion',
+                len(plan['pendientes_word']) + len(plan['docx_keys']) + len(plan['pendientes_pdf'])
+            )
     
     def process(self,
                 df_filtered: pd.DataFrame,
@@ -116,23 +139,42 @@ class CertificateBatchProcessor:
                     'generate_word': bool,
                     'convert_pdf': bool,
                     'cleanup_word': bool,
-                    'batch_size': int
+                    'batch_size': int,
+                    'use_cache': bool,
+                    'cache_folder': Optional[str],
+                    'cache_max_mb': int,
+                    'pdf_backend': str,  # 'word' (docx + conversión) o 'native'
+                    'merge_by': Optional[str],  # None, 'CLIENTE' o 'MES_ANALIZADO'
+                    'merge_docx': bool,
+                    'output_mode': str,  # 'files' (carpetas) o 'zip'
+                    'zip_max_mb': Optional[int],  # división del ZIP por tamaño
+                    'workers': Optional[int],  # hilos de escritura (None = por defecto)
+                    'optimize_pdf': Optional[str]  # 'files', 'merged' o 'all' (None = no)
                 }
+                La ejecución a reanudar se indica con resume_folder al construir
+                el procesador (define las carpetas de salida).
             progress_callback: Función callback(porcentaje, mensaje, tiempo_restante)
-            
+        
         Returns:
-            Diccionario con resultados completos
+            Diccionario con resultados completos. Además de los resultados de
+            cada fase ('word_results', 'pdf_results', 'merged', 'optimization')
+            incluye:
+                'archives': List[str] con las partes ZIP generadas en modo
+                    'zip' (None en modo 'files')
+                'resume': Resumen del plan de reanudación
+                'render_cache', 'template', 'metrics': Estadísticas de la ejecución
         """
         start_time = time.time()
         
         # Inicializar tracking de tiempo
         self.start_time = start_time
-        self.total_items = len(df_filtered)
-        self.items_procesados = 0
         
         # Validar opciones
         options = self._validate_options(options)
         
+        # Estadísticas de la caché de plantillas al inicio (para el delta de la ejecución)
+        template_stats_start = TemplateCache.get_stats()
+        
         # Resultado global
         results = {
             'success': False,
@@ -143,50 +185,187 @@ class CertificateBatchProcessor:
             'input_records': len(df_filtered),
             'word_results': None,
             'pdf_results': None,
+            'resume': None,
+            'render_cache': None,
+            'merged': None,
+            'optimization': None,
+            'archives': None,
+            'template': None,
+            'metrics': None,
             'total_time': 0,
             'total_time_formatted': '00:00',
             'errors': []
         }
         
+        manifest = None
+        archive = None
+        staging_folder = None
+        metrics = RunMetrics()
+        
         try:
             # FASE 1: VALIDACIONES PREVIAS
             if progress_callback:
                 progress_callback(0, "Validando datos y configuración...", 0)
             
-            validation_ok, validation_msg = self._validate_inputs(df_filtered)
+            validation_ok, validation_msg = self._validate_inputs(df_filtered, options)
             if not validation_ok:
                 results['errors'].append(validation_msg)
                 return results
             
+            # Salida empaquetada: los certificados se escriben directo en el ZIP
+            # (al reanudar, el ZIP previo se aparta y se reconstruye)
+            if options['output_mode'] == 'zip':
+                archive = self._create_archive(options)
+                results['archives'] = archive.archives
+                self._restore_manifest(archive)
+            
+            # Manifiesto de la ejecución: determina qué filas faltan
+            manifest = RunManifest(self.output_folder)
+            plan = self._plan_resume(df_filtered, manifest, options,
+                                     exists=archive.contains if archive else None)
+            results['resume'] = plan['resumen']
+            self._plan_eta(plan, options)
+            
+            # Caché de renderizado entre ejecuciones (opcional)
+            cache = self._create_cache(options)
+            
+            if archive:
+                archive.carry_over(plan['vigentes'])
+                
+                # La conversión con Word necesita archivos en disco: se usa
+                # una carpeta temporal fuera de la ejecución y se empaqueta al final
+                if options['convert_pdf'] and options['pdf_backend'] != 'native':
+                    staging_folder = self._start_staging()
+                    self._stage_previous(archive, plan)
+            
             # FASE 2: GENERACIÓN WORD
             if options['generate_word']:
                 if progress_callback:
                     progress_callback(5, "Iniciando generación de certificados Word...", 0)
                 
-                word_results = self._generate_word_certificates(
-                    df_filtered,
-                    progress_callback
-                )
+                df_pendiente = df_filtered.iloc[plan['pendientes_word']]
+                
+                if len(df_pendiente) > 0:
+                    phase_start = time.time()
+                    word_results = self._generate_word_certificates(
+                        df_pendiente,
+                        progress_callback,
+                        cache=cache,
+                        archive=archive if staging_folder is None else None,
+                        workers=options['workers']
+                    )
+                    self._record_batch_results(
+                        manifest, plan, plan['pendientes_word'], word_results, 'word'
+                    )
+                    self._add_batch_metrics(
+                        metrics, df_filtered, plan['pendientes_word'], word_results,
+                        'word', time.time() - phase_start
+                    )
+                else:
+                    word_results = self._empty_batch_results()
                 
                 results['word_results'] = word_results
                 
-                if word_results['exitosos'] == 0:
+                if word_results['total'] > 0 and word_results['exitosos'] == 0:
                     results['errors'].append("No se generó ningún certificado Word")
                     return results
             
+            # FASE 3: PDF NATIVO (SIN WORD)
+            if options['convert_pdf'] and options['pdf_backend'] == 'native':
+                if progress_callback:
+                    progress_callback(55, "Iniciando generación nativa de PDF...", 0)
+                
+                df_pendiente = df_filtered.iloc[plan['pendientes_pdf']]
+                
+                if len(df_pendiente) > 0:
+                    phase_start = time.time()
+                    pdf_results = self._generate_native_pdfs(
+                        df_pendiente,
+                        progress_callback,
+                        cache=cache,
+                        archive=archive,
+                        workers=options['workers']
+                    )
+                    self._record_batch_results(
+                        manifest, plan, plan['pendientes_pdf'], pdf_results, 'pdf',
+                        backend='native'
+                    )
+                    self._add_batch_metrics(
+                        metrics, df_filtered, plan['pendientes_pdf'], pdf_results,
+                        'pdf', time.time() - phase_start
+                    )
+                else:
+                    pdf_results = self._empty_batch_results()
+                
+                results['pdf_results'] = pdf_results
+            
             # FASE 3: CONVERSIÓN PDF
-            if options['convert_pdf']:
+            elif options['convert_pdf']:
                 if progress_callback:
                     progress_callback(55, "Iniciando conversión a PDF...", 0)
                 
+                # Con generación Word se convierten solo los docx pendientes
+                word_files = list(plan['docx_keys'].keys()) if options['generate_word'] else None
+                
+                phase_start = time.time()
                 pdf_results = self._convert_to_pdf(
-                    progress_callback
+                    progress_callback,
+                    word_files=word_files,
+                    cache=cache,
+                    converter_backend=options['converter_backend'],
+                    workers=options['workers'],
+                    incremental=options['incremental_pdf']
+                )
+                self._record_pdf_results(manifest, plan, pdf_results)
+                self._add_conversion_metrics(
+                    metrics, df_filtered, plan, pdf_results, time.time() - phase_start
                 )
                 
                 results['pdf_results'] = pdf_results
             
-            # FASE 4: LIMPIEZA (OPCIONAL)
-            if options['cleanup_word'] and options['convert_pdf']:
+            # POST-PROCESAMIENTO DE PDF (OPCIONAL): antes de empaquetar
+            if options['convert_pdf'] and options['optimize_pdf'] in ('files', 'all'):
+                results['optimization'] = {
+                    'files': self._optimize_pdfs(
+                        results['pdf_results']['archivos_generados'],
+                        options,
+                        progress_callback
+                    )
+                }
+            
+            if staging_folder:
+                self._pack_staging(archive, results, options)
+            
+            if cache:
+                results['render_cache'] = cache.get_stats()
+            
+            # SALIDAS UNIDAS (OPCIONAL): PDF por grupo y/o docx único
+            if (options['merge_by'] and options['convert_pdf']) or options['merge_docx']:
+                if archive:
+                    results['merged'] = {
+                        'pdf': [],
+                        'docx': [],
+                        'errores': [{
+                            'grupo': options['merge_by'] or 'TODOS',
+                            'error': "Las salidas unidas no están disponibles en modo zip"
+                        }]
+                    }
+                else:
+                    if progress_callback:
+                        progress_callback(92, "Uniendo certificados...", 0)
+                    
+                    results['merged'] = self._merge_outputs(df_filtered, manifest, plan, options)
+                    
+                    if options['optimize_pdf'] in ('merged', 'all') and results['merged']['pdf']:
+                        results['optimization'] = results['optimization'] or {}
+                        results['optimization']['merged'] = self._optimize_pdfs(
+                            results['merged']['pdf'],
+                            options,
+                            progress_callback
+                        )
+            
+            # FASE 4: LIMPIEZA (OPCIONAL); en modo zip se resuelve al empaquetar
+            if options['cleanup_word'] and options['convert_pdf'] and archive is None:
                 if progress_callback:
                     progress_callback(95, "Limpiando archivos Word temporales...", 0)
                 
@@ -196,7 +375,23 @@ class CertificateBatchProcessor:
             if progress_callback:
                 progress_callback(98, "Generando reporte final...", 0)
             
-            self._generate_report_json(results, options)
+            results['template'] = self._template_stats(template_stats_start)
+            results['metrics'] = metrics.to_dict()
+            
+            self._generate_report_json(results, options, archive=archive)
+            
+            if archive:
+                # El manifiesto se escribe suelto durante la ejecución (para
+                # reanudar tras una interrupción) y al terminar pasa al ZIP
+                manifest.close()
+                if os.path.exists(manifest.path):
+                    archive.write_file(manifest.path, manifest.path)
+                
+                # El ZIP reconstruido ya está completo: se eliminan las partes previas
+                archive.close()
+                archive.discard_previous()
+                if os.path.exists(manifest.path):
+                    os.remove(manifest.path)
             
             # Marcar como exitoso
             results['success'] = True
@@ -208,7 +403,7 @@ class CertificateBatchProcessor:
             
             if progress_callback:
                 progress_callback(100, "¡Proceso completado exitosamente!", 0)
-            
+        
         except Exception as e:
             # En caso de error, también formatear el tiempo transcurrido
             total_seconds = time.time() - start_time
@@ -218,6 +413,14 @@ class CertificateBatchProcessor:
             if progress_callback:
                 progress_callback(100, f"Error: {str(e)}", 0)
         
+        finally:
+            if manifest is not None:
+                manifest.close()
+            if archive is not None:
+                archive.close()
+            if staging_folder is not None:
+                self._end_staging(staging_folder)
+        
         return results
     
     def _validate_options(self, options: dict) -> dict:
@@ -226,7 +429,19 @@ class CertificateBatchProcessor:
             'generate_word': True,
             'convert_pdf': True,
             'cleanup_word': False,
-            'batch_size': 100
+            'batch_size': 100,
+            'use_cache': False,
+            'cache_folder': None,
+            'cache_max_mb': 2048,
+            'pdf_backend': 'word',
+            'merge_by': None,
+            'merge_docx': False,
+            'output_mode': 'files',
+            'zip_max_mb': None,
+            'workers': None,
+            'converter_backend': None,
+            'incremental_pdf': None,
+            'optimize_pdf': None
         }
         
         # Combinar con opciones provistas
@@ -235,10 +450,14 @@ class CertificateBatchProcessor:
         
         return final_options
     
-    def _validate_inputs(self, df: pd.DataFrame) -> tuple:
+    def _validate_inputs(self, df: pd.DataFrame, options: Optional[dict] = None) -> tuple:
         """
         Valida inputs antes de procesar.
         
+        Args:
+            df: DataFrame con datos filtrados
+            options: Opciones validadas (None = sin validaciones por backend)
+        
         Returns:
             Tupla (éxito, mensaje)
         """
@@ -250,6 +469,13 @@ class CertificateBatchProcessor:
         if not success:
             return False, f"Plantilla inválida: {msg}"
         
+        # El PDF nativo no renderiza todo lo que admite Word: fallar antes de
+        # generar los docx y no al llegar a la fase PDF
+        if options and options['convert_pdf'] and options['pdf_backend'] == 'native':
+            success, msg = CertificateValidator.validate_native_template(self.template_path)
+            if not success:
+                return False, f"Plantilla inválida: {msg}"
+        
         # Validar DataFrame
         success, msg = CertificateValidator.validate_dataframe(df)
         if not success:
@@ -262,21 +488,392 @@ class CertificateBatchProcessor:
         
         return True, ""
     
+    @staticmethod
+    def _template_stats(stats_start: Dict[str, Any]) -> Dict[str, Any]:
+        """Cargas, aciertos y tiempo de análisis de plantillas durante la ejecución"""
+        stats_end = TemplateCache.get_stats()
+        
+        return {
+            'loads': stats_end['loads'] - stats_start['loads'],
+            'hits': stats_end['hits'] - stats_start['hits'],
+            'load_seconds': round(stats_end['load_seconds'] - stats_start['load_seconds'], 4)
+        }
+    
+    @staticmethod
+    def _item_info(df: pd.DataFrame, positions: list) -> Dict[int, Dict[str, Any]]:
+        """Datos de identificación de cada fila para las métricas (fila, DNI, nombre)"""
+        def columna(col):
+            if col not in df.columns:
+                return [''] * len(df)
+            return df[col].astype(str).tolist()
+        
+        dnis = columna('DNI')
+        nombres = columna('APELLIDOS Y NOMBRES')
+        fechas = columna('FECHAS_CERTIFICADO')
+        
+        return {
+            pos: {
+                'fila': pos,
+                'dni': dnis[pos],
+                'apellidos': nombres[pos],
+                'largo_fechas': len(fechas[pos])
+            }
+            for pos in positions
+        }
+    
+    def _add_batch_metrics(self,
+                           metrics: RunMetrics,
+                           df: pd.DataFrame,
+                           positions: list,
+                           batch_results: Dict[str, Any],
+                           etapa: str,
+                           wall_seconds: float) -> None:
+        """Registra las etapas de renderizado y guardado de un batch generado"""
+        tiempos = batch_results.get('tiempos_por_fila')
+        if not tiempos:
+            return
+        
+        info = self._item_info(df, positions)
+        
+        for stage, valores in (('render', tiempos['render']), ('save', tiempos['write'])):
+            metrics.add_stage(
+                f"{etapa}_{stage}",
+                ((seconds, info[pos]) for pos, seconds in zip(positions, valores)),
+                wall_seconds=wall_seconds
+            )
+        
+        throughput = batch_results.get('throughput') or {}
+        metrics.add_value('queue_wait_seconds',
+                          throughput.get('write', {}).get('queue_wait_seconds', 0.0))
+    
+    def _add_conversion_metrics(self,
+                                metrics: RunMetrics,
+                                df: pd.DataFrame,
+                                plan: Dict[str, Any],
+                                pdf_results: Dict[str, Any],
+                                wall_seconds: float) -> None:
+        """Registra la etapa de conversión Word -> PDF por certificado"""
+        tiempos = pdf_results.get('tiempos_por_archivo') or {}
+        por_nombre = {os.path.basename(docx): info for docx, info in plan['docx_keys'].items()}
+        
+        posiciones = {}
+        for word_path, seconds in tiempos.items():
+            # Sin lista explícita (recorrido de la carpeta) se busca por nombre
+            entry = plan['docx_keys'].get(word_path) or por_nombre.get(os.path.basename(word_path))
+            posiciones[word_path] = entry[2] if entry else None
+        
+        info = self._item_info(df, [pos for pos in posiciones.values() if pos is not None])
+        
+        metrics.add_stage(
+            'pdf_conversion',
+            (
+                (seconds, info.get(posiciones[word_path], {'archivo': os.path.basename(word_path)}))
+                for word_path, seconds in tiempos.items()
+            ),
+            wall_seconds=wall_seconds
+        )
+    
+    def _create_cache(self, options: dict) -> Optional[RenderCache]:
+        """Crea la caché de renderizado si está habilitada en las opciones"""
+        if not options['use_cache']:
+            return None
+        
+        cache_folder = options['cache_folder']
+        if not cache_folder:
+            from config.paths import AppPaths
+            cache_folder = str(AppPaths.get_cache_dir())
+        
+        return RenderCache(cache_folder, max_size_mb=options['cache_max_mb'])
+    
+    def _create_archive(self, options: dict) -> ZipArchiveWriter:
+        """Crea el ZIP de la ejecución y retira las subcarpetas vacías"""
+        for folder in (self.word_folder, self.pdf_folder):
+            try:
+                os.rmdir(folder)
+            except OSError:
+                # Con contenido (ejecución reanudada) se conserva
+                pass
+        
+        return ZipArchiveWriter(
+            self.output_folder,
+            f"certificates_{self.timestamp}",
+            max_size_mb=options['zip_max_mb']
+        )
+    
+    def _restore_manifest(self, archive: ZipArchiveWriter) -> None:
+        """Recupera el manifiesto desde el ZIP previo si no está en la carpeta"""
+        path = os.path.join(self.output_folder, RunManifest.MANIFEST_FILENAME)
+        if os.path.exists(path) or not archive.contains(path):
+            return
+        
+        with open(path, 'wb') as f:
+            f.write(archive.read(path))
+    
+    def _start_staging(self) -> str:
+        """
+        Redirige las carpetas word/pdf a una carpeta temporal para la conversión.
+        
+        Returns:
+            Ruta de la carpeta temporal
+        """
+        staging_folder = tempfile.mkdtemp(prefix=f"certificates_{self.timestamp}_")
+        self._archive_folders = (self.word_folder, self.pdf_folder)
+        
+        self.word_folder = os.path.join(staging_folder, "word")
+        self.pdf_folder = os.path.join(staging_folder, "pdf")
+        os.makedirs(self.word_folder, exist_ok=True)
+        os.makedirs(self.pdf_folder, exist_ok=True)
+        
+        return staging_folder
+    
+    def _stage_previous(self, archive: ZipArchiveWriter, plan: Dict[str, Any]) -> None:
+        """
+        Prepara la carpeta temporal a partir del ZIP previo: extrae los docx
+        pendientes de conversión y reserva (archivo vacío) el nombre de cada
+        certificado vigente para que los nuevos no repitan una entrada.
+        """
+        for path in plan['vigentes']:
+            name = os.path.splitext(os.path.basename(path))[0] + '.docx'
+            reserved = os.path.join(self.word_folder, name)
+            if not os.path.exists(reserved):
+                open(reserved, 'wb').close()
+        
+        for docx in list(plan['docx_keys']):
+            staged = os.path.join(self.word_folder, os.path.basename(docx))
+            with open(staged, 'wb') as f:
+                f.write(archive.read(docx))
+            plan['docx_keys'][staged] = plan['docx_keys'].pop(docx)
+    
+    def _run_path(self, path: str) -> str:
+        """Ruta de la ejecución (entrada del ZIP) de un archivo de la carpeta temporal"""
+        if self._archive_folders is None or self.word_folder == self._archive_folders[0]:
+            return path
+        
+        folder = os.path.dirname(path)
+        for staged, target in zip((self.word_folder, self.pdf_folder), self._archive_folders):
+            if folder == staged:
+                return os.path.join(target, os.path.basename(path))
+        return path
+    
+    def _end_staging(self, staging_folder: str) -> None:
+        """Elimina la carpeta temporal y restaura las rutas de la ejecución"""
+        shutil.rmtree(staging_folder, ignore_errors=True)
+        self.word_folder, self.pdf_folder = self._archive_folders
+    
+    def _pack_staging(self,
+                      archive: ZipArchiveWriter,
+                      results: Dict[str, Any],
+                      options: dict) -> None:
+        """
+        Mueve al ZIP los archivos generados en la carpeta temporal y reescribe
+        sus rutas con las de la ejecución (las entradas dentro del archivo).
+        """
+        word_target, pdf_target = self._archive_folders
+        skip_word = options['cleanup_word'] and options['convert_pdf']
+        
+        etapas = (
+            ('word_results', word_target, skip_word),
+            ('pdf_results', pdf_target, False)
+        )
+        
+        for result_key, target_folder, skip in etapas:
+            batch_results = results.get(result_key)
+            if not batch_results:
+                continue
+            
+            mapping = {}
+            for path in batch_results['archivos_generados']:
+                virtual_path = os.path.join(target_folder, os.path.basename(path))
+                if not skip:
+                    archive.write_file(virtual_path, path)
+                os.remove(path)
+                mapping[path] = virtual_path
+            
+            batch_results['archivos_generados'] = [
+                mapping[path] for path in batch_results['archivos_generados']
+            ]
+            if 'archivos_por_fila' in batch_results:
+                batch_results['archivos_por_fila'] = [
+                    mapping.get(path, path) if path else None
+                    for path in batch_results['archivos_por_fila']
+                ]
+    
+    def _plan_resume(self,
+                     df: pd.DataFrame,
+                     manifest: RunManifest,
+                     options: dict,
+                     exists: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+        """
+        Determina qué filas ya están completas según el manifiesto.
+        
+        Args:
+            df: DataFrame con datos filtrados
+            manifest: Manifiesto de la ejecución
+            options: Opciones validadas
+            exists: Comprobación de existencia de las salidas (None = disco;
+                    en modo zip, entradas del ZIP previo)
+        
+        Returns:
+            Diccionario con el plan:
+            {
+                'keys': List[str],
+                'hashes': List[str],
+                'pendientes_word': List[int],   # posiciones a generar en Word
+                'pendientes_pdf': List[int],    # posiciones a renderizar (PDF nativo)
+                                                # o a convertir desde una carpeta existente
+                'docx_keys': Dict[str, tuple],  # docx a convertir -> (key, hash, fila)
+                'vigentes': List[str],          # salidas previas válidas que se conservan
+                'resumen': Dict[str, int]
+            }
+        """
+        keys = RunManifest.build_keys(df)
+        hashes = RunManifest.build_hashes(df)
+        native = options['pdf_backend'] == 'native'
+        
+        plan = {
+            'keys': keys,
+            'hashes': hashes,
+            'pendientes_word': [],
+            'pendientes_pdf': [],
+            'docx_keys': {},
+            'vigentes': [],
+            'resumen': {
+                'omitidos': 0,
+                'pendientes_word': 0,
+                'pendientes_pdf': 0
+            }
+        }
+        
+        # Conversión de una carpeta existente: no hay filas que reanudar y
+        # todas quedan pendientes de PDF
+        if not options['generate_word'] and not native:
+            if options['convert_pdf']:
+                plan['pendientes_pdf'] = list(range(len(df)))
+                plan['resumen']['pendientes_pdf'] = len(df)
+            return plan
+        
+        # El docx solo se exige si se conserva tras la conversión
+        require_docx = options['generate_word'] and not (
+            options['cleanup_word'] and options['convert_pdf']
+        )
+        
+        for pos, (key, data_hash) in enumerate(zip(keys, hashes)):
+            docx = manifest.valid_docx(key, data_hash, exists)
+            pdf = manifest.valid_pdf(key, data_hash, exists)
+            docx_ok = docx is not None or not require_docx
+            pdf_ok = not options['convert_pdf'] or pdf is not None
+            
+            if docx_ok and pdf_ok:
+                plan['vigentes'].extend(path for path in (docx, pdf) if path)
+                plan['resumen']['omitidos'] += 1
+                continue
+            
+            if native:
+                plan['vigentes'].extend(path for path in (docx, pdf) if path)
+                # El PDF nativo no depende del docx: cada salida se resuelve aparte
+                if not docx_ok:
+                    plan['pendientes_word'].append(pos)
+                    plan['resumen']['pendientes_word'] += 1
+                if not pdf_ok:
+                    plan['pendientes_pdf'].append(pos)
+                    plan['resumen']['pendientes_pdf'] += 1
+            elif docx is not None:
+                # Word ya generado: solo falta el PDF
+                plan['vigentes'].append(docx)
+                plan['docx_keys'][docx] = (key, data_hash, pos)
+                plan['resumen']['pendientes_pdf'] += 1
+            else:
+                # Los datos cambiaron: liberar el nombre de los archivos obsoletos
+                for stale_path in manifest.stale_outputs(key, data_hash):
+                    os.remove(stale_path)
+                
+                plan['pendientes_word'].append(pos)
+                plan['resumen']['pendientes_word'] += 1
+        
+        return plan
+    
+    @staticmethod
+    def _empty_batch_results() -> Dict[str, Any]:
+        """Resultado de un batch sin filas pendientes"""
+        return {
+            'total': 0,
+            'exitosos': 0,
+            'fallidos': 0,
+            'archivos_generados': [],
+            'archivos_por_fila': [],
+            'errores': [],
+            'throughput': None
+        }
+    
+    def _record_batch_results(self,
+                              manifest: RunManifest,
+                              plan: Dict[str, Any],
+                              positions: list,
+                              batch_results: Dict[str, Any],
+                              etapa: str,
+                              **extra) -> None:
+        """Registra en el manifiesto el resultado de cada fila de un batch generado"""
+        # Los errores del generador usan 'fila' 1-based dentro del lote
+        errores = {e['fila']: e['error'] for e in batch_results['errores']}
+        field = 'docx' if etapa == 'word' else 'pdf'
+        
+        for idx, (pos, path) in enumerate(zip(positions,
+                                               batch_results['archivos_por_fila']), 1):
+            key = plan['keys'][pos]
+            data_hash = plan['hashes'][pos]
+            
+            if path:
+                manifest.record(key, data_hash, etapa, 'ok', fila=pos,
+                                **{field: self._run_path(path)}, **extra)
+                if etapa == 'word':
+                    plan['docx_keys'][path] = (key, data_hash, pos)
+            else:
+                manifest.record(key, data_hash, etapa, 'error', fila=pos,
+                                error=errores.get(idx, ''), **extra)
+    
+    def _record_pdf_results(self,
+                            manifest: RunManifest,
+                            plan: Dict[str, Any],
+                            pdf_results: Dict[str, Any]) -> None:
+        """Registra en el manifiesto el resultado PDF de cada docx convertido"""
+        por_nombre = {os.path.basename(docx): info for docx, info in plan['docx_keys'].items()}
+        
+        for pdf_path in pdf_results['archivos_generados']:
+            docx_name = os.path.splitext(os.path.basename(pdf_path))[0] + '.docx'
+            info = por_nombre.get(docx_name)
+            if info:
+                key, data_hash, fila = info
+                manifest.record(key, data_hash, 'pdf', 'ok', fila=fila,
+                                pdf=self._run_path(pdf_path))
+        
+        for error in pdf_results['errores']:
+            info = por_nombre.get(error.get('archivo'))
+            if info:
+                key, data_hash, fila = info
+                manifest.record(key, data_hash, 'pdf', 'error', fila=fila,
+                                error=error.get('error', ''))
+    
     def _generate_word_certificates(self,
                                     df: pd.DataFrame,
-                                    main_callback: Optional[Callable] = None
+                                    main_callback: Optional[Callable] = None,
+                                    cache: Optional[RenderCache] = None,
+                                    archive: Optional[ZipArchiveWriter] = None,
+                                    workers: Optional[int] = None
                                     ) -> Dict[str, Any]:
         """Genera certificados Word"""
         from core.certificates.word_generator import WordCertificateGenerator
         
         # Crear generador
         generator = WordCertificateGenerator(self.template_path)
+        if workers:
+            generator.WRITER_THREADS = workers
         
         # Callback para progreso de Word (5% a 50%)
+        self.eta.start_phase('word')
+        
         def word_progress(idx, msg, exitosos, total):
             if main_callback:
-                self.items_procesados = idx
-                tiempo_restante = self._calculate_tiempo_restante(idx, total)
+                tiempo_restante = self.eta.update('word', idx, total)
                 # Calcular porcentaje entre 5% y 50%
                 percent = 5 + int((idx / total) * 45)
                 main_callback(percent, f"Generando Word: {exitosos}/{total}", tiempo_restante)
@@ -285,30 +882,68 @@ class CertificateBatchProcessor:
         results = generator.generate_batch(
             df,
             self.word_folder,
-            progress_callback=word_progress
+            progress_callback=word_progress,
+            cache=cache,
+            archive=archive
+        )
+        
+        return results
+    
+    def _generate_native_pdfs(self,
+                              df: pd.DataFrame,
+                              main_callback: Optional[Callable] = None,
+                              cache: Optional[RenderCache] = None,
+                              archive: Optional[ZipArchiveWriter] = None,
+                              workers: Optional[int] = None
+                              ) -> Dict[str, Any]:
+        """Genera certificados PDF directamente desde los datos (sin Word)"""
+        from core.certificates.native_pdf_generator import NativePDFGenerator
+        
+        # Crear generador nativo
+        generator = NativePDFGenerator(self.template_path)
+        if workers:
+            generator.WRITER_THREADS = workers
+        self.eta.start_phase('pdf')
+        
+        # Callback para progreso de PDF (55% a 90%)
+        def pdf_progress(idx, msg, exitosos, total):
+            if main_callback:
+                tiempo_restante = self.eta.update('pdf', idx, total)
+                percent = 55 + int((idx / total) * 35)
+                main_callback(percent, f"Generando PDF: {exitosos}/{total}", tiempo_restante)
+        
+        # Generar batch
+        results = generator.generate_batch(
+            df,
+            self.pdf_folder,
+            progress_callback=pdf_progress,
+            cache=cache,
+            archive=archive
         )
         
         return results
     
     def _convert_to_pdf(self,
-                       main_callback: Optional[Callable] = None
+                       main_callback: Optional[Callable] = None,
+                       word_files: Optional[list] = None,
+                       cache: Optional[RenderCache] = None,
+                       converter_backend: Optional[str] = None,
+                       workers: Optional[int] = None,
+                       incremental: Optional[str] = None
                        ) -> Dict[str, Any]:
         """Convierte certificados Word a PDF"""
         from core.certificates.pdf_converter import PDFConverter
         
-        # Crear conversor
-        converter = PDFConverter()
+        # Crear conversor (None = motor y trabajadores de settings.json)
+        converter = PDFConverter(backend=converter_backend, workers=workers)
+        # Sin resolver el motor: si la caché o el modo incremental resuelven
+        # todos los PDF, Word y LibreOffice no llegan a detectarse
+        self.eta.start_phase('conversion', workers=converter.estimated_workers())
         
         # Callback para progreso de PDF (55% a 90%)
         def pdf_progress(idx, msg, exitosos, total):
             if main_callback:
-                # Resetear tracking para fase PDF
-                if idx == 1:
-                    self.items_procesados = 0
-                    self.start_time = time.time()
-                
-                self.items_procesados = idx
-                tiempo_restante = self._calculate_tiempo_restante(idx, total)
+                tiempo_restante = self.eta.update('conversion', idx, total)
                 # Calcular porcentaje entre 55% y 90%
                 percent = 55 + int((idx / total) * 35)
                 main_callback(percent, f"Convirtiendo PDF: {exitosos}/{total}", tiempo_restante)
@@ -318,11 +953,98 @@ class CertificateBatchProcessor:
             self.word_folder,
             self.pdf_folder,
             progress_callback=pdf_progress,
-            retry=3
+            retry=3,
+            word_files=word_files,
+            cache=cache,
+            incremental=incremental
         )
         
         return results
     
+    def _merge_outputs(self,
+                       df: pd.DataFrame,
+                       manifest: RunManifest,
+                       plan: Dict[str, Any],
+                       options: dict) -> Dict[str, Any]:
+        """
+        Genera las salidas unidas: un PDF multi-página por grupo (con marcadores
+        por trabajador) y, opcionalmente, un docx unido por grupo.
+        
+        Returns:
+            Diccionario {'pdf': List[str], 'docx': List[str], 'errores': List[Dict]}
+        """
+        from core.certificates.pdf_merger import PDFMerger
+        from core.certificates.validator import CertificateValidator
+        
+        merged = {'pdf': [], 'docx': [], 'errores': []}
+        merged_folder = os.path.join(self.output_folder, "merged")
+        group_col = options['merge_by']
+        
+        if group_col and group_col not in df.columns:
+            merged['errores'].append({
+                'grupo': group_col,
+                'error': f"Columna de agrupación inexistente: {group_col}"
+            })
+            return merged
+        
+        # Posiciones de cada grupo, en el orden del DataFrame
+        groups: Dict[str, list] = {}
+        values = df[group_col].astype(str).tolist() if group_col else ['TODOS'] * len(df)
+        for pos, value in enumerate(values):
+            groups.setdefault(value, []).append(pos)
+        
+        nombres = df['APELLIDOS Y NOMBRES'].astype(str).tolist()
+        dnis = df['DNI'].astype(str).tolist() if 'DNI' in df.columns else [''] * len(df)
+        prefix = f"Certificados_{group_col}" if group_col else "Certificados"
+        
+        for value, positions in groups.items():
+            base_name = f"{prefix}_{CertificateValidator.validate_filename(value)}"
+            
+            if group_col and options['convert_pdf']:
+                # Los PDF de cada fila se resuelven desde el manifiesto (incluye reanudados)
+                def sources(positions=positions):
+                    for pos in positions:
+                        pdf = manifest.valid_pdf(plan['keys'][pos], plan['hashes'][pos])
+                        if pdf:
+                            yield pdf, f"{nombres[pos]} - {dnis[pos]}"
+                
+                pdf_path = os.path.join(merged_folder, f"{base_name}.pdf")
+                merge_results = PDFMerger.merge(sources(), pdf_path)
+                merged['errores'].extend(merge_results['errores'])
+                if merge_results['documentos'] > 0:
+                    merged['pdf'].append(pdf_path)
+            
+            if options['merge_docx']:
+                from core.certificates.word_generator import WordCertificateGenerator
+                
+                generator = WordCertificateGenerator(self.template_path)
+                docx_path = os.path.join(merged_folder, f"{base_name}.docx")
+                docx_results = generator.generate_merged(df.iloc[positions], docx_path)
+                merged['errores'].extend(docx_results['errores'])
+                if docx_results['exitosos'] > 0:
+                    merged['docx'].append(docx_path)
+        
+        return merged
+    
+    def _optimize_pdfs(self,
+                       pdf_paths: list,
+                       options: dict,
+                       main_callback: Optional[Callable] = None) -> Dict[str, Any]:
+        """Compacta PDFs en procesos trabajadores (92%) y reporta los bytes ahorrados"""
+        from core.certificates.pdf_optimizer import PDFOptimizer
+        from core.certificates.conversion_pool import cpu_workers
+        from core.certificates.converter_backends import load_converter_settings
+        
+        def optimize_progress(idx, msg, total):
+            if main_callback:
+                main_callback(92, f"Optimizando PDF: {idx}/{total}", 0)
+        
+        return PDFOptimizer.optimize_many(
+            pdf_paths,
+            workers=cpu_workers(options['workers'], load_converter_settings()),
+            progress_callback=optimize_progress
+        )
+    
     def _cleanup_word_files(self) -> int:
         """Limpia archivos Word después de conversión"""
         from core.certificates.pdf_converter import PDFConverter
@@ -330,8 +1052,11 @@ class CertificateBatchProcessor:
         deleted_count = PDFConverter.cleanup_word_files(self.word_folder)
         return deleted_count
     
-    def _generate_report_json(self, results: dict, options: dict) -> None:
-        """Genera reporte en formato JSON"""
+    def _generate_report_json(self,
+                              results: dict,
+                              options: dict,
+                              archive: Optional[ZipArchiveWriter] = None) -> None:
+        """Genera reporte en formato JSON (dentro del ZIP en modo zip)"""
         report = {
             'timestamp': self.timestamp,
             'template_used': os.path.basename(self.template_path),
@@ -339,6 +1064,13 @@ class CertificateBatchProcessor:
             'options': options,
             'word_generation': None,
             'pdf_conversion': None,
+            'resume': results.get('resume'),
+            'render_cache': results.get('render_cache'),
+            'merged': results.get('merged'),
+            'optimization': results.get('optimization'),
+            'archives': results.get('archives'),
+            'template': results.get('template'),
+            'metrics': results.get('metrics'),
             'total_time_seconds': results['total_time'],
             'total_time_formatted': results.get('total_time_formatted', '00:00'),
             'success': results['success'],
@@ -367,8 +1099,12 @@ class CertificateBatchProcessor:
         report_path = os.path.join(self.output_folder, "generation_report.json")
         
         try:
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            if archive:
+                content = json.dumps(report, indent=2, ensure_ascii=False)
+                archive.write(report_path, content.encode('utf-8'))
+            else:
+                with open(report_path, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, indent=2, ensure_ascii=False)
         except Exception as e:
             results['errors'].append(f"Error al generar reporte JSON: {str(e)}")
     
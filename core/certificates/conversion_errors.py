@@ -0,0 +1,80 @@
+"""
+Módulo de errores de conversión a PDF.
+Clasifica los errores en transitorios (se reintentan) y permanentes (el
+documento no se puede convertir) y calcula la espera entre reintentos con
+backoff exponencial y jitter.
+"""
+
+import random
+from typing import Union
+
+
+TRANSIENT = 'transitorio'
+PERMANENT = 'permanente'
+
+
+class ConversionTimeout(Exception):
+    """La conversión de un documento superó el tiempo máximo"""
+
+
+class PermanentConversionError(Exception):
+    """Error que no se resuelve reintentando (documento inexistente, dañado, protegido)"""
+
+
+# Fragmentos (en minúsculas) de mensajes de error permanentes de Word/LibreOffice
+PERMANENT_MARKERS = (
+    'no existe',
+    'not found',
+    'no such file',
+    'could not be loaded',
+    'corrupt',
+    'dañado',
+    'password',
+    'contraseña',
+    'experienced an error trying to open',
+    'el archivo debe ser .docx'
+)
+
+
+def classify_error(error: Union[BaseException, str]) -> str:
+    """
+    Clasifica un error de conversión.
+    
+    Los timeouts y los errores desconocidos (RPC, servidor ocupado, llamada
+    rechazada) se tratan como transitorios.
+    
+    Args:
+        error: Excepción o mensaje de error
+    
+    Returns:
+        TRANSIENT o PERMANENT
+    """
+    if isinstance(error, ConversionTimeout):
+        return TRANSIENT
+    if isinstance(error, (PermanentConversionError, FileNotFoundError)):
+        return PERMANENT
+    
+    message = str(error).lower()
+    if any(marker in message for marker in PERMANENT_MARKERS):
+        return PERMANENT
+    
+    return TRANSIENT
+
+
+def backoff_delay(attempt: int, base: float, max_delay: float) -> float:
+    """
+    Espera antes del siguiente intento: base * 2^(intento-1), con tope y jitter.
+    
+    El jitter (50-100% de la espera) evita que varios trabajadores reintenten
+    a la vez contra el mismo recurso.
+    
+    Args:
+        attempt: Intento que acaba de fallar (1 = primero)
+        base: Espera tras el primer fallo, en segundos
+        max_delay: Espera máxima, en segundos
+    
+    Returns:
+        Segundos a esperar
+    """
+    delay = min(max_delay, base * (2 ** max(0, attempt - 1)))
+    return delay * random.uniform(0.5, 1.0)
@@ -0,0 +1,141 @@
+"""
+Módulo de manifiesto de conversión a PDF.
+Registra en formato JSONL (solo anexado) el docx de origen de cada PDF
+convertido (fecha de modificación, tamaño y hash) para que una conversión
+incremental omita los PDF vigentes y solo convierta los faltantes u obsoletos.
+"""
+
+import os
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from core.certificates.render_cache import RenderCache
+
+
+class ConversionManifest:
+    """Manifiesto append-only de los PDF convertidos en una carpeta"""
+    
+    # Nombre del archivo dentro de la carpeta de PDFs
+    MANIFEST_FILENAME = "conversion_manifest.jsonl"
+    
+    # Modos de comparación: fecha de modificación o contenido del docx
+    MODES = ('mtime', 'hash')
+    
+    def __init__(self, pdf_folder: str):
+        """
+        Inicializa el manifiesto y carga el estado previo si existe.
+        
+        Args:
+            pdf_folder: Carpeta de salida de los PDF
+        """
+        self.path = os.path.join(pdf_folder, self.MANIFEST_FILENAME)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._handle = None
+        self._load()
+    
+    def _load(self) -> None:
+        """Carga el último registro de cada docx"""
+        if not os.path.exists(self.path):
+            return
+        
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Última línea truncada por una caída: se ignora
+                    continue
+                if record.get('docx'):
+                    self.entries[record['docx']] = record
+    
+    @staticmethod
+    def _stat(path: str) -> Optional[os.stat_result]:
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+    
+    def is_up_to_date(self, word_path: str, pdf_path: str, mode: str = 'mtime') -> Optional[str]:
+        """
+        Indica si el PDF de un docx sigue vigente.
+        
+        Con un registro previo, el docx sin cambios de fecha ni tamaño (o, en
+        modo 'hash', con el mismo contenido) y un PDF no anterior al registrado
+        se consideran vigentes. Sin registro, en modo 'mtime' basta un PDF más
+        nuevo que el docx.
+        
+        Args:
+            word_path: Ruta del docx
+            pdf_path: Ruta del PDF de salida
+            mode: 'mtime' o 'hash'
+        
+        Returns:
+            Motivo por el que se omite ('mtime' o 'hash') o None si hay que convertir
+        """
+        pdf_stat = self._stat(pdf_path)
+        word_stat = self._stat(word_path)
+        if pdf_stat is None or pdf_stat.st_size == 0 or word_stat is None:
+            return None
+        
+        entry = self.entries.get(os.path.basename(word_path))
+        
+        if entry is None:
+            if mode == 'mtime' and pdf_stat.st_mtime_ns >= word_stat.st_mtime_ns:
+                self.record(word_path, pdf_path)
+                return 'mtime'
+            return None
+        
+        # Un PDF más antiguo que el registrado fue restaurado o reemplazado;
+        # uno más nuevo puede venir del post-procesamiento (optimización)
+        if pdf_stat.st_mtime_ns < entry['pdf_mtime_ns']:
+            return None
+        
+        if (word_stat.st_size, word_stat.st_mtime_ns) == (entry['docx_size'], entry['docx_mtime_ns']):
+            return 'mtime'
+        
+        # Docx reescrito: en modo hash basta con que el contenido sea el mismo
+        if mode == 'hash' and entry.get('docx_hash') == RenderCache.file_key(word_path):
+            self.record(word_path, pdf_path)
+            return 'hash'
+        
+        return None
+    
+    def record(self, word_path: str, pdf_path: str) -> None:
+        """
+        Anexa el estado actual de un docx y su PDF convertido.
+        
+        Args:
+            word_path: Ruta del docx
+            pdf_path: Ruta del PDF generado
+        """
+        word_stat = os.stat(word_path)
+        pdf_stat = os.stat(pdf_path)
+        
+        record = {
+            'docx': os.path.basename(word_path),
+            'docx_size': word_stat.st_size,
+            'docx_mtime_ns': word_stat.st_mtime_ns,
+            'docx_hash': RenderCache.file_key(word_path),
+            'pdf': os.path.basename(pdf_path),
+            'pdf_size': pdf_stat.st_size,
+            'pdf_mtime_ns': pdf_stat.st_mtime_ns,
+            'timestamp': datetime.now().isoformat(timespec='seconds')
+        }
+        
+        if self._handle is None:
+            self._handle = open(self.path, 'a', encoding='utf-8')
+        
+        self._handle.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._handle.flush()
+        
+        self.entries[record['docx']] = record
+    
+    def close(self) -> None:
+        """Cierra el archivo del manifiesto si está abierto"""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
@@ -0,0 +1,335 @@
+"""
+Módulo de conversión a PDF en paralelo.
+Varios trabajadores toman documentos de una cola compartida, cada uno con su
+propia instancia aislada del motor (proceso de Word o perfil de LibreOffice).
+La cola se alimenta a medida que llegan los documentos, por lo que la
+conversión puede empezar antes de conocer el lote completo.
+Si la instancia de un trabajador se cae, se reinicia y sus documentos en curso
+vuelven a la cola sin afectar al resto del lote; si queda bloqueada y no puede
+terminarse, el trabajador se abandona y otro toma su lugar.
+"""
+
+import os
+import time
+import queue
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.certificates.converter_backends import ConverterBackend, ConversionResult
+
+
+def cpu_workers(requested: Optional[int] = None,
+                settings: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Trabajadores en paralelo según cpu_limit_percent de settings.json.
+    
+    Args:
+        requested: Trabajadores pedidos explícitamente (None = según CPU)
+        settings: Sección certificates de settings.json (cpu_limit_percent)
+    
+    Returns:
+        Trabajadores (al menos 1)
+    """
+    if requested:
+        return max(1, requested)
+    
+    percent = (settings or {}).get('cpu_limit_percent', 50)
+    return max(1, (os.cpu_count() or 1) * percent // 100)
+
+
+def conversion_workers(backend: ConverterBackend,
+                       requested: Optional[int] = None,
+                       settings: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Número de trabajadores de conversión.
+    
+    Args:
+        backend: Motor de conversión (aporta su propio máximo)
+        requested: Trabajadores pedidos explícitamente (None = según CPU)
+        settings: Sección certificates de settings.json (cpu_limit_percent)
+    
+    Returns:
+        Trabajadores (al menos 1)
+    """
+    workers = cpu_workers(requested, settings)
+    
+    if backend.MAX_WORKERS:
+        workers = min(workers, backend.MAX_WORKERS)
+    
+    return max(1, workers)
+
+
+class ConversionPool:
+    """Pool de trabajadores de conversión con seguimiento de salud"""
+    
+    # Caídas de trabajador que un documento tolera antes de darse por fallido
+    MAX_CRASHES_PER_ITEM = 2
+    
+    # Segundos de espera por documentos nuevos antes de revisar si terminó la carga
+    POLL_SECONDS = 0.05
+    
+    def __init__(self, backend: ConverterBackend, workers: int):
+        """
+        Args:
+            backend: Motor de conversión compartido (abre una sesión por trabajador)
+            workers: Número de trabajadores
+        """
+        self.backend = backend
+        self.workers = max(1, workers)
+        self.health: List[Dict[str, Any]] = []
+        self.seconds: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._fed = threading.Event()
+        self._lock = threading.Lock()
+    
+    def _take(self, tasks: queue.Queue) -> List[Tuple[str, str, int]]:
+        """
+        Toma documentos de la cola: espera al menos uno mientras la carga siga
+        abierta y agrupa hasta chunk_size repartiendo lo encolado entre trabajadores.
+        
+        Returns:
+            Documentos tomados (vacío si la cola terminó)
+        """
+        while True:
+            if self._stop.is_set():
+                return []
+            try:
+                chunk = [tasks.get(timeout=self.POLL_SECONDS)]
+                break
+            except queue.Empty:
+                if self._fed.is_set() and tasks.empty():
+                    return []
+        
+        step = max(1, min(self.backend.chunk_size, tasks.qsize() // self.workers + 1))
+        while len(chunk) < step:
+            try:
+                chunk.append(tasks.get_nowait())
+            except queue.Empty:
+                break
+        return chunk
+    
+    def _close(self, session: Any) -> None:
+        """Cierra una sesión sin propagar errores de una instancia caída"""
+        try:
+            self.backend.close_session(session)
+        except Exception:
+            pass
+    
+    def _worker(self,
+                health: Dict[str, Any],
+                ctx: Dict[str, Any],
+                tasks: queue.Queue,
+                results: queue.Queue,
+                retry: int) -> None:
+        """Bucle de un trabajador: toma documentos hasta vaciar la cola"""
+        session = None
+        health['estado'] = 'activo'
+        
+        try:
+            while not self._stop.is_set():
+                chunk = self._take(tasks)
+                if not chunk:
+                    break
+                
+                in_flight = {word_path: (word_path, pdf_path, crashes)
+                             for word_path, pdf_path, crashes in chunk}
+                with self._lock:
+                    ctx['in_flight'] = in_flight
+                
+                try:
+                    if session is None:
+                        session = self.backend.open_session()
+                        with self._lock:
+                            ctx['session'] = session
+                    
+                    start = time.perf_counter()
+                    items = [(word_path, pdf_path) for word_path, pdf_path, _ in chunk]
+                    for word_path, success, message in self.backend.convert_many(
+                            items, retry=retry, session=session):
+                        with self._lock:
+                            # Abandonado por bloqueo: sus documentos ya se reasignaron
+                            if ctx['abandoned']:
+                                return
+                            
+                            now = time.perf_counter()
+                            self.seconds[word_path] = now - start
+                            start = now
+                            
+                            in_flight.pop(word_path, None)
+                            health['documentos'] += 1
+                            if not success:
+                                health['fallidos'] += 1
+                            results.put((word_path, success, message))
+                
+                except Exception as e:
+                    with self._lock:
+                        if ctx['abandoned']:
+                            return
+                    
+                    # Instancia caída: reiniciarla y devolver lo pendiente a la cola
+                    health['reinicios'] += 1
+                    health['ultimo_error'] = str(e)
+                    if session is not None:
+                        self._close(session)
+                        session = None
+                        with self._lock:
+                            ctx['session'] = None
+                    
+                    for word_path, pdf_path, crashes in in_flight.values():
+                        if crashes + 1 >= self.MAX_CRASHES_PER_ITEM:
+                            health['fallidos'] += 1
+                            results.put((word_path, False,
+                                         f"El trabajador de conversión falló: {str(e)}"))
+                        else:
+                            tasks.put((word_path, pdf_path, crashes + 1))
+        finally:
+            with self._lock:
+                abandoned = ctx['abandoned']
+            if not abandoned:
+                if session is not None:
+                    self._close(session)
+                health['estado'] = 'terminado'
+    
+    def _start_worker(self,
+                      workers: List[Tuple[threading.Thread, Dict[str, Any]]],
+                      tasks: queue.Queue,
+                      results: queue.Queue,
+                      retry: int) -> None:
+        """Agrega un trabajador (al inicio o en reemplazo de uno bloqueado)"""
+        health = {'worker': len(self.health), 'estado': 'pendiente', 'documentos': 0,
+                  'fallidos': 0, 'reinicios': 0, 'ultimo_error': None}
+        ctx = {'session': None, 'in_flight': {}, 'abandoned': False}
+        self.health.append(health)
+        
+        thread = threading.Thread(
+            target=self._worker,
+            args=(health, ctx, tasks, results, retry),
+            name=f"pdf-worker-{health['worker']}",
+            daemon=True
+        )
+        workers.append((thread, ctx))
+        thread.start()
+    
+    def _replace_hung(self,
+                      workers: List[Tuple[threading.Thread, Dict[str, Any]]],
+                      tasks: queue.Queue,
+                      results: queue.Queue,
+                      retry: int) -> None:
+        """
+        Abandona los trabajadores cuya instancia quedó bloqueada sin poder
+        terminarse: el documento en curso se reporta como timeout, el resto de
+        su porción vuelve a la cola y un trabajador nuevo toma su lugar.
+        """
+        for idx, (_, ctx) in enumerate(list(workers)):
+            with self._lock:
+                session = ctx['session']
+                if ctx['abandoned'] or session is None or not self.backend.is_hung(session):
+                    continue
+                ctx['abandoned'] = True
+                in_flight = list(ctx['in_flight'].values())
+            
+            health = self.health[idx]
+            health['estado'] = 'abandonado'
+            self.backend.abandon_session(session)
+            
+            # El motor convierte la porción en orden: el bloqueado es el primero sin resultado
+            for pos, (word_path, pdf_path, crashes) in enumerate(in_flight):
+                if pos == 0:
+                    message = (f"La conversión superó el tiempo máximo y la instancia "
+                               f"no pudo terminarse: {word_path}")
+                    health['documentos'] += 1
+                    health['fallidos'] += 1
+                    health['ultimo_error'] = message
+                    results.put((word_path, False, message))
+                else:
+                    tasks.put((word_path, pdf_path, crashes))
+            
+            if not self._stop.is_set():
+                self._start_worker(workers, tasks, results, retry)
+    
+    def run(self, items: Iterable[Tuple[str, str]], retry: int = 3) -> Iterator[ConversionResult]:
+        """
+        Convierte los documentos en paralelo, entregando cada resultado al terminarlo.
+        Un hilo alimentador pasa los documentos a la cola a medida que el
+        iterable los produce (puede ser un generador que aún está llegando).
+        Un trabajador bloqueado sin remedio (ver ConverterBackend.is_hung) se
+        abandona y se reemplaza.
+        
+        Args:
+            items: Pares (ruta docx, ruta pdf) con rutas absolutas
+            retry: Intentos por documento
+        
+        Yields:
+            (ruta docx, éxito, ruta del PDF o mensaje de error), en orden de finalización
+        
+        Raises:
+            Exception: El error del iterable de entrada, tras entregar lo ya encolado
+        """
+        tasks: queue.Queue = queue.Queue()
+        results: queue.Queue = queue.Queue()
+        fed = [0]
+        feed_errors: List[Exception] = []
+        
+        def feeder():
+            try:
+                for word_path, pdf_path in items:
+                    if self._stop.is_set():
+                        break
+                    tasks.put((word_path, pdf_path, 0))
+                    fed[0] += 1
+            except Exception as e:
+                feed_errors.append(e)
+            finally:
+                self._fed.set()
+        
+        count = self.workers
+        if hasattr(items, '__len__'):
+            count = max(1, min(count, len(items)))
+        
+        self._stop.clear()
+        self._fed.clear()
+        self.health = []
+        workers: List[Tuple[threading.Thread, Dict[str, Any]]] = []
+        feeder_thread = threading.Thread(target=feeder, name="pdf-feeder", daemon=True)
+        
+        feeder_thread.start()
+        for _ in range(count):
+            self._start_worker(workers, tasks, results, retry)
+        
+        try:
+            delivered = 0
+            while not (self._fed.is_set() and delivered >= fed[0]):
+                self._replace_hung(workers, tasks, results, retry)
+                try:
+                    result = results.get(timeout=self.POLL_SECONDS)
+                except queue.Empty:
+                    # Salvaguarda: sin trabajadores vivos no llegarán más resultados
+                    if self._fed.is_set() and results.empty() and \
+                            not any(thread.is_alive() for thread, _ in workers):
+                        break
+                    continue
+                
+                delivered += 1
+                yield result
+        finally:
+            # Si el consumidor se detiene antes de tiempo, los trabajadores terminan
+            # su porción y el alimentador suelta la entrada tras su documento
+            # actual (así quien llama puede seguir leyéndola sin competir con él);
+            # los trabajadores abandonados siguen bloqueados y no se esperan
+            self._stop.set()
+            for thread, ctx in workers:
+                if not ctx['abandoned']:
+                    thread.join()
+            feeder_thread.join()
+        
+        if feed_errors:
+            raise feed_errors[0]
+    
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """
+        Retorna la salud de cada trabajador.
+        
+        Returns:
+            Lista con documentos, fallidos, reinicios y último error por trabajador
+        """
+        return [dict(health) for health in self.health]
@@ -0,0 +1,881 @@
+"""
+Módulo de motores de conversión Word -> PDF.
+Cada motor convierte una lista de documentos (convert_many) y se elige por
+configuración (settings.json, sección certificates) con respaldo automático
+al siguiente motor disponible.
+"""
+
+import os
+import json
+import time
+import random
+import shutil
+import signal
+import platform
+import tempfile
+import itertools
+import threading
+import subprocess
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config.paths import AppPaths
+from core.certificates.word_session import WordAutomation, WordSession
+from core.certificates.conversion_errors import (
+    PERMANENT,
+    backoff_delay,
+    classify_error
+)
+
+
+# Resultado por documento: (ruta docx, éxito, ruta del PDF o mensaje de error)
+ConversionResult = Tuple[str, bool, str]
+
+# PDF mínimo válido de una página en blanco (motor falso)
+MINIMAL_PDF = (
+    b"%PDF-1.4\n"
+    b"1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 595 842]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n"
+    b"%%EOF\n"
+)
+
+
+def _pdf_ok(pdf_path: str) -> bool:
+    """True si el PDF existe y no está vacío"""
+    return os.path.exists(pdf_path) and os.path.getsize(pdf_path) > 0
+
+
+def _discard_pdf(pdf_path: str) -> None:
+    """
+    Elimina el PDF de una ejecución previa antes de convertir: el éxito se
+    decide con _pdf_ok y un PDF anterior no debe pasar por uno recién creado.
+    
+    Raises:
+        OSError: Si el PDF existe y no se puede eliminar (p. ej. abierto)
+    """
+    try:
+        os.remove(pdf_path)
+    except FileNotFoundError:
+        pass
+
+
+class AvailabilityCache:
+    """
+    Resultados de la detección de motores: en memoria por proceso y,
+    opcionalmente, en disco con vencimiento (iniciar Word para probarlo
+    cuesta segundos).
+    """
+    
+    FILE_NAME = "converter_availability.json"
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Archivo JSON de la caché en disco (None = data/state; no se
+                  guarda en data/cache porque RenderCache desaloja esa carpeta)
+        """
+        self.path = path
+        self._values: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+    
+    def _file(self) -> Path:
+        return Path(self.path) if self.path else AppPaths.get_state_dir() / self.FILE_NAME
+    
+    def _read_disk(self, key: str, ttl: float) -> Optional[bool]:
+        """Resultado guardado si no venció; None si no hay"""
+        try:
+            with open(self._file(), 'r', encoding='utf-8') as f:
+                entry = json.load(f).get(key)
+        except (OSError, ValueError):
+            return None
+        
+        if not entry or time.time() - entry.get('checked_at', 0) > ttl:
+            return None
+        return bool(entry.get('available'))
+    
+    def _write_disk(self, key: str, available: bool) -> None:
+        """Guarda un resultado (los errores de escritura se ignoran)"""
+        path = self._file()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        
+        data[key] = {'available': available, 'checked_at': time.time()}
+        
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+        except OSError:
+            pass
+    
+    def get(self, key: str, probe: Callable[[], bool], ttl: float = 0) -> bool:
+        """
+        Disponibilidad de un motor, ejecutando probe solo si no está en caché.
+        
+        Args:
+            key: Identificador del motor (nombre y ruta del ejecutable)
+            probe: Detección real de la disponibilidad
+            ttl: Segundos de validez en disco (0 = solo en memoria)
+        
+        Returns:
+            True si el motor está disponible
+        """
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            
+            available = self._read_disk(key, ttl) if ttl else None
+            if available is None:
+                available = bool(probe())
+                if ttl:
+                    self._write_disk(key, available)
+            
+            self._values[key] = available
+            return available
+    
+    def clear(self) -> None:
+        """Olvida los resultados en memoria (p. ej. tras instalar un motor)"""
+        with self._lock:
+            self._values.clear()
+
+
+# Caché de disponibilidad compartida por todos los conversores del proceso
+AVAILABILITY = AvailabilityCache()
+
+
+class ConverterBackend(ABC):
+    """Interfaz de un motor de conversión (_probe y convert_many son obligatorios)"""
+    
+    name = 'base'
+    
+    # Espera tras el primer fallo; se duplica en cada reintento (con jitter)
+    RETRY_DELAY = 1
+    RETRY_MAX_DELAY = 30
+    
+    # Segundos máximos de conversión por documento
+    DOCUMENT_TIMEOUT = 120
+    
+    # Documentos que un trabajador toma de la cola por vez
+    chunk_size = 1
+    
+    # Máximo de trabajadores en paralelo (None = sin límite propio del motor)
+    MAX_WORKERS: Optional[int] = None
+    
+    # Una instancia bloqueada solo puede abandonarse desde otro hilo: con True
+    # la conversión por lotes pasa siempre por ConversionPool
+    SUPERVISED = False
+    
+    # Segundos de validez de la detección guardada en disco (0 = solo en memoria)
+    probe_ttl = 0
+    
+    def availability_key(self) -> str:
+        """Identificador del motor en la caché de disponibilidad"""
+        return self.name
+    
+    @abstractmethod
+    def _probe(self) -> bool:
+        """Detección real de la disponibilidad (puede ser costosa)"""
+    
+    def is_available(self) -> bool:
+        """True si el motor puede convertir en esta máquina (resultado cacheado)"""
+        return AVAILABILITY.get(self.availability_key(), self._probe, self.probe_ttl)
+    
+    def open_session(self) -> Any:
+        """
+        Abre una instancia aislada del motor para un trabajador.
+        
+        Returns:
+            Estado de la instancia (None si el motor no lo necesita)
+        """
+        return None
+    
+    def close_session(self, session: Any) -> None:
+        """Cierra una instancia abierta con open_session"""
+    
+    def is_hung(self, session: Any) -> bool:
+        """True si la instancia quedó bloqueada y no pudo terminarse (hay que abandonarla)"""
+        return False
+    
+    def abandon_session(self, session: Any) -> None:
+        """Da por perdida una instancia bloqueada sin cerrarla (su hilo no responde)"""
+    
+    @abstractmethod
+    def convert_many(self,
+                     items: Iterable[Tuple[str, str]],
+                     retry: int = 3,
+                     session: Any = None) -> Iterator[ConversionResult]:
+        """
+        Convierte documentos y entrega el resultado de cada uno al terminarlo.
+        
+        Args:
+            items: Pares (ruta docx, ruta pdf) con rutas absolutas; se consumen
+                   a medida que se convierten (puede ser un generador)
+            retry: Intentos por documento
+            session: Instancia de open_session (None = abrir una para la llamada)
+        
+        Yields:
+            (ruta docx, éxito, ruta del PDF o mensaje de error), una vez por documento
+        """
+    
+    def _retry_wait(self, attempt: int) -> None:
+        """Espera con backoff exponencial antes del siguiente intento"""
+        time.sleep(backoff_delay(attempt, self.RETRY_DELAY, self.RETRY_MAX_DELAY))
+    
+    def describe(self) -> Dict[str, Any]:
+        """Datos del motor para el reporte"""
+        return {'backend': self.name, 'timeouts': 0}
+
+
+class WordCOMBackend(ConverterBackend):
+    """Conversión con MS Word por COM, una instancia de Word por hilo"""
+    
+    name = 'word'
+    
+    # Cada trabajador mantiene un proceso de Word (~150 MB) abierto
+    MAX_WORKERS = 4
+    
+    # Una llamada COM colgada no siempre puede terminarse (PID desconocido)
+    SUPERVISED = True
+    
+    def __init__(self,
+                 automation_factory: Optional[Callable[[], WordAutomation]] = None,
+                 recycle_after: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        """
+        Args:
+            automation_factory: Constructor de instancias de Word (por defecto
+                                win32com; un objeto falso permite probar sin Word)
+            recycle_after: Documentos por instancia de Word antes de reiniciarla
+            timeout: Segundos máximos por documento antes de terminar Word
+        """
+        self.automation_factory = automation_factory
+        self.recycle_after = recycle_after
+        self.timeout = timeout or self.DOCUMENT_TIMEOUT
+        self.session_stats: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+    
+    # ProgID registrado por la instalación de Word
+    PROG_ID = "Word.Application"
+    
+    def is_available(self) -> bool:
+        # Automatización inyectada (p. ej. objeto falso en pruebas)
+        if self.automation_factory is not None:
+            return True
+        return super().is_available()
+    
+    def _progid_registered(self) -> bool:
+        """Consulta barata en el registro antes de iniciar Word"""
+        try:
+            import winreg
+            
+            with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, rf"{self.PROG_ID}\CLSID"):
+                return True
+        except OSError:
+            return False
+    
+    def _probe(self) -> bool:
+        if platform.system() != "Windows":
+            return False
+        
+        # Sin ProgID no hay Word: evitar el intento de Dispatch
+        if not self._progid_registered():
+            return False
+        
+        try:
+            import win32com.client
+            import pythoncom
+            
+            # Inicializar COM
+            pythoncom.CoInitialize()
+            
+            try:
+                # Intentar crear instancia de Word
+                word = win32com.client.Dispatch(self.PROG_ID)
+                word.Visible = False
+                word.Quit()
+                return True
+            except Exception:
+                return False
+            finally:
+                pythoncom.CoUninitialize()
+        
+        except ImportError:
+            # win32com no disponible
+            return False
+        except Exception:
+            return False
+    
+    def open_session(self) -> WordSession:
+        """Sesión con un proceso de Word propio (DispatchEx) por hilo"""
+        return WordSession(self.automation_factory, self.recycle_after, self.timeout)
+    
+    def close_session(self, session: WordSession) -> None:
+        """Cierra Word y acumula los contadores de la sesión"""
+        session.close()
+        self._collect_stats(session)
+    
+    def is_hung(self, session: WordSession) -> bool:
+        return session.hung.is_set()
+    
+    def abandon_session(self, session: WordSession) -> None:
+        # Cerrar Word desde otro hilo podría bloquearse también: solo los contadores
+        self._collect_stats(session)
+    
+    def _collect_stats(self, session: WordSession) -> None:
+        """Acumula los contadores de una sesión terminada"""
+        with self._lock:
+            stats = session.get_stats()
+            if self.session_stats is None:
+                self.session_stats = stats
+            else:
+                for key, value in stats.items():
+                    self.session_stats[key] = self.session_stats.get(key, 0) + value
+    
+    def convert_one(self,
+                    word_path: str,
+                    pdf_path: str,
+                    session: WordSession,
+                    retry: int = 3) -> Tuple[bool, str]:
+        """
+        Convierte un documento con reintentos. La sesión descarta la instancia
+        de Word que falló (o que superó el tiempo máximo) y el reintento
+        arranca una nueva; los errores permanentes no se reintentan.
+        
+        Returns:
+            Tupla (éxito, ruta del PDF o mensaje)
+        """
+        last_error = None
+        
+        for attempt in range(1, retry + 1):
+            try:
+                _discard_pdf(pdf_path)
+                session.convert(word_path, pdf_path)
+                
+                # Verificar que se creó el PDF
+                if _pdf_ok(pdf_path):
+                    return True, pdf_path
+                last_error = "PDF creado pero está vacío"
+            
+            except Exception as e:
+                last_error = str(e) or type(e).__name__
+                if classify_error(e) == PERMANENT:
+                    return False, f"Error permanente: {last_error}"
+            
+            # Si no es el último intento, esperar antes de reintentar
+            if attempt < retry:
+                self._retry_wait(attempt)
+        
+        return False, f"Error después de {retry} intentos: {last_error}"
+    
+    def convert_many(self,
+                     items: Iterable[Tuple[str, str]],
+                     retry: int = 3,
+                     session: Optional[WordSession] = None) -> Iterator[ConversionResult]:
+        own_session = session is None
+        if own_session:
+            session = self.open_session()
+        
+        try:
+            for word_path, pdf_path in items:
+                success, message = self.convert_one(word_path, pdf_path, session, retry)
+                yield word_path, success, message
+        finally:
+            if own_session:
+                self.close_session(session)
+    
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'backend': self.name,
+            'timeouts': (self.session_stats or {}).get('timeouts', 0),
+            'word_session': self.session_stats
+        }
+
+
+class LibreOfficeBackend(ConverterBackend):
+    """
+    Conversión con LibreOffice headless: muchos documentos por invocación de
+    soffice, con un perfil de usuario propio para no chocar con otra instancia.
+    """
+    
+    name = 'libreoffice'
+    
+    # Documentos por invocación de soffice
+    CHUNK_SIZE = 50
+    
+    # Cada trabajador ejecuta su propio soffice con su propio perfil
+    MAX_WORKERS = 4
+    
+    # Segundos de arranque de soffice sumados al tiempo máximo de cada invocación
+    STARTUP_TIMEOUT = 30
+    
+    # Ubicaciones habituales en Windows (en Linux/macOS se busca en el PATH)
+    WINDOWS_PATHS = [
+        r"C:\Program Files\LibreOffice\program\soffice.exe",
+        r"C:\Program Files (x86)\LibreOffice\program\soffice.exe"
+    ]
+    
+    def __init__(self,
+                 soffice_path: Optional[str] = None,
+                 chunk_size: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        """
+        Args:
+            soffice_path: Ejecutable de LibreOffice (None = buscarlo)
+            chunk_size: Documentos por invocación
+            timeout: Segundos máximos por documento
+        """
+        self.soffice_path = soffice_path
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.timeout = timeout or self.DOCUMENT_TIMEOUT
+        self.invocations = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+    
+    def _find_soffice(self) -> Optional[str]:
+        """Ruta del ejecutable soffice o None si no está instalado"""
+        if self.soffice_path:
+            return self.soffice_path if os.path.exists(self.soffice_path) else None
+        
+        for name in ('soffice', 'libreoffice'):
+            found = shutil.which(name)
+            if found:
+                return found
+        
+        for candidate in self.WINDOWS_PATHS:
+            if os.path.exists(candidate):
+                return candidate
+        
+        return None
+    
+    def availability_key(self) -> str:
+        return f"{self.name}:{self.soffice_path or ''}"
+    
+    def _probe(self) -> bool:
+        return self._find_soffice() is not None
+    
+    @staticmethod
+    def _kill_tree(process: subprocess.Popen) -> None:
+        """Termina soffice y sus procesos hijos (soffice.bin)"""
+        try:
+            if platform.system() == "Windows":
+                subprocess.run(
+                    ['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                    capture_output=True
+                )
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except (OSError, ValueError):
+            process.kill()
+    
+    def _run(self,
+             soffice: str,
+             profile_dir: str,
+             word_paths: List[str],
+             outdir: str) -> Tuple[str, bool]:
+        """
+        Ejecuta una invocación de soffice con un watchdog proporcional al
+        número de documentos; si vence, se termina el árbol de procesos.
+        
+        Returns:
+            Tupla (mensaje de error ('' si terminó bien), True si venció el tiempo)
+        """
+        command = [
+            soffice,
+            '--headless', '--norestore', '--nolockcheck', '--nodefault',
+            f"-env:UserInstallation={Path(profile_dir).as_uri()}",
+            '--convert-to', 'pdf',
+            '--outdir', outdir
+        ] + word_paths
+        
+        timeout = self.STARTUP_TIMEOUT + self.timeout * len(word_paths)
+        
+        with self._lock:
+            self.invocations += 1
+        
+        try:
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                # Grupo de procesos propio para poder terminar también soffice.bin
+                start_new_session=platform.system() != "Windows"
+            )
+        except OSError as e:
+            return f"No se pudo ejecutar LibreOffice: {str(e)}", False
+        
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self._kill_tree(process)
+            process.communicate()
+            with self._lock:
+                self.timeouts += 1
+            return f"LibreOffice no respondió en {timeout:g} s", True
+        
+        if process.returncode != 0:
+            return (stderr or stdout or '').strip() or \
+                f"LibreOffice terminó con código {process.returncode}", False
+        
+        # soffice termina con código 0 aunque no pueda abrir un documento
+        errores = [line.strip() for line in (stdout + stderr).splitlines()
+                   if line.strip().lower().startswith('error')]
+        return '; '.join(errores), False
+    
+    def open_session(self) -> str:
+        """Perfil de usuario propio (-env:UserInstallation) para una instancia"""
+        return tempfile.mkdtemp(prefix="lo_profile_")
+    
+    def close_session(self, session: str) -> None:
+        shutil.rmtree(session, ignore_errors=True)
+    
+    def convert_many(self,
+                     items: Iterable[Tuple[str, str]],
+                     retry: int = 3,
+                     session: Optional[str] = None) -> Iterator[ConversionResult]:
+        soffice = self._find_soffice()
+        if soffice is None:
+            for word_path, _ in items:
+                yield word_path, False, "LibreOffice no está instalado o no está disponible"
+            return
+        
+        own_session = session is None
+        profile_dir = self.open_session() if own_session else session
+        items = iter(items)
+        
+        try:
+            # Tomar chunk_size documentos por invocación a medida que llegan
+            while True:
+                chunk = list(itertools.islice(items, self.chunk_size))
+                if not chunk:
+                    break
+                yield from self._convert_chunk(soffice, profile_dir, chunk, retry)
+        finally:
+            if own_session:
+                self.close_session(profile_dir)
+    
+    @staticmethod
+    def _produced_path(word_path: str, outdir: str) -> str:
+        """PDF que soffice escribe en --outdir para un documento"""
+        return os.path.join(outdir, os.path.splitext(os.path.basename(word_path))[0] + '.pdf')
+    
+    def _convert_chunk(self,
+                       soffice: str,
+                       profile_dir: str,
+                       chunk: List[Tuple[str, str]],
+                       retry: int) -> Iterator[ConversionResult]:
+        """Convierte un grupo de documentos con reintentos de a uno"""
+        pending = [(word_path, pdf_path, '') for word_path, pdf_path in chunk]
+        
+        for attempt in range(1, retry + 1):
+            if not pending:
+                break
+            
+            # Los reintentos van de a un documento para aislar al que falla
+            grupos = [pending] if attempt == 1 else [[item] for item in pending]
+            
+            failed = []
+            for grupo in grupos:
+                # soffice escribe <nombre>.pdf en --outdir: una invocación por carpeta
+                por_carpeta: Dict[str, List[Tuple[str, str, str]]] = {}
+                for item in grupo:
+                    por_carpeta.setdefault(os.path.dirname(item[1]), []).append(item)
+                
+                for outdir, items in por_carpeta.items():
+                    os.makedirs(outdir, exist_ok=True)
+                    
+                    group = []
+                    for word_path, pdf_path, previous in items:
+                        produced = self._produced_path(word_path, outdir)
+                        try:
+                            _discard_pdf(pdf_path)
+                            if produced != pdf_path:
+                                _discard_pdf(produced)
+                        except OSError as e:
+                            failed.append((word_path, pdf_path,
+                                           f"No se pudo reemplazar el PDF previo: {e}"))
+                            continue
+                        group.append((word_path, pdf_path, previous))
+                    
+                    if not group:
+                        continue
+                    
+                    error, timed_out = self._run(
+                        soffice, profile_dir, [w for w, _, _ in group], outdir
+                    )
+                    
+                    for word_path, pdf_path, _ in group:
+                        produced = self._produced_path(word_path, outdir)
+                        if produced != pdf_path and os.path.exists(produced):
+                            os.replace(produced, pdf_path)
+                        
+                        if _pdf_ok(pdf_path):
+                            yield word_path, True, pdf_path
+                            continue
+                        
+                        message = error or "LibreOffice no generó el PDF"
+                        
+                        # Solo un documento convertido a solas se puede dar por permanente
+                        if len(group) == 1 and not timed_out and \
+                                classify_error(message) == PERMANENT:
+                            yield word_path, False, f"Error permanente: {message}"
+                        else:
+                            failed.append((word_path, pdf_path, message))
+            
+            pending = failed
+            if pending and attempt < retry:
+                self._retry_wait(attempt)
+        
+        for word_path, _, error in pending:
+            yield word_path, False, f"Error después de {retry} intentos: {error}"
+    
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'backend': self.name,
+            'timeouts': self.timeouts,
+            'invocations': self.invocations
+        }
+
+
+class FakeWordAutomation(WordAutomation):
+    """
+    Instancia de Word falsa: escribe un PDF mínimo por documento.
+    La latencia, los fallos y los cuelgues son configurables y deterministas:
+    el resultado de cada intento depende solo de la semilla, el nombre del
+    documento y el número de intento (no del orden de los trabajadores).
+    Un cuelgue bloquea convert hasta que el watchdog llama a kill().
+    """
+    
+    # Mensajes con la forma de los errores reales (ver classify_error)
+    TRANSIENT_ERROR = "Llamada rechazada por el destinatario (fallo simulado)"
+    PERMANENT_ERROR = "El documento está dañado (fallo permanente simulado)"
+    KILLED_ERROR = "El servidor RPC no está disponible (instancia terminada)"
+    
+    def __init__(self,
+                 latency: float = 0.0,
+                 failure_rate: float = 0.0,
+                 permanent_rate: float = 0.0,
+                 hang_probability: float = 0.0,
+                 seed: int = 0,
+                 killable: bool = True,
+                 attempts: Optional[Dict[str, int]] = None,
+                 lock: Optional[threading.Lock] = None):
+        """
+        Args:
+            latency: Segundos por conversión
+            failure_rate: Probabilidad de error transitorio por intento
+            permanent_rate: Probabilidad de error permanente por intento
+            hang_probability: Probabilidad de cuelgue por intento
+            seed: Semilla de los fallos simulados
+            killable: False simula un proceso que kill() no logra terminar
+            attempts: Intentos por documento, compartidos entre instancias
+            lock: Protege attempts entre hilos
+        """
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.permanent_rate = permanent_rate
+        self.hang_probability = hang_probability
+        self.seed = seed
+        self.killable = killable
+        self.attempts = attempts if attempts is not None else {}
+        self._lock = lock or threading.Lock()
+        self._killed = threading.Event()
+        self.running = False
+    
+    def _draw(self, word_path: str) -> float:
+        """Valor en [0, 1) del intento actual del documento"""
+        name = os.path.basename(word_path)
+        with self._lock:
+            attempt = self.attempts[name] = self.attempts.get(name, 0) + 1
+        return random.Random(f"{self.seed}:{name}:{attempt}").random()
+    
+    def start(self) -> None:
+        self.running = True
+    
+    def convert(self, word_path: str, pdf_path: str) -> None:
+        if not self.running:
+            raise RuntimeError("La instancia de Word no está iniciada")
+        
+        draw = self._draw(word_path)
+        
+        if draw < self.hang_probability:
+            self._killed.wait()
+            raise RuntimeError(self.KILLED_ERROR)
+        
+        time.sleep(self.latency)
+        draw -= self.hang_probability
+        
+        if draw < self.permanent_rate:
+            raise RuntimeError(self.PERMANENT_ERROR)
+        if draw < self.permanent_rate + self.failure_rate:
+            raise RuntimeError(self.TRANSIENT_ERROR)
+        
+        with open(pdf_path, 'wb') as f:
+            f.write(MINIMAL_PDF)
+    
+    def quit(self) -> None:
+        self.running = False
+    
+    def kill(self) -> bool:
+        if not self.killable:
+            return False
+        self.running = False
+        self._killed.set()
+        return True
+
+
+class FakeBackend(WordCOMBackend):
+    """
+    Motor falso para pruebas y benchmarks: el motor Word real (reintentos,
+    clasificación de errores, sesión con watchdog) sobre FakeWordAutomation.
+    """
+    
+    name = 'fake'
+    
+    # Sin procesos de Word: el límite es solo el de CPU
+    MAX_WORKERS = None
+    
+    def __init__(self,
+                 latency: float = 0.0,
+                 failure_rate: float = 0.0,
+                 permanent_rate: float = 0.0,
+                 hang_probability: float = 0.0,
+                 seed: int = 0,
+                 killable: bool = True,
+                 timeout: Optional[float] = None,
+                 retry_delay: Optional[float] = None,
+                 recycle_after: Optional[int] = None):
+        """
+        Args:
+            latency: Segundos por conversión
+            failure_rate: Probabilidad de error transitorio por intento
+            permanent_rate: Probabilidad de error permanente por intento
+            hang_probability: Probabilidad de cuelgue por intento (lo corta el watchdog)
+            seed: Semilla de los fallos simulados
+            killable: False simula instancias colgadas que no pueden terminarse
+            timeout: Segundos máximos por documento (watchdog)
+            retry_delay: Espera tras el primer fallo (None = RETRY_DELAY)
+            recycle_after: Documentos por instancia antes de reciclarla
+        """
+        super().__init__(self._new_automation, recycle_after, timeout)
+        self.simulation = {
+            'latency': latency,
+            'failure_rate': failure_rate,
+            'permanent_rate': permanent_rate,
+            'hang_probability': hang_probability,
+            'seed': seed,
+            'killable': killable
+        }
+        if retry_delay is not None:
+            self.RETRY_DELAY = retry_delay
+        self.attempts: Dict[str, int] = {}
+        self._attempts_lock = threading.Lock()
+    
+    def _new_automation(self) -> FakeWordAutomation:
+        return FakeWordAutomation(attempts=self.attempts, lock=self._attempts_lock,
+                                  **self.simulation)
+    
+    def describe(self) -> Dict[str, Any]:
+        description = super().describe()
+        description['intentos'] = sum(self.attempts.values())
+        return description
+
+
+# Motores por nombre de configuración
+BACKENDS = {
+    WordCOMBackend.name: WordCOMBackend,
+    LibreOfficeBackend.name: LibreOfficeBackend,
+    FakeBackend.name: FakeBackend
+}
+
+# Orden de preferencia para 'auto' (el motor falso nunca se elige solo)
+DEFAULT_ORDER = [WordCOMBackend.name, LibreOfficeBackend.name]
+
+
+def load_converter_settings() -> Dict[str, Any]:
+    """
+    Lee la sección certificates de settings.json.
+    
+    Returns:
+        Configuración (vacía si el archivo no existe o no es válido)
+    """
+    try:
+        with open(AppPaths.get_config_file(), 'r', encoding='utf-8') as f:
+            return json.load(f).get('certificates', {}) or {}
+    except (OSError, ValueError):
+        return {}
+
+
+def create_backend(name: str, settings: Optional[Dict[str, Any]] = None) -> ConverterBackend:
+    """
+    Crea un motor por nombre con las opciones de settings.json.
+    
+    Args:
+        name: 'word', 'libreoffice' o 'fake'
+        settings: Sección certificates de la configuración
+    
+    Returns:
+        Motor de conversión
+    
+    Raises:
+        ValueError: Si el nombre no corresponde a ningún motor
+    """
+    settings = settings or {}
+    
+    if name == LibreOfficeBackend.name:
+        backend = LibreOfficeBackend(
+            soffice_path=settings.get('libreoffice_path'),
+            chunk_size=settings.get('libreoffice_chunk_size'),
+            timeout=settings.get('conversion_timeout')
+        )
+    elif name == WordCOMBackend.name:
+        backend = WordCOMBackend(
+            recycle_after=settings.get('word_recycle_after'),
+            timeout=settings.get('conversion_timeout')
+        )
+    elif name == FakeBackend.name:
+        backend = FakeBackend(timeout=settings.get('conversion_timeout'))
+    elif name in BACKENDS:
+        backend = BACKENDS[name]()
+    else:
+        raise ValueError(f"Motor de conversión desconocido: {name}")
+    
+    backend.probe_ttl = settings.get('converter_probe_ttl', 0) or 0
+    return backend
+
+
+def select_backend(preferred: Optional[str] = None,
+                   settings: Optional[Dict[str, Any]] = None) -> ConverterBackend:
+    """
+    Elige el motor configurado o, si no está disponible, el siguiente de la
+    lista de respaldo.
+    
+    Args:
+        preferred: Nombre del motor (None = settings['converter_backend'])
+        settings: Sección certificates (None = leer settings.json)
+    
+    Returns:
+        Primer motor disponible; si ninguno lo está, el preferido (la
+        conversión reportará el error)
+    """
+    if settings is None:
+        settings = load_converter_settings()
+    
+    name = preferred or settings.get('converter_backend', 'auto')
+    fallback = settings.get('converter_fallback', DEFAULT_ORDER)
+    
+    order = list(DEFAULT_ORDER) if name == 'auto' else [name]
+    order += [candidate for candidate in fallback if candidate not in order]
+    
+    backends = [create_backend(candidate, settings) for candidate in order]
+    for backend in backends:
+        if backend.is_available():
+            return backend
+    
+    return backends[0]
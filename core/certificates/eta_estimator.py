@@ -0,0 +1,139 @@
+"""
+Módulo de estimación del tiempo restante de la generación de certificados.
+Suaviza la duración por certificado de cada fase con una media móvil
+exponencial y suma el trabajo pendiente de la fase actual y las siguientes.
+"""
+
+import time
+from typing import Dict, Optional
+
+
+class ETAEstimator:
+    """Estimador de tiempo restante por fases (Word, PDF nativo, conversión)"""
+    
+    # Peso de la última muestra en la media móvil exponencial
+    ALPHA = 0.2
+    
+    # Segundos por certificado (un trabajador) supuestos para fases sin muestras
+    PRIOR_SECONDS = {
+        'word': 0.05,
+        'pdf': 0.05,
+        'conversion': 1.5
+    }
+    
+    def __init__(self, alpha: Optional[float] = None, clock=time.perf_counter):
+        """
+        Inicializa el estimador.
+        
+        Args:
+            alpha: Peso de la última muestra (0-1); por defecto ALPHA
+            clock: Reloj monótono en segundos (inyectable)
+        """
+        self.alpha = alpha or self.ALPHA
+        self.clock = clock
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.order = []
+        self.current = None
+    
+    def add_phase(self, phase: str, total: int, workers: int = 1) -> None:
+        """
+        Registra una fase con su número de certificados pendientes.
+        
+        Args:
+            phase: Nombre de la fase ('word', 'pdf', 'conversion')
+            total: Certificados a procesar en la fase
+            workers: Trabajadores en paralelo de la fase
+        """
+        if phase not in self.phases:
+            self.order.append(phase)
+        
+        self.phases[phase] = {
+            'total': max(0, total),
+            'done': 0,
+            'workers': max(1, workers),
+            'ewma': None,
+            'last_time': None
+        }
+    
+    def start_phase(self, phase: str, workers: Optional[int] = None) -> None:
+        """
+        Marca el inicio de una fase; las fases anteriores quedan terminadas.
+        
+        Args:
+            phase: Nombre de la fase
+            workers: Trabajadores en paralelo (None = el registrado)
+        """
+        if phase not in self.phases:
+            self.add_phase(phase, 0)
+        
+        for name in self.order[:self.order.index(phase)]:
+            self.phases[name]['done'] = self.phases[name]['total']
+        
+        state = self.phases[phase]
+        if workers:
+            state['workers'] = max(1, workers)
+        state['last_time'] = self.clock()
+        self.current = phase
+    
+    def update(self, phase: str, done: int, total: Optional[int] = None) -> float:
+        """
+        Registra el avance de una fase y retorna el tiempo restante total.
+        
+        La duración por certificado se mide entre actualizaciones sobre el
+        reloj de pared y se normaliza por trabajador, de modo que una ráfaga
+        (arranque de Word, reintentos COM) mueve la media sin dispararla.
+        
+        Args:
+            phase: Nombre de la fase
+            done: Certificados procesados en la fase (acumulado)
+            total: Total de la fase si cambió respecto al registrado
+        
+        Returns:
+            Segundos restantes estimados de todas las fases
+        """
+        if phase != self.current:
+            self.start_phase(phase)
+        
+        state = self.phases[phase]
+        if total is not None:
+            state['total'] = total
+        
+        now = self.clock()
+        delta = done - state['done']
+        
+        if delta > 0:
+            sample = (now - state['last_time']) * state['workers'] / delta
+            
+            if state['ewma'] is None:
+                state['ewma'] = sample
+            else:
+                state['ewma'] += self.alpha * (sample - state['ewma'])
+            
+            state['done'] = done
+            state['last_time'] = now
+        
+        return self.remaining()
+    
+    def _seconds_per_item(self, phase: str) -> float:
+        """Duración por certificado y trabajador: media móvil o valor supuesto"""
+        ewma = self.phases[phase]['ewma']
+        if ewma is not None:
+            return ewma
+        return self.PRIOR_SECONDS.get(phase, 0.0)
+    
+    def remaining(self) -> float:
+        """
+        Tiempo restante de la fase actual y de las fases siguientes.
+        
+        Returns:
+            Segundos restantes estimados
+        """
+        total = 0.0
+        
+        for phase in self.order:
+            state = self.phases[phase]
+            pendientes = max(0, state['total'] - state['done'])
+            if pendientes:
+                total += self._seconds_per_item(phase) * pendientes / state['workers']
+        
+        return total
@@ -0,0 +1,661 @@
+"""
+Módulo de generación nativa de certificados PDF.
+Renderiza los PDF directamente desde los datos con ReportLab, usando un layout
+derivado de la plantilla Word (bloques de texto, tablas, fuentes, logo y
+posiciones), sin Word ni conversión docx -> pdf. Los textos de encabezados y
+pies de página no se renderizan: una plantilla con placeholders en ellos se
+rechaza.
+"""
+
+import io
+from typing import Tuple, Dict, List, Optional, Any
+from xml.sax.saxutils import escape
+from docx.enum.table import WD_TABLE_ALIGNMENT
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph as DocxParagraph
+from reportlab import rl_config
+from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Paragraph
+
+from core.certificates.word_generator import WordCertificateGenerator
+
+
+# Imágenes como flujo binario: la codificación ASCII85 en Python puro
+# domina el tiempo de renderizado y aumenta el tamaño del PDF
+rl_config.useA85 = 0
+
+# Conversión de unidades OOXML
+EMU_PER_PT = 12700
+
+# Interlineado aproximado de Word para espaciado sencillo
+LINE_HEIGHT = 1.15
+
+# Márgenes izquierdo/derecho por defecto de las celdas de tabla en Word (0,19 cm)
+CELL_PADDING = 5.4
+
+# Formatos de imagen que ReportLab puede insertar (EMF/WMF se omiten)
+SUPPORTED_IMAGE_TYPES = ('image/png', 'image/jpeg', 'image/gif', 'image/bmp')
+
+ALIGNMENTS = {
+    WD_ALIGN_PARAGRAPH.CENTER: TA_CENTER,
+    WD_ALIGN_PARAGRAPH.RIGHT: TA_RIGHT,
+    WD_ALIGN_PARAGRAPH.JUSTIFY: TA_JUSTIFY
+}
+
+# Familias estándar PDF (sin incrustar fuentes) según el tipo de fuente Word
+FONT_FAMILIES = {
+    'sans-serif': 'Helvetica',
+    'serif': 'Times-Roman'
+}
+
+
+class NativePDFGenerator(WordCertificateGenerator):
+    """Generador de certificados PDF sin Word a partir del layout de la plantilla"""
+    
+    OUTPUT_EXTENSION = '.pdf'
+    
+    def __init__(self, template_path: str):
+        """
+        Inicializa el generador y deriva el layout de la plantilla.
+        
+        Args:
+            template_path: Ruta a la plantilla Word
+        
+        Raises:
+            ValueError: Si la plantilla no existe o no es válida
+        """
+        super().__init__(template_path)
+        
+        # El layout se deriva una vez por versión de la plantilla
+        self.layout = self.template_entry.derived.get('native_layout')
+        if self.layout is None:
+            self.layout = self._build_layout()
+            self.template_entry.derived['native_layout'] = self.layout
+    
+    # ========================================
+    # DERIVACIÓN DEL LAYOUT
+    # ========================================
+    
+    def _build_layout(self) -> Dict[str, Any]:
+        """
+        Deriva el layout de página desde la plantilla cargada.
+        
+        Returns:
+            Diccionario con dimensiones, márgenes, bloques de texto, tablas e imágenes
+        
+        Raises:
+            ValueError: Si la plantilla tiene placeholders que no se renderizan
+        """
+        self.check_template(self.template)
+        
+        section = self.template.sections[0]
+        default_size, default_family = self._document_defaults()
+        
+        layout = {
+            'page_width': section.page_width.pt,
+            'page_height': section.page_height.pt,
+            'left': section.left_margin.pt,
+            'right': section.page_width.pt - section.right_margin.pt,
+            'top': section.top_margin.pt,
+            'bottom': section.page_height.pt - section.bottom_margin.pt,
+            'header_distance': section.header_distance.pt if section.header_distance else 0,
+            'first_page_drawings': [],
+            'page_drawings': [],
+            'blocks': []
+        }
+        
+        # Encabezados: el de primera página aplica si la sección lo define
+        if section.different_first_page_header_footer:
+            layout['first_page_drawings'] = self._header_drawings(section.first_page_header)
+        else:
+            layout['first_page_drawings'] = self._header_drawings(section.header)
+        layout['page_drawings'] = self._header_drawings(section.header)
+        
+        # Cuerpo en orden de documento: párrafos y tablas
+        body = self.template.element.body
+        for child in body.iterchildren():
+            if child.tag == qn('w:p'):
+                para = DocxParagraph(child, self.template._body)
+                layout['blocks'].append(
+                    self._parse_paragraph(para, default_size, default_family)
+                )
+            elif child.tag == qn('w:tbl'):
+                table = Table(child, self.template._body)
+                layout['blocks'].append(
+                    self._parse_table(table, layout, default_size, default_family)
+                )
+        
+        return layout
+    
+    @staticmethod
+    def check_template(document) -> None:
+        """
+        Rechaza plantillas con placeholders que el layout nativo no renderiza:
+        en encabezados o pies de página (solo se dibujan sus imágenes y líneas)
+        y en tablas anidadas. Se usa también al validar la ejecución, antes de
+        producir cualquier salida.
+        
+        Args:
+            document: Documento python-docx de la plantilla
+        
+        Raises:
+            ValueError: Si la plantilla tiene placeholders en esas ubicaciones
+        """
+        for cell in document.element.body.iter(qn('w:tc')):
+            for nested in cell.iter(qn('w:tbl')):
+                text = ''.join(node.text or '' for node in nested.iter(qn('w:t')))
+                if '{{' in text:
+                    raise ValueError(
+                        "La plantilla tiene placeholders en tablas anidadas, "
+                        "que el PDF nativo no renderiza. Use pdf_backend='word'."
+                    )
+        
+        for section in document.sections:
+            for name in ('header', 'first_page_header', 'even_page_header',
+                         'footer', 'first_page_footer', 'even_page_footer'):
+                part = getattr(section, name)
+                # Sin definición propia: no se accede a _element para no crearla
+                if part.is_linked_to_previous:
+                    continue
+                text = ''.join(node.text or '' for node in part._element.iter(qn('w:t')))
+                if '{{' in text:
+                    raise ValueError(
+                        "La plantilla tiene placeholders en encabezados o pies de página, "
+                        "que el PDF nativo no renderiza. Use pdf_backend='word'."
+                    )
+    
+    def _parse_table(self,
+                     table: Table,
+                     layout: Dict[str, Any],
+                     default_size: float,
+                     default_family: str) -> Dict[str, Any]:
+        """
+        Convierte una tabla de la plantilla en un bloque de filas y celdas.
+        Se respetan los anchos de columna, las celdas combinadas y la altura
+        mínima de fila; los bordes y sombreados no se dibujan.
+        
+        Args:
+            table: Tabla python-docx
+            layout: Layout en construcción (márgenes de la página)
+            default_size: Tamaño de fuente por defecto
+            default_family: Familia genérica por defecto
+        
+        Returns:
+            Diccionario con posición horizontal y filas de celdas
+        """
+        content_width = layout['right'] - layout['left']
+        grid = [col.w.pt if col.w is not None else None
+                for col in table._tbl.tblGrid.gridCol_lst]
+        if not grid or None in grid:
+            grid = [content_width / max(len(grid), 1)] * max(len(grid), 1)
+        
+        total_width = sum(grid)
+        left = layout['left']
+        if table.alignment == WD_TABLE_ALIGNMENT.CENTER:
+            left += (content_width - total_width) / 2
+        elif table.alignment == WD_TABLE_ALIGNMENT.RIGHT:
+            left += content_width - total_width
+        
+        rows = []
+        for row in table.rows:
+            cells = []
+            column = 0
+            for tc in row._tr.tc_lst:
+                span = tc.grid_span
+                cell_left = sum(grid[:column])
+                cell_width = sum(grid[column:column + span])
+                column += span
+                
+                # Continuación de una combinación vertical: sin contenido propio
+                if tc.vMerge == 'continue':
+                    continue
+                
+                cells.append({
+                    'left': cell_left + CELL_PADDING,
+                    'width': max(cell_width - 2 * CELL_PADDING, 1.0),
+                    'blocks': [
+                        self._parse_paragraph(DocxParagraph(p, table), default_size, default_family)
+                        for p in tc.p_lst
+                    ]
+                })
+            
+            rows.append({
+                'height': row.height.pt if row.height is not None else 0.0,
+                'cells': cells
+            })
+        
+        return {
+            'kind': 'table',
+            'left': left,
+            'rows': rows
+        }
+    
+    def _document_defaults(self) -> Tuple[float, str]:
+        """Tamaño y familia de fuente por defecto (estilo Normal)"""
+        normal = self.template.styles['Normal'].font
+        size = normal.size.pt if normal.size else 11.0
+        return size, self._font_family(normal.name)
+    
+    @staticmethod
+    def _font_family(font_name: Optional[str]) -> str:
+        """Mapea un nombre de fuente Word a una familia genérica"""
+        if font_name and any(name in font_name for name in ('Times', 'Cambria', 'Georgia', 'Garamond')):
+            return 'serif'
+        return 'sans-serif'
+    
+    def _header_drawings(self, header) -> List[Dict[str, Any]]:
+        """Extrae los dibujos (logo, líneas) de un encabezado"""
+        drawings = []
+        for drawing in header._element.iter(qn('w:drawing')):
+            parsed = self._parse_drawing(drawing, header.part)
+            if parsed:
+                drawings.append(parsed)
+        return drawings
+    
+    def _parse_drawing(self, drawing, part) -> Optional[Dict[str, Any]]:
+        """
+        Convierte un w:drawing en una instrucción de dibujo.
+        
+        Args:
+            drawing: Elemento w:drawing
+            part: Parte del paquete que contiene las relaciones de imagen
+        
+        Returns:
+            Diccionario con tipo, tamaño y posición, o None si no se puede dibujar
+        """
+        extent = drawing.find('.//' + qn('wp:extent'))
+        if extent is None:
+            return None
+        
+        width = int(extent.get('cx')) / EMU_PER_PT
+        height = int(extent.get('cy')) / EMU_PER_PT
+        
+        result = {
+            'width': width,
+            'height': height,
+            'inline': drawing.find(qn('wp:inline')) is not None,
+            'h_rel': 'column', 'h_offset': 0.0, 'h_align': None,
+            'v_rel': 'paragraph', 'v_offset': 0.0, 'v_align': None
+        }
+        
+        anchor = drawing.find(qn('wp:anchor'))
+        if anchor is not None:
+            for axis, tag in (('h', 'wp:positionH'), ('v', 'wp:positionV')):
+                position = anchor.find(qn(tag))
+                if position is None:
+                    continue
+                result[f'{axis}_rel'] = position.get('relativeFrom')
+                offset = position.find(qn('wp:posOffset'))
+                align = position.find(qn('wp:align'))
+                if offset is not None:
+                    result[f'{axis}_offset'] = int(offset.text) / EMU_PER_PT
+                if align is not None:
+                    result[f'{axis}_align'] = align.text
+        
+        blip = drawing.find('.//' + qn('a:blip'))
+        if blip is not None:
+            image_part = part.related_parts.get(blip.get(qn('r:embed')))
+            if image_part is None or image_part.content_type not in SUPPORTED_IMAGE_TYPES:
+                return None
+            result['kind'] = 'image'
+            result['image'] = ImageReader(io.BytesIO(image_part.blob))
+            return result
+        
+        # Formas sin imagen muy delgadas: líneas (p. ej. línea de firma)
+        if height < 2:
+            result['kind'] = 'line'
+            return result
+        
+        return None
+    
+    def _parse_paragraph(self, para, default_size: float, default_family: str) -> Dict[str, Any]:
+        """
+        Convierte un párrafo de la plantilla en un bloque de texto.
+        
+        Args:
+            para: Párrafo python-docx
+            default_size: Tamaño de fuente por defecto
+            default_family: Familia genérica por defecto
+        
+        Returns:
+            Diccionario con segmentos de texto, alineación y espaciado
+        """
+        segments = []
+        family = None
+        
+        for run in para.runs:
+            text = run.text
+            if not text:
+                continue
+            
+            style = (
+                bool(run.bold),
+                bool(run.italic),
+                bool(run.underline),
+                run.font.size.pt if run.font.size else default_size
+            )
+            if family is None:
+                family = self._font_family(run.font.name) if run.font.name else default_family
+            
+            # Fusionar runs contiguos con el mismo formato
+            if segments and segments[-1]['style'] == style:
+                segments[-1]['text'] += text
+            else:
+                segments.append({'text': text, 'style': style})
+        
+        # Un placeholder partido entre formatos distintos se renderiza como en
+        # el camino Word: todo el párrafo con el formato del primer run
+        if any(seg['text'].count('{{') != seg['text'].count('}}') for seg in segments):
+            segments = [{
+                'text': ''.join(seg['text'] for seg in segments),
+                'style': segments[0]['style']
+            }]
+        
+        mark_size = self._mark_size(para) or default_size
+        size = max([seg['style'][3] for seg in segments] or [mark_size])
+        
+        alignment = para.alignment
+        if alignment is None:
+            alignment = para.style.paragraph_format.alignment
+        
+        fmt = para.paragraph_format
+        style_fmt = para.style.paragraph_format
+        space_before = fmt.space_before if fmt.space_before is not None else style_fmt.space_before
+        space_after = fmt.space_after if fmt.space_after is not None else style_fmt.space_after
+        
+        drawings = []
+        for drawing in para._p.iter(qn('w:drawing')):
+            parsed = self._parse_drawing(drawing, self.template.part)
+            if parsed:
+                drawings.append(parsed)
+        
+        has_placeholders = any('{{' in seg['text'] for seg in segments)
+        
+        style = ParagraphStyle(
+            name=f"bloque_{id(para)}",
+            fontName=FONT_FAMILIES[family or default_family],
+            fontSize=size,
+            leading=size * LINE_HEIGHT,
+            alignment=ALIGNMENTS.get(alignment, TA_LEFT)
+        )
+        
+        return {
+            'kind': 'paragraph',
+            'segments': segments,
+            'style': style,
+            # Los bloques estáticos se convierten a markup una sola vez
+            'markup': None if has_placeholders else self._segments_markup(segments),
+            'line_height': mark_size * LINE_HEIGHT if not segments else size * LINE_HEIGHT,
+            'space_before': space_before.pt if space_before else 0.0,
+            'space_after': space_after.pt if space_after else 0.0,
+            'drawings': drawings
+        }
+    
+    @staticmethod
+    def _mark_size(para) -> Optional[float]:
+        """Tamaño de la marca de párrafo (define la altura de párrafos vacíos)"""
+        size = para._p.find(f"{qn('w:pPr')}/{qn('w:rPr')}/{qn('w:sz')}")
+        if size is not None:
+            return int(size.get(qn('w:val'))) / 2
+        return None
+    
+    # ========================================
+    # RENDERIZADO
+    # ========================================
+    
+    @staticmethod
+    def _segments_markup(segments: List[Dict[str, Any]], data: Optional[dict] = None) -> str:
+        """Convierte segmentos en markup de Paragraph, sustituyendo placeholders si hay datos"""
+        parts = []
+        for seg in segments:
+            text = escape(seg['text'])
+            if data:
+                for key, value in data.items():
+                    placeholder = f"{{{{{key}}}}}"
+                    if placeholder in text:
+                        str_value = str(value) if value is not None else ""
+                        text = text.replace(placeholder, escape(str_value))
+            text = text.replace('\n', '<br/>')
+            
+            bold, italic, underline, size = seg['style']
+            text = f'<font size="{size}">{text}</font>'
+            if bold:
+                text = f'<b>{text}</b>'
+            if italic:
+                text = f'<i>{text}</i>'
+            if underline:
+                text = f'<u>{text}</u>'
+            parts.append(text)
+        
+        return ''.join(parts)
+    
+    def _draw(self,
+              pdf_canvas,
+              drawing: Dict[str, Any],
+              para_y: float,
+              area: Optional[Tuple[float, float]] = None) -> None:
+        """
+        Dibuja una imagen o línea posicionada según su anclaje.
+        
+        Args:
+            pdf_canvas: Canvas destino
+            drawing: Instrucción de dibujo (_parse_drawing)
+            para_y: Posición del párrafo desde el borde superior
+            area: Izquierda y ancho de la columna (None = márgenes de la página;
+                  en tablas, la celda)
+        """
+        layout = self.layout
+        width, height = drawing['width'], drawing['height']
+        
+        # Posición horizontal
+        if drawing['h_rel'] == 'page':
+            area_left, area_width = 0.0, layout['page_width']
+        elif area is not None:
+            area_left, area_width = area
+        else:
+            area_left, area_width = layout['left'], layout['right'] - layout['left']
+        
+        if drawing['h_align'] == 'center':
+            x = area_left + (area_width - width) / 2
+        elif drawing['h_align'] == 'right':
+            x = area_left + area_width - width
+        else:
+            x = area_left + drawing['h_offset']
+        
+        # Posición vertical (desde el borde superior)
+        if drawing['v_rel'] == 'page':
+            y = 0.0 if drawing['v_align'] == 'top' else drawing['v_offset']
+        elif drawing['v_rel'] in ('margin', 'topMargin'):
+            y = (0.0 if drawing['v_rel'] == 'topMargin' else layout['top']) + drawing['v_offset']
+        else:
+            y = para_y + drawing['v_offset']
+        
+        # ReportLab usa origen en la esquina inferior izquierda
+        bottom_y = layout['page_height'] - y - height
+        
+        if drawing['kind'] == 'image':
+            pdf_canvas.drawImage(drawing['image'], x, bottom_y, width, height, mask='auto')
+        else:
+            pdf_canvas.setLineWidth(max(height, 0.5))
+            pdf_canvas.line(x, bottom_y, x + width, bottom_y)
+    
+    def _start_page(self, pdf_canvas, first: bool) -> None:
+        """Dibuja los elementos de encabezado de una página nueva"""
+        layout = self.layout
+        drawings = layout['first_page_drawings'] if first else layout['page_drawings']
+        for drawing in drawings:
+            self._draw(pdf_canvas, drawing, para_y=layout['header_distance'])
+    
+    def _block_paragraph(self, block: Dict[str, Any], data: dict) -> Paragraph:
+        """Paragraph de ReportLab de un bloque de texto con los datos sustituidos"""
+        markup = block['markup']
+        if markup is None:
+            markup = self._segments_markup(block['segments'], data)
+        return Paragraph(markup, block['style'])
+    
+    def _flow_cell(self,
+                   blocks: List[Dict[str, Any]],
+                   data: dict,
+                   width: float) -> Tuple[List[Tuple[float, Optional[Paragraph], Dict[str, Any]]], float]:
+        """
+        Ubica los párrafos de una celda sin dibujarlos.
+        
+        Args:
+            blocks: Bloques de texto de la celda
+            data: Diccionario placeholder -> valor
+            width: Ancho útil de la celda
+        
+        Returns:
+            Tupla (desplazamiento, paragraph o None, bloque) por bloque y altura total
+        """
+        max_height = self.layout['bottom'] - self.layout['top']
+        items = []
+        y = 0.0
+        
+        for block in blocks:
+            y += block['space_before']
+            height = block['line_height']
+            paragraph = None
+            
+            if block['segments']:
+                paragraph = self._block_paragraph(block, data)
+                _, height = paragraph.wrap(width, max_height)
+            
+            for drawing in block['drawings']:
+                if drawing['inline']:
+                    height = max(height, drawing['height'])
+            
+            items.append((y, paragraph, block))
+            y += height + block['space_after']
+        
+        return items, y
+    
+    def _render_table(self, pdf_canvas, block: Dict[str, Any], data: dict, y: float) -> Tuple[float, int]:
+        """
+        Dibuja una tabla fila por fila; una fila que no entra pasa a una página nueva.
+        
+        Args:
+            pdf_canvas: Canvas destino
+            block: Bloque de tabla (_parse_table)
+            data: Diccionario placeholder -> valor
+            y: Posición actual desde el borde superior
+        
+        Returns:
+            Tupla (posición tras la tabla, páginas nuevas agregadas)
+        """
+        layout = self.layout
+        pages = 0
+        
+        for row in block['rows']:
+            flows = [self._flow_cell(cell['blocks'], data, cell['width']) for cell in row['cells']]
+            height = max([row['height']] + [cell_height for _, cell_height in flows])
+            
+            if y + height > layout['bottom'] and y > layout['top']:
+                pdf_canvas.showPage()
+                self._start_page(pdf_canvas, first=False)
+                pages += 1
+                y = layout['top']
+            
+            for cell, (items, _) in zip(row['cells'], flows):
+                left = block['left'] + cell['left']
+                for offset, paragraph, cell_block in items:
+                    para_y = y + offset
+                    if paragraph is not None:
+                        paragraph.drawOn(pdf_canvas, left, layout['page_height'] - para_y - paragraph.height)
+                    for drawing in cell_block['drawings']:
+                        self._draw(pdf_canvas, drawing, para_y=para_y, area=(left, cell['width']))
+            
+            y += height
+        
+        return y, pages
+    
+    def render_pages(self, pdf_canvas, data: dict) -> int:
+        """
+        Renderiza un certificado como páginas nuevas de un canvas ReportLab.
+        Permite construir tanto PDFs individuales como documentos multi-página.
+        
+        Args:
+            pdf_canvas: Canvas destino (queda listo para la siguiente página)
+            data: Diccionario placeholder -> valor
+        
+        Returns:
+            Número de páginas agregadas
+        """
+        layout = self.layout
+        width = layout['right'] - layout['left']
+        self._start_page(pdf_canvas, first=True)
+        pages = 1
+        y = layout['top']
+        
+        for block in layout['blocks']:
+            if block['kind'] == 'table':
+                y, added = self._render_table(pdf_canvas, block, data, y)
+                pages += added
+                continue
+            
+            y += block['space_before']
+            height = block['line_height']
+            
+            if block['segments']:
+                paragraph = self._block_paragraph(block, data)
+                _, height = paragraph.wrap(width, layout['bottom'] - layout['top'])
+                
+                if y + height > layout['bottom']:
+                    # No entra en la página actual: continuar en una nueva
+                    pdf_canvas.showPage()
+                    self._start_page(pdf_canvas, first=False)
+                    pages += 1
+                    y = layout['top']
+                
+                paragraph.drawOn(pdf_canvas, layout['left'], layout['page_height'] - y - height)
+            
+            for drawing in block['drawings']:
+                self._draw(pdf_canvas, drawing, para_y=y)
+                if drawing['inline']:
+                    height = max(height, drawing['height'])
+            
+            y += height + block['space_after']
+        
+        pdf_canvas.showPage()
+        return pages
+    
+    def new_canvas(self, output) -> canvas.Canvas:
+        """
+        Crea un canvas ReportLab con el tamaño de página de la plantilla.
+        
+        Args:
+            output: Ruta o buffer binario de destino
+        
+        Returns:
+            Canvas listo para render_pages
+        """
+        return canvas.Canvas(
+            output,
+            pagesize=(self.layout['page_width'], self.layout['page_height']),
+            pageCompression=1
+        )
+    
+    def render_pdf_bytes(self, data: dict) -> bytes:
+        """
+        Renderiza un certificado PDF en memoria.
+        
+        Args:
+            data: Diccionario placeholder -> valor
+        
+        Returns:
+            Bytes del PDF
+        """
+        buffer = io.BytesIO()
+        pdf_canvas = self.new_canvas(buffer)
+        self.render_pages(pdf_canvas, data)
+        pdf_canvas.save()
+        return buffer.getvalue()
+    
+    def _render_bytes(self, data_dict: dict) -> bytes:
+        """Renderiza el certificado PDF en memoria (base de render_to_bytes y generate_batch)"""
+        return self.render_pdf_bytes(data_dict)
@@ -1,75 +1,144 @@
 """
 Módulo de conversión de certificados Word a PDF.
-Convierte archivos .docx a .pdf con manejo de reintentos.
+Convierte archivos .docx a .pdf con manejo de reintentos mediante un motor
+de conversión intercambiable (Word COM, LibreOffice headless o falso).
 """
 
 import os
 import time
+import queue
 import platform
-from pathlib import Path
-from typing import Tuple, Dict, List, Optional, Callable, Any
+import itertools
+import threading
+from typing import Tuple, Dict, List, Optional, Callable, Any, Iterable, Iterator, Union
+
+from core.certificates.word_session import WordAutomation
+from core.certificates.converter_backends import (
+    ConversionResult,
+    BACKENDS,
+    DEFAULT_ORDER,
+    ConverterBackend,
+    WordCOMBackend,
+    load_converter_settings,
+    select_backend
+)
+from core.certificates.conversion_pool import ConversionPool, conversion_workers, cpu_workers
+from core.certificates.conversion_errors import classify_error
+from core.certificates.conversion_manifest import ConversionManifest
 
 
 class PDFConverter:
     """Conversor de certificados Word a PDF con retry automático"""
     
-    def __init__(self):
-        """Inicializa el conversor"""
+    def __init__(self,
+                 backend: Union[str, ConverterBackend, None] = None,
+                 automation_factory: Optional[Callable[[], WordAutomation]] = None,
+                 recycle_after: Optional[int] = None,
+                 workers: Optional[int] = None):
+        """
+        Inicializa el conversor.
+        
+        Args:
+            backend: Motor de conversión o su nombre ('word', 'libreoffice',
+                     'fake', 'auto'); None = el configurado en settings.json,
+                     con respaldo al siguiente motor disponible
+            automation_factory: Constructor de instancias de Word para el motor
+                                Word (un objeto falso permite probar sin Word)
+            recycle_after: Documentos por instancia de Word antes de reiniciarla
+            workers: Trabajadores de conversión en paralelo (None = según
+                     cpu_limit_percent de settings.json)
+        
+        La elección del motor y la detección de su disponibilidad (que puede
+        iniciar Word) se difieren hasta la primera conversión.
+        """
         self.system = platform.system()
-        self.word_available = self._check_word_available()
+        
+        if isinstance(backend, ConverterBackend):
+            self._backend = backend
+        elif automation_factory is not None:
+            self._backend = WordCOMBackend(automation_factory, recycle_after)
+        else:
+            self._backend = None
+        
+        self._backend_name = backend if isinstance(backend, str) else None
+        self._requested_workers = workers
+        self._settings: Optional[Dict[str, Any]] = None
+        self._word_available: Optional[bool] = None
+        self._workers: Optional[int] = None
+    
+    @property
+    def settings(self) -> Dict[str, Any]:
+        """Sección certificates de settings.json (leída al primer uso)"""
+        if self._settings is None:
+            self._settings = load_converter_settings()
+        return self._settings
+    
+    @property
+    def backend(self) -> ConverterBackend:
+        """Motor de conversión (elegido al primer uso)"""
+        if self._backend is None:
+            self._backend = select_backend(self._backend_name, self.settings)
+        return self._backend
+    
+    @property
+    def word_available(self) -> bool:
+        """True si el motor puede convertir (detectado al primer uso)"""
+        if self._word_available is None:
+            self._word_available = self.backend.is_available()
+        return self._word_available
     
-    def _check_word_available(self) -> bool:
+    @property
+    def workers(self) -> int:
+        """Trabajadores de conversión en paralelo"""
+        if self._workers is None:
+            self._workers = conversion_workers(self.backend, self._requested_workers, self.settings)
+        return self._workers
+    
+    def estimated_workers(self) -> int:
         """
-        Verifica si MS Word está disponible en el sistema.
+        Trabajadores previstos sin elegir ni detectar el motor (para el ETA):
+        con el motor aún sin resolver se usa el máximo de los candidatos.
         
         Returns:
-            True si Word está disponible, False en caso contrario
+            Trabajadores (al menos 1)
         """
-        if self.system != "Windows":
-            return False
+        if self._workers is not None or self._backend is not None:
+            return self.workers
         
-        try:
-            import win32com.client
-            import pythoncom
-            
-            # Inicializar COM
-            pythoncom.CoInitialize()
-            
-            try:
-                # Intentar crear instancia de Word
-                word = win32com.client.Dispatch("Word.Application")
-                word.Visible = False
-                word.Quit()
-                return True
-            except Exception:
-                return False
-            finally:
-                pythoncom.CoUninitialize()
-                
-        except ImportError:
-            # win32com no disponible
-            return False
-        except Exception:
-            return False
+        name = self._backend_name or self.settings.get('converter_backend', 'auto')
+        candidates = DEFAULT_ORDER if name == 'auto' else [name]
+        limits = [BACKENDS[candidate].MAX_WORKERS for candidate in candidates
+                  if candidate in BACKENDS]
+        
+        workers = cpu_workers(self._requested_workers, self.settings)
+        if limits and all(limits):
+            workers = min(workers, max(limits))
+        return max(1, workers)
+    
+    def _unavailable_message(self) -> str:
+        """Mensaje de error cuando el motor no puede convertir"""
+        if self.backend.name == WordCOMBackend.name:
+            return "Microsoft Word no está instalado o no está disponible"
+        return f"El motor de conversión '{self.backend.name}' no está disponible"
     
     def convert_single(self,
                       word_path: str,
                       pdf_path: str,
                       retry: int = 3) -> Tuple[bool, str]:
         """
-        Convierte un archivo Word a PDF con reintentos usando win32com directamente.
+        Convierte un archivo Word a PDF con reintentos.
         
         Args:
             word_path: Ruta del archivo Word
             pdf_path: Ruta del archivo PDF de salida
             retry: Número de reintentos en caso de fallo
-            
+        
         Returns:
             Tupla (éxito, mensaje)
         """
-        # Verificar si Word está disponible
+        # Verificar si el motor está disponible
         if not self.word_available:
-            return False, "Microsoft Word no está instalado o no está disponible"
+            return False, self._unavailable_message()
         
         # Validar que el archivo Word existe
         if not os.path.exists(word_path):
@@ -87,203 +156,330 @@ class PDFConverter:
             except Exception as e:
                 return False, f"Error al crear directorio: {str(e)}"
         
-        # Convertir rutas a absolutas
-        word_path_abs = os.path.abspath(word_path)
-        pdf_path_abs = os.path.abspath(pdf_path)
+        # Convertir con rutas absolutas
+        items = [(os.path.abspath(word_path), os.path.abspath(pdf_path))]
+        for _, success, message in self.backend.convert_many(items, retry=retry):
+            return success, pdf_path if success else message
         
-        # Intentar conversión con reintentos
-        last_error = None
+        return False, "El motor de conversión no devolvió resultado"
+    
+    @staticmethod
+    def _word_sources(word_folder: str,
+                      word_files: Union[Iterable[str], 'queue.Queue', None]) -> Iterator[str]:
+        """
+        Rutas de los docx a convertir, en el orden de entrada.
         
-        for attempt in range(1, retry + 1):
-            word_app = None
-            doc = None
-            
-            try:
-                import win32com.client
-                import pythoncom
-                
-                # Inicializar COM
-                pythoncom.CoInitialize()
-                
-                try:
-                    # Crear instancia de Word
-                    word_app = win32com.client.Dispatch("Word.Application")
-                    word_app.Visible = False
-                    word_app.DisplayAlerts = 0  # No mostrar alertas
-                    
-                    # Abrir documento
-                    doc = word_app.Documents.Open(word_path_abs)
-                    
-                    # Guardar como PDF (formato 17 = PDF)
-                    doc.SaveAs(pdf_path_abs, FileFormat=17)
-                    
-                    # Cerrar documento
-                    doc.Close(False)
-                    
-                    # Verificar que se creó el PDF
-                    if os.path.exists(pdf_path) and os.path.getsize(pdf_path) > 0:
-                        return True, pdf_path
-                    else:
-                        last_error = "PDF creado pero está vacío"
-                        
-                except Exception as e:
-                    last_error = str(e)
-                    
-                finally:
-                    # Limpiar recursos
-                    try:
-                        if doc:
-                            doc.Close(False)
-                    except:
-                        pass
-                    
-                    try:
-                        if word_app:
-                            word_app.Quit()
-                    except:
-                        pass
-                    
-                    pythoncom.CoUninitialize()
-                    
-            except Exception as e:
-                last_error = f"Error al inicializar COM: {str(e)}"
-            
-            # Si no es el último intento, esperar antes de reintentar
-            if attempt < retry:
-                time.sleep(2)
+        Args:
+            word_folder: Carpeta con archivos Word (rutas relativas y respaldo)
+            word_files: Rutas o nombres de .docx, una cola terminada en None,
+                        o None para recorrer word_folder con os.scandir
         
-        # Si llegamos aquí, todos los intentos fallaron
-        return False, f"Error después de {retry} intentos: {last_error}"
+        Yields:
+            Ruta de cada docx
+        """
+        if word_files is None:
+            # Respaldo: recorrer la carpeta sin construir la lista completa
+            with os.scandir(word_folder) as entries:
+                for entry in entries:
+                    if entry.name.lower().endswith('.docx') and \
+                            not entry.name.startswith('~$') and entry.is_file():
+                        yield entry.path
+            return
+        
+        if isinstance(word_files, queue.Queue):
+            word_files = iter(word_files.get, None)
+        
+        for word_file in word_files:
+            yield word_file if os.path.dirname(word_file) else os.path.join(word_folder, word_file)
     
     def convert_batch(self,
                      word_folder: str,
                      pdf_folder: str,
                      progress_callback: Optional[Callable[[int, str, int, int], None]] = None,
-                     retry: int = 3) -> Dict[str, Any]:
+                     retry: int = 3,
+                     word_files: Union[Iterable[str], 'queue.Queue', None] = None,
+                     cache: Optional[Any] = None,
+                     incremental: Optional[str] = None) -> Dict[str, Any]:
         """
         Convierte múltiples archivos Word a PDF.
+        Los documentos se procesan a medida que llegan: los vigentes o
+        cacheados se resuelven al leerlos y el resto pasa al motor (repartido
+        entre self.workers trabajadores, cada uno con su propia instancia).
         
         Args:
             word_folder: Carpeta con archivos Word
             pdf_folder: Carpeta de salida para PDFs
-            progress_callback: Función callback(índice, mensaje, exitosos, total)
+            progress_callback: Función callback(índice, mensaje, exitosos, total);
+                               con una entrada sin tamaño conocido, total es lo
+                               recibido hasta el momento
             retry: Número de reintentos por archivo
-            
+            word_files: Rutas (o nombres dentro de word_folder) de los .docx a
+                        convertir: lista, iterable o queue.Queue terminada con
+                        None (p. ej. alimentada por la generación Word);
+                        None = todos los .docx de la carpeta (os.scandir)
+            cache: RenderCache opcional; el PDF se busca por hash del docx
+            incremental: 'mtime' o 'hash' para omitir los PDF vigentes según el
+                         manifiesto de la carpeta de salida (None = convertir todo)
+        
         Returns:
-            Diccionario con resultados:
+            Diccionario con resultados (listas en el orden de entrada):
             {
                 'total': int,
                 'exitosos': int,
                 'fallidos': int,
                 'archivos_generados': List[str],
-                'errores': List[Dict],
-                'word_available': bool
+                'errores': List[Dict],  # archivo, error y tipo (transitorio/permanente)
+                'omitidos': int,  # PDF vigentes no convertidos (modo incremental)
+                'omitidos_por': Dict[str, int],  # omitidos por fecha ('mtime') o hash
+                'timeouts': int,  # documentos que superaron el tiempo máximo
+                'word_available': Optional[bool],  # None si no hizo falta detectar el motor
+                'backend': Optional[Dict],  # motor usado y sus contadores
+                'workers': List[Dict],  # salud de cada trabajador en paralelo
+                'tiempos_por_archivo': Dict[str, float]  # ruta del docx (de entrada) -> segundos
             }
         """
         # Validar carpeta de entrada
         if not os.path.exists(word_folder):
             raise ValueError(f"Carpeta Word no existe: {word_folder}")
         
+        if incremental and incremental not in ConversionManifest.MODES:
+            raise ValueError(f"Modo incremental inválido: {incremental}")
+        
         # Crear carpeta de salida si no existe
         os.makedirs(pdf_folder, exist_ok=True)
         
-        # Listar archivos .docx
-        word_files = [f for f in os.listdir(word_folder) 
-                     if f.lower().endswith('.docx') and not f.startswith('~$')]
-        
-        if not word_files:
-            return {
-                'total': 0,
-                'exitosos': 0,
-                'fallidos': 0,
-                'archivos_generados': [],
-                'errores': [],
-                'word_available': self.word_available
-            }
-        
-        # Si Word no está disponible, fallar rápido
-        if not self.word_available:
-            return {
-                'total': len(word_files),
-                'exitosos': 0,
-                'fallidos': len(word_files),
-                'archivos_generados': [],
-                'errores': [{
-                    'archivo': 'TODOS',
-                    'error': 'Microsoft Word no está instalado o no está disponible. Se requiere MS Word para convertir a PDF.'
-                }],
-                'word_available': False
-            }
+        # Total conocido de antemano solo si la entrada tiene tamaño
+        expected_total = len(word_files) if hasattr(word_files, '__len__') else None
         
         # Inicializar resultados
         results = {
-            'total': len(word_files),
+            'total': 0,
             'exitosos': 0,
             'fallidos': 0,
             'archivos_generados': [],
             'errores': [],
-            'word_available': True
+            'omitidos': 0,
+            'omitidos_por': {mode: 0 for mode in ConversionManifest.MODES},
+            'timeouts': 0,
+            'word_available': None,
+            'backend': None,
+            'workers': [],
+            'tiempos_por_archivo': {}
         }
         
-        # Procesar cada archivo
-        for idx, word_file in enumerate(word_files, 1):
-            try:
-                # Construir rutas
-                word_path = os.path.join(word_folder, word_file)
-                pdf_file = os.path.splitext(word_file)[0] + '.pdf'
-                pdf_path = os.path.join(pdf_folder, pdf_file)
-                
-                # Convertir
-                success, message = self.convert_single(word_path, pdf_path, retry=retry)
+        if expected_total == 0:
+            return results
+        
+        sources = self._word_sources(word_folder, word_files)
+        
+        # Si el motor no está disponible, fallar rápido (la caché o el modo
+        # incremental aún pueden resolver PDFs)
+        if cache is None and not incremental and not self.word_available:
+            results['total'] = results['fallidos'] = sum(1 for _ in sources)
+            results['word_available'] = False
+            results['backend'] = self.backend.describe()
+            results['errores'].append({
+                'archivo': 'TODOS',
+                'error': f"{self._unavailable_message()}. Se requiere un motor de conversión a PDF."
+            })
+            return results
+        
+        manifest = ConversionManifest(pdf_folder) if incremental else None
+        
+        # Con varios trabajadores, la entrada se lee en un hilo alimentador
+        lock = threading.Lock()
+        resultados: List[Tuple[int, str, str, bool, str, float]] = []
+        # Documentos entregados al motor por ruta absoluta (una entrada repetida
+        # aparece varias veces en la lista, en orden de llegada)
+        pendientes: Dict[str, List[Tuple[int, str, str, Optional[str], float]]] = {}
+        pool: Optional[ConversionPool] = None
+        # Error que interrumpió la conversión: el resto de la entrada queda fallido
+        abort: List[str] = []
+        
+        def record(orden: int, word_path: str, pdf_path: str, success: bool, message: str,
+                   seconds: float, skipped: bool = False):
+            with lock:
+                # Primero el manifiesto: si falla, el documento aún no cuenta como resuelto
+                if success and manifest and not skipped:
+                    manifest.record(word_path, pdf_path)
+                resultados.append((orden, word_path, pdf_path, success, message, seconds))
                 
                 if success:
                     results['exitosos'] += 1
-                    results['archivos_generados'].append(pdf_path)
-                    
-                    # Callback de progreso
-                    if progress_callback:
-                        progress_callback(
-                            idx,
-                            f"Convertido: {pdf_file}",
-                            results['exitosos'],
-                            results['total']
-                        )
+                    estado = "Vigente" if skipped else "Convertido"
+                    progress_message = f"{estado}: {os.path.basename(pdf_path)}"
                 else:
                     results['fallidos'] += 1
-                    results['errores'].append({
-                        'archivo': word_file,
-                        'error': message
-                    })
+                    progress_message = f"ERROR: {os.path.basename(word_path)} - {message}"
+                
+                # Callback de progreso
+                if progress_callback:
+                    progress_callback(
+                        len(resultados),
+                        progress_message,
+                        results['exitosos'],
+                        expected_total or results['total']
+                    )
+        
+        def feed() -> Iterator[Tuple[str, str]]:
+            """Resuelve vigentes y cacheados; entrega al motor solo lo que hay que convertir"""
+            for orden, word_path in enumerate(sources):
+                start = time.perf_counter()
+                with lock:
+                    results['total'] += 1
+                
+                # Construir rutas
+                word_file = os.path.basename(word_path)
+                pdf_file = os.path.splitext(word_file)[0] + '.pdf'
+                pdf_path = os.path.join(pdf_folder, pdf_file)
+                
+                try:
+                    if abort:
+                        record(orden, word_path, pdf_path, False, abort[0], 0.0)
+                        continue
+                    
+                    # PDF vigente según el manifiesto: no se convierte
+                    motivo = manifest.is_up_to_date(word_path, pdf_path, incremental) if manifest else None
+                    if motivo:
+                        with lock:
+                            results['omitidos'] += 1
+                            results['omitidos_por'][motivo] += 1
+                        record(orden, word_path, pdf_path, True, pdf_path,
+                               time.perf_counter() - start, skipped=True)
+                        continue
                     
-                    # Callback de progreso con error
-                    if progress_callback:
-                        progress_callback(
-                            idx,
-                            f"ERROR: {word_file} - {message}",
-                            results['exitosos'],
-                            results['total']
+                    cache_key = None
+                    if cache:
+                        cache_key = cache.file_key(word_path)
+                        if cache.fetch(cache_key, '.pdf', pdf_path):
+                            record(orden, word_path, pdf_path, True, pdf_path,
+                                   time.perf_counter() - start)
+                            continue
+                    
+                    if not os.path.exists(word_path):
+                        record(orden, word_path, pdf_path, False,
+                               f"Archivo Word no existe: {word_path}", time.perf_counter() - start)
+                        continue
+                    
+                    if not self.word_available:
+                        record(orden, word_path, pdf_path, False, self._unavailable_message(), 0.0)
+                        continue
+                    
+                    abs_word_path = os.path.abspath(word_path)
+                    with lock:
+                        pendientes.setdefault(abs_word_path, []).append(
+                            (orden, word_path, pdf_path, cache_key, time.perf_counter())
                         )
+                    yield abs_word_path, os.path.abspath(pdf_path)
                 
-            except Exception as e:
-                results['fallidos'] += 1
-                error_msg = f"Excepción: {str(e)}"
+                except Exception as e:
+                    record(orden, word_path, pdf_path, False, f"Excepción: {str(e)}",
+                           time.perf_counter() - start)
+        
+        items = feed()
+        
+        def conversions() -> Iterator[ConversionResult]:
+            """Elige el motor (y los trabajadores) recién con el primer documento a convertir"""
+            nonlocal pool
+            first = next(items, None)
+            if first is None:
+                return
+            
+            # Con un solo trabajador también se usa el pool si el motor necesita
+            # supervisión (así una instancia bloqueada puede abandonarse)
+            if (self.workers > 1 and expected_total != 1) or self.backend.SUPERVISED:
+                pool = ConversionPool(self.backend, self.workers)
+                yield from pool.run(itertools.chain([first], items), retry=retry)
+            else:
+                yield from self.backend.convert_many(itertools.chain([first], items), retry=retry)
+        
+        converting = conversions()
+        en_curso = None
+        try:
+            for word_path, success, message in converting:
+                with lock:
+                    en_curso = pendientes[word_path].pop(0)
+                    if not pendientes[word_path]:
+                        del pendientes[word_path]
+                orden, input_path, pdf_path, cache_key, fed_at = en_curso
                 
+                if success and cache_key:
+                    cache.store(cache_key, '.pdf', pdf_path)
+                
+                seconds = time.perf_counter() - fed_at
+                if pool:
+                    seconds = pool.seconds.get(word_path, seconds)
+                record(orden, input_path, pdf_path, success, pdf_path if success else message, seconds)
+                en_curso = None
+        
+        except Exception as e:
+            # Error del motor o de la entrada: el resto de la entrada se sigue
+            # leyendo (al cerrarse, el pool espera a que su alimentador termine)
+            # y se reporta fallido, igual que los documentos sin resultado
+            abort.append(f"Excepción: {str(e)}")
+            converting.close()
+            for _ in items:
+                pass
+            if en_curso:
+                pendientes.setdefault(en_curso[1], []).append(en_curso)
+            for entries in list(pendientes.values()):
+                for orden, input_path, pdf_path, _, _ in entries:
+                    record(orden, input_path, pdf_path, False, abort[0], 0.0)
+            pendientes.clear()
+        
+        finally:
+            if manifest:
+                manifest.close()
+        
+        # Listas en el orden de entrada (la conversión en paralelo termina desordenada)
+        resultados.sort(key=lambda resultado: resultado[0])
+        for _, word_path, pdf_path, success, message, seconds in resultados:
+            results['tiempos_por_archivo'][word_path] = seconds
+            if success:
+                results['archivos_generados'].append(pdf_path)
+            else:
                 results['errores'].append({
-                    'archivo': word_file,
-                    'error': error_msg
+                    'archivo': os.path.basename(word_path),
+                    'error': message,
+                    'tipo': classify_error(message)
                 })
-                
-                # Callback de progreso con excepción
-                if progress_callback:
-                    progress_callback(
-                        idx,
-                        f"EXCEPCIÓN: {word_file} - {error_msg}",
-                        results['exitosos'],
-                        results['total']
-                    )
         
+        if pool:
+            results['workers'] = pool.get_stats()
+        
+        # Si la caché resolvió todo, el motor no llegó a elegirse ni detectarse
+        if self._backend is not None:
+            results['backend'] = self._backend.describe()
+            results['timeouts'] = results['backend'].get('timeouts', 0)
+        results['word_available'] = self._word_available
         return results
     
+    @staticmethod
+    def cleanup_word_files(word_folder: str) -> int:
+        """
+        Elimina los .docx de una carpeta (tras convertirlos a PDF).
+        
+        Args:
+            word_folder: Carpeta con archivos Word
+        
+        Returns:
+            Número de archivos eliminados
+        """
+        deleted = 0
+        
+        if not os.path.isdir(word_folder):
+            return deleted
+        
+        for entry in os.scandir(word_folder):
+            if entry.is_file() and entry.name.lower().endswith('.docx'):
+                try:
+                    os.remove(entry.path)
+                    deleted += 1
+                except OSError:
+                    continue
+        
+        return deleted
+    
     def get_system_info(self) -> Dict[str, str]:
         """
         Retorna información del sistema para debugging.
@@ -295,6 +491,7 @@ class PDFConverter:
             'system': self.system,
             'platform': platform.platform(),
             'python_version': platform.python_version(),
-            'converter': 'docx2pdf',
+            'converter': self.backend.name,
+            'converter_workers': str(self.workers),
             'word_available': str(self.word_available)
-        }
\ No newline at end of file
+        }
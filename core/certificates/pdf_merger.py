@@ -0,0 +1,111 @@
+"""
+Módulo de unión de certificados PDF.
+Combina certificados individuales en un único PDF multi-página con índice
+(marcadores) por trabajador, procesando un documento a la vez.
+"""
+
+import os
+from typing import Iterable, Tuple, Dict, Any, Optional, Callable
+import pymupdf
+
+
+class PDFMerger:
+    """Une PDFs de forma incremental y construye el índice de marcadores"""
+    
+    # Documentos insertados antes de volcar a disco y liberar memoria
+    FLUSH_EVERY = 200
+    
+    @staticmethod
+    def merge(sources: Iterable[Tuple[str, str]],
+              output_path: str,
+              flush_every: Optional[int] = None,
+              progress_callback: Optional[Callable[[int, str], None]] = None
+              ) -> Dict[str, Any]:
+        """
+        Une PDFs en un único documento con un marcador por certificado.
+        
+        Cada origen se abre, se copia y se cierra de inmediato; cada
+        flush_every documentos el resultado se guarda de forma incremental y
+        se reabre, de modo que la memoria no crece con el tamaño del lote.
+        
+        Args:
+            sources: Iterable de (ruta_pdf, título_marcador)
+            output_path: Ruta del PDF unido
+            flush_every: Documentos entre volcados a disco
+            progress_callback: Función callback(índice, mensaje)
+        
+        Returns:
+            Diccionario con resultados:
+            {
+                'output_path': str,
+                'documentos': int,
+                'paginas': int,
+                'errores': List[Dict]
+            }
+        """
+        flush_every = flush_every or PDFMerger.FLUSH_EVERY
+        
+        results = {
+            'output_path': output_path,
+            'documentos': 0,
+            'paginas': 0,
+            'errores': []
+        }
+        
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        # Trabajar sobre un temporal hasta completar la unión
+        tmp_path = f"{output_path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        
+        toc = []
+        merged = pymupdf.open()
+        saved_once = False
+        pending = 0
+        
+        for idx, (pdf_path, title) in enumerate(sources, 1):
+            try:
+                with pymupdf.open(pdf_path) as src:
+                    merged.insert_pdf(src)
+                    toc.append([1, title, results['paginas'] + 1])
+                    results['paginas'] += src.page_count
+                results['documentos'] += 1
+                pending += 1
+            except Exception as e:
+                results['errores'].append({
+                    'archivo': os.path.basename(pdf_path),
+                    'error': str(e)
+                })
+            
+            if pending >= flush_every:
+                merged = PDFMerger._flush(merged, tmp_path, saved_once)
+                saved_once = True
+                pending = 0
+            
+            if progress_callback:
+                progress_callback(idx, f"Unido: {title}")
+        
+        if results['documentos'] == 0:
+            merged.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return results
+        
+        merged.set_toc(toc)
+        PDFMerger._flush(merged, tmp_path, saved_once).close()
+        os.replace(tmp_path, output_path)
+        
+        return results
+    
+    @staticmethod
+    def _flush(merged, tmp_path: str, saved_once: bool):
+        """Vuelca el documento a disco y lo reabre para liberar memoria"""
+        if saved_once:
+            merged.save(tmp_path, incremental=True, encryption=pymupdf.PDF_ENCRYPT_KEEP)
+        else:
+            merged.save(tmp_path)
+        merged.close()
+        return pymupdf.open(tmp_path)
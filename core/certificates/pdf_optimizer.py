@@ -0,0 +1,188 @@
+"""
+Módulo de post-procesamiento de PDF.
+Reduce el tamaño de los certificados exportados por Word (fuentes completas
+e imágenes repetidas en cada archivo): recolecta objetos sin uso, comprime
+los streams, deja solo los glifos usados de cada fuente y, si la versión de
+MuPDF lo permite (anterior a 1.24), linealiza el archivo. Los PDF se procesan en paralelo en
+procesos separados (el trabajo es de CPU).
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, Optional
+import pymupdf
+
+
+# MuPDF 1.24 eliminó la linealización: se decide una vez por versión en lugar
+# de intentar y reintentar el guardado en cada archivo
+LINEARIZE_SUPPORTED = tuple(getattr(pymupdf, 'mupdf_version_tuple', (1, 24))) < (1, 24)
+
+
+def optimize_pdf(pdf_path: str, linearize: bool = True, subset_fonts: bool = True) -> Dict[str, Any]:
+    """
+    Optimiza un PDF en su lugar; se conserva el original si no se reduce.
+    Función de módulo para poder ejecutarse en un proceso trabajador.
+    
+    Args:
+        pdf_path: Ruta del PDF
+        linearize: Linealizar (vista rápida en la web) si MuPDF lo soporta
+        subset_fonts: Dejar solo los glifos usados de cada fuente incrustada
+    
+    Returns:
+        Diccionario con archivo, bytes antes/después, linealizado y error
+    """
+    result = {
+        'archivo': pdf_path,
+        'bytes_antes': 0,
+        'bytes_despues': 0,
+        'linealizado': False,
+        'error': None
+    }
+    tmp_path = f"{pdf_path}.opt.tmp"
+    
+    try:
+        result['bytes_antes'] = result['bytes_despues'] = os.path.getsize(pdf_path)
+        
+        with pymupdf.open(pdf_path) as doc:
+            if subset_fonts:
+                try:
+                    doc.subset_fonts()
+                except Exception:
+                    # Fuentes que no admiten subconjunto: se guardan completas
+                    pass
+            
+            linear = linearize and LINEARIZE_SUPPORTED
+            doc.save(tmp_path, linear=linear, **PDFOptimizer.SAVE_OPTIONS)
+            result['linealizado'] = linear
+        
+        optimized_size = os.path.getsize(tmp_path)
+        if optimized_size < result['bytes_antes']:
+            os.replace(tmp_path, pdf_path)
+            result['bytes_despues'] = optimized_size
+        else:
+            result['linealizado'] = False
+    
+    except Exception as e:
+        result['error'] = str(e)
+    
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    
+    return result
+
+
+class PDFOptimizer:
+    """Post-procesamiento en paralelo de PDFs con PyMuPDF"""
+    
+    # Opciones de guardado: recolección de objetos (garbage=3 también une
+    # duplicados), compresión de streams, fuentes e imágenes y object streams
+    SAVE_OPTIONS = {
+        'garbage': 3,
+        'deflate': True,
+        'deflate_images': True,
+        'deflate_fonts': True,
+        'clean': True,
+        'use_objstms': 1
+    }
+    
+    # PDFs por envío a cada proceso (reduce el costo de comunicación)
+    CHUNKS_PER_WORKER = 4
+    
+    @staticmethod
+    def optimize_many(pdf_paths: Iterable[str],
+                      workers: int = 1,
+                      linearize: bool = True,
+                      subset_fonts: bool = True,
+                      progress_callback: Optional[Callable[[int, str, int], None]] = None
+                      ) -> Dict[str, Any]:
+        """
+        Optimiza varios PDFs, en procesos trabajadores si workers > 1.
+        
+        Args:
+            pdf_paths: Rutas de los PDF
+            workers: Procesos en paralelo
+            linearize: Linealizar si MuPDF lo soporta (ver LINEARIZE_SUPPORTED)
+            subset_fonts: Subconjunto de fuentes
+            progress_callback: Función callback(índice, mensaje, total)
+        
+        Returns:
+            Diccionario con resultados:
+            {
+                'total': int,
+                'optimizados': int,  # PDFs reemplazados por una versión menor
+                'fallidos': int,
+                'bytes_antes': int,
+                'bytes_despues': int,
+                'reduccion_pct': float,
+                'linealizados': int,
+                'linealizacion_disponible': bool,  # False con MuPDF >= 1.24
+                'errores': List[Dict]
+            }
+        """
+        paths = [path for path in pdf_paths if path and os.path.exists(path)]
+        
+        summary = {
+            'total': len(paths),
+            'optimizados': 0,
+            'fallidos': 0,
+            'bytes_antes': 0,
+            'bytes_despues': 0,
+            'reduccion_pct': 0.0,
+            'linealizados': 0,
+            'linealizacion_disponible': LINEARIZE_SUPPORTED,
+            'errores': []
+        }
+        
+        if not paths:
+            return summary
+        
+        def collect(idx: int, result: Dict[str, Any]) -> None:
+            summary['bytes_antes'] += result['bytes_antes']
+            summary['bytes_despues'] += result['bytes_despues']
+            
+            if result['error']:
+                summary['fallidos'] += 1
+                summary['errores'].append({
+                    'archivo': result['archivo'],
+                    'error': result['error']
+                })
+            elif result['bytes_despues'] < result['bytes_antes']:
+                summary['optimizados'] += 1
+            
+            if result['linealizado']:
+                summary['linealizados'] += 1
+            
+            if progress_callback:
+                progress_callback(idx, f"Optimizado: {os.path.basename(result['archivo'])}", len(paths))
+        
+        done = 0
+        workers = min(max(1, workers), len(paths))
+        
+        if workers > 1:
+            chunksize = max(1, len(paths) // (workers * PDFOptimizer.CHUNKS_PER_WORKER))
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    for result in executor.map(
+                            optimize_pdf,
+                            paths,
+                            [linearize] * len(paths),
+                            [subset_fonts] * len(paths),
+                            chunksize=chunksize):
+                        done += 1
+                        collect(done, result)
+            except (BrokenProcessPool, OSError):
+                # Sin procesos disponibles: continuar en este proceso
+                pass
+        
+        for pdf_path in paths[done:]:
+            done += 1
+            collect(done, optimize_pdf(pdf_path, linearize, subset_fonts))
+        
+        if summary['bytes_antes']:
+            summary['reduccion_pct'] = round(
+                (1 - summary['bytes_despues'] / summary['bytes_antes']) * 100, 1
+            )
+        
+        return summary
@@ -0,0 +1,256 @@
+"""
+Módulo de caché de renderizado de certificados.
+Almacena docx y pdf direccionados por contenido para reutilizarlos entre ejecuciones
+(reimpresiones y reemisiones parciales) sin volver a renderizar ni convertir.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+from typing import Dict, Any, Optional
+
+
+class RenderCache:
+    """Caché direccionada por contenido con límite de tamaño y desalojo LRU"""
+    
+    def __init__(self, cache_folder: str, max_size_mb: int = 2048):
+        """
+        Inicializa la caché.
+        
+        Args:
+            cache_folder: Carpeta donde se guardan las entradas
+            max_size_mb: Tamaño máximo de la caché en MB
+        """
+        self.cache_folder = cache_folder
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        
+        os.makedirs(self.cache_folder, exist_ok=True)
+        
+        # Tamaño actual (se recalcula al desalojar)
+        self.current_size = sum(
+            entry.stat().st_size for entry in os.scandir(self.cache_folder)
+            if entry.is_file()
+        )
+        
+        self.stats = {
+            'docx_hits': 0,
+            'docx_misses': 0,
+            'pdf_hits': 0,
+            'pdf_misses': 0,
+            'stored': 0,
+            'evicted': 0
+        }
+    
+    @staticmethod
+    def template_digest(template_path: str) -> str:
+        """
+        Calcula el hash del contenido de la plantilla.
+        
+        Args:
+            template_path: Ruta a la plantilla Word
+        
+        Returns:
+            Hash SHA-256 (hex) de los bytes de la plantilla
+        """
+        return RenderCache.file_key(template_path)
+    
+    @staticmethod
+    def render_key(template_digest: str, data: Dict[str, Any]) -> str:
+        """
+        Calcula la clave de renderizado: hash(plantilla + valores de placeholders).
+        
+        Args:
+            template_digest: Hash de la plantilla
+            data: Diccionario placeholder -> valor
+        
+        Returns:
+            Clave SHA-256 (hex)
+        """
+        payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+        
+        digest = hashlib.sha256()
+        digest.update(template_digest.encode('ascii'))
+        digest.update(payload.encode('utf-8'))
+        return digest.hexdigest()
+    
+    @staticmethod
+    def file_key(path: str) -> str:
+        """
+        Calcula el hash del contenido de un archivo.
+        Un docx servido desde la caché conserva sus bytes, por lo que su
+        hash sirve como clave estable del PDF correspondiente.
+        
+        Args:
+            path: Ruta del archivo
+        
+        Returns:
+            Hash SHA-256 (hex)
+        """
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _entry_path(self, key: str, extension: str) -> str:
+        """Ruta de la entrada para una clave y extensión ('.docx' o '.pdf')"""
+        return os.path.join(self.cache_folder, f"{key}{extension}")
+    
+    def fetch(self, key: str, extension: str, dest_path: str) -> bool:
+        """
+        Materializa una entrada de la caché en dest_path como copia.
+        Sin hardlinks: la salida no comparte inodo con la entrada, así que
+        editarla no altera la caché y la marca LRU de la entrada (mtime) no
+        cambia la fecha de salidas previas (reconversión incremental).
+        
+        Args:
+            key: Clave de la entrada
+            extension: '.docx' o '.pdf'
+            dest_path: Ruta destino
+        
+        Returns:
+            True si hubo acierto, False si la entrada no existe
+        """
+        stat_name = 'docx' if extension == '.docx' else 'pdf'
+        entry_path = self._entry_path(key, extension)
+        
+        if not os.path.exists(entry_path):
+            self.stats[f'{stat_name}_misses'] += 1
+            return False
+        
+        try:
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+            
+            shutil.copyfile(entry_path, dest_path)
+            
+            # Marcar uso reciente para el orden LRU (inodo exclusivo de la caché)
+            os.utime(entry_path, None)
+        
+        except OSError:
+            self.stats[f'{stat_name}_misses'] += 1
+            return False
+        
+        self.stats[f'{stat_name}_hits'] += 1
+        return True
+    
+    def read(self, key: str, extension: str) -> Optional[bytes]:
+        """
+        Lee el contenido de una entrada de la caché (salida empaquetada en ZIP).
+        
+        Args:
+            key: Clave de la entrada
+            extension: '.docx' o '.pdf'
+        
+        Returns:
+            Bytes de la entrada o None si no existe
+        """
+        stat_name = 'docx' if extension == '.docx' else 'pdf'
+        entry_path = self._entry_path(key, extension)
+        
+        try:
+            with open(entry_path, 'rb') as f:
+                data = f.read()
+            os.utime(entry_path, None)
+        except OSError:
+            self.stats[f'{stat_name}_misses'] += 1
+            return None
+        
+        self.stats[f'{stat_name}_hits'] += 1
+        return data
+    
+    def store_bytes(self, key: str, extension: str, data: bytes) -> None:
+        """
+        Guarda contenido ya renderizado en la caché y desaloja si se supera el límite.
+        Los errores de escritura se ignoran: la caché nunca debe romper la generación.
+        
+        Args:
+            key: Clave de la entrada
+            extension: '.docx' o '.pdf'
+            data: Contenido del archivo
+        """
+        entry_path = self._entry_path(key, extension)
+        
+        if os.path.exists(entry_path):
+            return
+        
+        tmp_path = f"{entry_path}.tmp{os.getpid()}"
+        
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        
+        self.stats['stored'] += 1
+        self.current_size += len(data)
+        
+        if self.current_size > self.max_size_bytes:
+            self._evict()
+    
+    def store(self, key: str, extension: str, src_path: str) -> None:
+        """
+        Guarda un archivo generado en la caché (ver store_bytes).
+        
+        Args:
+            key: Clave de la entrada
+            extension: '.docx' o '.pdf'
+            src_path: Archivo recién generado
+        """
+        if os.path.exists(self._entry_path(key, extension)):
+            return
+        
+        try:
+            with open(src_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return
+        
+        self.store_bytes(key, extension, data)
+    
+    def _evict(self) -> None:
+        """Elimina las entradas usadas hace más tiempo hasta quedar bajo el 90% del límite"""
+        entries = []
+        total = 0
+        
+        for entry in os.scandir(self.cache_folder):
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+        
+        target = int(self.max_size_bytes * 0.9)
+        
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.stats['evicted'] += 1
+            except OSError:
+                continue
+        
+        self.current_size = total
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estadísticas de uso de la caché.
+        
+        Returns:
+            Diccionario con aciertos, fallos y tasa de acierto por tipo
+        """
+        stats = dict(self.stats)
+        
+        for name in ('docx', 'pdf'):
+            lookups = stats[f'{name}_hits'] + stats[f'{name}_misses']
+            stats[f'{name}_hit_rate'] = round(stats[f'{name}_hits'] / lookups, 4) if lookups else 0.0
+        
+        stats['size_mb'] = round(self.current_size / (1024 * 1024), 2)
+        stats['max_size_mb'] = round(self.max_size_bytes / (1024 * 1024), 2)
+        return stats
@@ -0,0 +1,247 @@
+"""
+Módulo de manifiesto de ejecución para generación de certificados.
+Registra en formato JSONL (solo anexado) el estado de cada fila procesada
+para poder reanudar ejecuciones interrumpidas sin regenerar lo ya producido.
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+import pandas as pd
+
+
+class RunManifest:
+    """Manifiesto append-only con el estado Word/PDF de cada fila de una ejecución"""
+    
+    # Nombre del archivo dentro de la carpeta de la ejecución
+    MANIFEST_FILENAME = "run_manifest.jsonl"
+    
+    # Columnas que forman la clave estable de cada certificado
+    KEY_COLUMNS = ['DNI', 'CLIENTE', 'MES_ANALIZADO']
+    
+    # Columnas cuyo contenido determina el certificado generado
+    HASH_COLUMNS = [
+        'APELLIDOS Y NOMBRES',
+        'FECHAS_CERTIFICADO',
+        'DÍAS_LABORADOS',
+        'CARGO',
+        'CLIENTE',
+        'FECHA_GENERAR'
+    ]
+    
+    def __init__(self, output_folder: str):
+        """
+        Inicializa el manifiesto y carga el estado previo si existe.
+        
+        Args:
+            output_folder: Carpeta de la ejecución (certificates_<timestamp>)
+        """
+        self.path = os.path.join(output_folder, self.MANIFEST_FILENAME)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._handle = None
+        self._load()
+    
+    def _load(self) -> None:
+        """Reconstruye el estado de cada clave a partir de los registros previos"""
+        if not os.path.exists(self.path):
+            return
+        
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Última línea truncada por una caída: se ignora
+                    continue
+                self._apply(record)
+    
+    def _apply(self, record: Dict[str, Any]) -> None:
+        """Aplica un registro sobre el estado acumulado de su clave"""
+        key = record.get('key')
+        if not key:
+            return
+        
+        state = self.entries.get(key)
+        
+        # Un hash distinto invalida todo lo registrado antes para la clave
+        if state is None or state.get('hash') != record.get('hash'):
+            state = {'hash': record.get('hash')}
+            self.entries[key] = state
+        
+        etapa = record.get('etapa')
+        if etapa == 'word':
+            state['docx'] = record.get('docx')
+            state['word_status'] = record.get('status')
+            # Un docx regenerado deja obsoleto el PDF convertido desde él
+            # (los PDF nativos se renderizan desde los datos y no dependen del docx)
+            if state.get('pdf_backend') != 'native':
+                state.pop('pdf', None)
+                state.pop('pdf_status', None)
+        elif etapa == 'pdf':
+            state['pdf'] = record.get('pdf')
+            state['pdf_status'] = record.get('status')
+            state['pdf_backend'] = record.get('backend', 'word')
+    
+    @staticmethod
+    def build_keys(df: pd.DataFrame) -> List[str]:
+        """
+        Construye claves estables DNI|CLIENTE|MES_ANALIZADO para cada fila.
+        Las claves repetidas dentro del DataFrame reciben sufijo #n.
+        
+        Args:
+            df: DataFrame con datos de certificados
+        
+        Returns:
+            Lista de claves alineada con las filas del DataFrame
+        """
+        columnas = [
+            df[col].astype(str).tolist() if col in df.columns else [''] * len(df)
+            for col in RunManifest.KEY_COLUMNS
+        ]
+        
+        keys = []
+        vistos: Dict[str, int] = {}
+        for valores in zip(*columnas):
+            base = '|'.join(v.strip() for v in valores)
+            vistos[base] = vistos.get(base, 0) + 1
+            keys.append(base if vistos[base] == 1 else f"{base}#{vistos[base]}")
+        
+        return keys
+    
+    @staticmethod
+    def build_hashes(df: pd.DataFrame) -> List[str]:
+        """
+        Calcula el hash de datos de cada fila sobre las columnas del certificado.
+        
+        Args:
+            df: DataFrame con datos de certificados
+        
+        Returns:
+            Lista de hashes SHA-256 (hex) alineada con las filas
+        """
+        columnas = [
+            df[col].astype(str).tolist() if col in df.columns else [''] * len(df)
+            for col in RunManifest.HASH_COLUMNS
+        ]
+        
+        return [
+            hashlib.sha256('\x1f'.join(valores).encode('utf-8')).hexdigest()
+            for valores in zip(*columnas)
+        ]
+    
+    def record(self, key: str, data_hash: str, etapa: str, status: str, **fields) -> None:
+        """
+        Anexa un registro al manifiesto y actualiza el estado en memoria.
+        
+        Args:
+            key: Clave estable de la fila
+            data_hash: Hash de datos de la fila
+            etapa: 'word' o 'pdf'
+            status: 'ok' o 'error'
+            **fields: Campos adicionales (docx, pdf, fila, error, backend)
+        """
+        record = {
+            'key': key,
+            'hash': data_hash,
+            'etapa': etapa,
+            'status': status,
+            'timestamp': datetime.now().isoformat(timespec='seconds')
+        }
+        record.update(fields)
+        
+        if self._handle is None:
+            self._handle = open(self.path, 'a', encoding='utf-8')
+        
+        self._handle.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._handle.flush()
+        
+        self._apply(record)
+    
+    def valid_docx(self,
+                   key: str,
+                   data_hash: str,
+                   exists: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """
+        Retorna el docx registrado para la clave si coincide el hash y aún existe.
+        
+        Args:
+            key: Clave estable de la fila
+            data_hash: Hash de datos actual de la fila
+            exists: Comprobación de existencia (None = archivo en disco; en modo
+                    zip, entrada del archivo)
+        
+        Returns:
+            Ruta del docx o None
+        """
+        state = self.entries.get(key)
+        if not state or state.get('hash') != data_hash:
+            return None
+        if state.get('word_status') != 'ok':
+            return None
+        
+        docx = state.get('docx')
+        if docx and (exists(docx) if exists else os.path.exists(docx)):
+            return docx
+        return None
+    
+    def valid_pdf(self,
+                  key: str,
+                  data_hash: str,
+                  exists: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """
+        Retorna el PDF registrado para la clave si coincide el hash y aún existe.
+        
+        Args:
+            key: Clave estable de la fila
+            data_hash: Hash de datos actual de la fila
+            exists: Comprobación de existencia (None = archivo no vacío en disco;
+                    en modo zip, entrada del archivo)
+        
+        Returns:
+            Ruta del PDF o None
+        """
+        state = self.entries.get(key)
+        if not state or state.get('hash') != data_hash:
+            return None
+        if state.get('pdf_status') != 'ok':
+            return None
+        
+        pdf = state.get('pdf')
+        if not pdf:
+            return None
+        if exists:
+            return pdf if exists(pdf) else None
+        if os.path.exists(pdf) and os.path.getsize(pdf) > 0:
+            return pdf
+        return None
+    
+    def stale_outputs(self, key: str, data_hash: str) -> List[str]:
+        """
+        Retorna los archivos registrados para la clave con un hash distinto.
+        
+        Args:
+            key: Clave estable de la fila
+            data_hash: Hash de datos actual de la fila
+        
+        Returns:
+            Lista de rutas existentes que quedaron obsoletas
+        """
+        state = self.entries.get(key)
+        if not state or state.get('hash') == data_hash:
+            return []
+        
+        return [
+            path for path in (state.get('docx'), state.get('pdf'))
+            if path and os.path.exists(path)
+        ]
+    
+    def close(self) -> None:
+        """Cierra el archivo del manifiesto si está abierto"""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
@@ -0,0 +1,102 @@
+"""
+Módulo de métricas de rendimiento de la generación de certificados.
+Resume por etapa (renderizado, guardado, conversión) las latencias por
+certificado, el rendimiento y los ítems más lentos para el reporte.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class RunMetrics:
+    """Acumula métricas por etapa de una ejecución"""
+    
+    # Ítems más lentos que se conservan por etapa
+    SLOWEST_N = 10
+    
+    def __init__(self, slowest_n: Optional[int] = None):
+        """
+        Inicializa el acumulador.
+        
+        Args:
+            slowest_n: Ítems más lentos a listar por etapa
+        """
+        self.slowest_n = slowest_n or self.SLOWEST_N
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.extra: Dict[str, float] = {}
+    
+    @staticmethod
+    def percentile(sorted_values: List[float], pct: float) -> float:
+        """
+        Percentil por rango más cercano sobre valores ya ordenados.
+        
+        Args:
+            sorted_values: Valores ordenados de menor a mayor
+            pct: Percentil (0-100)
+        
+        Returns:
+            Valor del percentil (0.0 si no hay valores)
+        """
+        if not sorted_values:
+            return 0.0
+        
+        rank = max(1, -(-len(sorted_values) * pct // 100))
+        return sorted_values[int(rank) - 1]
+    
+    def add_stage(self,
+                  stage: str,
+                  samples: Iterable[Tuple[float, Dict[str, Any]]],
+                  wall_seconds: Optional[float] = None) -> None:
+        """
+        Registra las latencias de una etapa.
+        
+        Args:
+            stage: Nombre de la etapa ('word_render', 'pdf_conversion', ...)
+            samples: Iterable de (segundos, datos del ítem: fila, dni, apellidos...)
+            wall_seconds: Duración total de la fase (para certificados por segundo);
+                          por defecto la suma de latencias
+        """
+        samples = [(seconds, info) for seconds, info in samples if seconds is not None]
+        valores = sorted(seconds for seconds, _ in samples)
+        total = sum(valores)
+        
+        if wall_seconds is None:
+            wall_seconds = total
+        
+        slowest = sorted(samples, key=lambda sample: sample[0], reverse=True)[:self.slowest_n]
+        
+        self.stages[stage] = {
+            'count': len(valores),
+            'seconds': round(total, 4),
+            'wall_seconds': round(wall_seconds, 4),
+            'per_second': round(len(valores) / wall_seconds, 2) if wall_seconds else 0.0,
+            'p50_ms': round(self.percentile(valores, 50) * 1000, 2),
+            'p95_ms': round(self.percentile(valores, 95) * 1000, 2),
+            'p99_ms': round(self.percentile(valores, 99) * 1000, 2),
+            'max_ms': round(valores[-1] * 1000, 2) if valores else 0.0,
+            'slowest': [
+                dict(info, ms=round(seconds * 1000, 2))
+                for seconds, info in slowest
+            ]
+        }
+    
+    def add_value(self, key: str, seconds: float) -> None:
+        """
+        Acumula un tiempo global (p. ej. espera en la cola de escritura).
+        
+        Args:
+            key: Nombre de la métrica
+            seconds: Segundos a sumar
+        """
+        self.extra[key] = self.extra.get(key, 0.0) + (seconds or 0.0)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Retorna las métricas para el reporte y el diccionario de resultados.
+        
+        Returns:
+            Diccionario {'stages': {...}, <métricas globales>}
+        """
+        metrics: Dict[str, Any] = {'stages': self.stages}
+        for key, seconds in self.extra.items():
+            metrics[key] = round(seconds, 4)
+        return metrics
@@ -0,0 +1,330 @@
+"""
+Módulo de caché de plantillas Word.
+Mantiene por proceso la plantilla analizada, su índice de placeholders y su
+plan de renderizado, compartidos por validador, generadores y controlador.
+Las entradas se invalidan automáticamente cuando cambia el archivo.
+"""
+
+import io
+import os
+import re
+import time
+import hashlib
+import zipfile
+import threading
+from copy import deepcopy
+from typing import Dict, List, Any, Optional, Tuple
+from xml.sax.saxutils import escape
+from lxml import etree
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+
+
+PLACEHOLDER_PATTERN = re.compile(r'\{\{([^}]+)\}\}')
+
+# Marcador de posición dinámica dentro del XML pre-serializado de cada parte
+SLOT_MARKER = re.compile(rb' @@SLOT(\d+)@@ ')
+
+# Caracteres de control no admitidos en XML (python-docx los rechaza igual)
+INVALID_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+class CachedTemplate:
+    """Plantilla analizada con su índice de placeholders y plan de renderizado"""
+    
+    def __init__(self, path: str, signature: Tuple[int, int], content: bytes):
+        """
+        Analiza la plantilla a partir de su contenido.
+        
+        Args:
+            path: Ruta absoluta de la plantilla
+            signature: (mtime_ns, tamaño) del archivo al leerlo
+            content: Bytes de la plantilla
+        """
+        self.path = path
+        self.signature = signature
+        self.digest = hashlib.sha256(content).hexdigest()
+        self.document = Document(io.BytesIO(content))
+        
+        # Copia sin acceder: python-docx guarda proxies (p. ej. el cuerpo) que
+        # deepcopy duplicaría como árboles separados del documento a guardar
+        self._pristine = Document(io.BytesIO(content))
+        
+        # Índice de placeholders: una entrada por párrafo con su parte y ruta XML
+        self.index: List[Dict[str, Any]] = []
+        
+        # Plan de renderizado: texto original de cada párrafo dinámico (slot),
+        # XML de cada parte partido en fragmentos estáticos y ZIP estático base
+        self._slots: List[Tuple[str, str]] = []
+        self._part_plans: Dict[str, Tuple[List[bytes], List[int]]] = {}
+        self._static_zip = b''
+        
+        self._build_plan(content)
+        
+        self.placeholders = sorted({
+            placeholder
+            for entry in self.index
+            for placeholder in entry['placeholders']
+        })
+        
+        # Artefactos derivados por cada backend (p. ej. layout del PDF nativo)
+        self.derived: Dict[str, Any] = {}
+    
+    # ========================================
+    # CONSTRUCCIÓN DEL ÍNDICE Y DEL PLAN
+    # ========================================
+    
+    def _build_plan(self, content: bytes) -> None:
+        """
+        Recorre todas las partes XML del paquete (cuerpo, tablas, encabezados,
+        pies y cuadros de texto) y separa las partes con placeholders del resto,
+        que se empaqueta una sola vez en el ZIP estático base.
+        """
+        static_buffer = io.BytesIO()
+        
+        with zipfile.ZipFile(io.BytesIO(content)) as source, \
+                zipfile.ZipFile(static_buffer, 'w', zipfile.ZIP_DEFLATED) as target:
+            for info in source.infolist():
+                raw = source.read(info)
+                
+                # Filtro rápido por '{': Word parte los placeholders entre runs,
+                # así que '{{' puede no aparecer literal en el XML; la decisión
+                # final se toma sobre el texto unido de cada párrafo
+                plan = None
+                if info.filename.endswith('.xml') and b'{' in raw:
+                    plan = self._plan_part(info.filename, raw)
+                
+                if plan:
+                    self._part_plans[info.filename] = plan
+                else:
+                    target.writestr(info, raw)
+        
+        self._static_zip = static_buffer.getvalue()
+    
+    def _plan_part(self, part_name: str, raw: bytes) -> Optional[Tuple[List[bytes], List[int]]]:
+        """
+        Indexa los párrafos con placeholders de una parte y pre-serializa su XML.
+        Cada párrafo indexado se reescribe como lo hace _replace_placeholders
+        (todo el texto en el primer run) con un marcador en lugar del texto.
+        
+        Returns:
+            Tupla (fragmentos estáticos, slots entre fragmentos) o None si la
+            parte no contiene placeholders
+        """
+        root = parse_xml(raw)
+        tree = root.getroottree()
+        prefix = root.prefix or 'w'
+        
+        candidatos = []
+        for p in root.iter(qn('w:p')):
+            para = Paragraph(p, None)
+            text = para.text
+            matches = PLACEHOLDER_PATTERN.findall(text)
+            if matches:
+                candidatos.append((p, para, text, matches))
+        
+        if not candidatos:
+            return None
+        
+        # Ubicaciones resueltas antes de modificar el árbol
+        ubicaciones = [(tree.getpath(p), self._node_position(p)) for p, _, _, _ in candidatos]
+        
+        for (node_path, position), (_, para, text, matches) in zip(ubicaciones, candidatos):
+            slot = len(self._slots)
+            self._slots.append((text, prefix))
+            self.index.append({
+                'part': part_name,
+                'path': node_path,
+                'position': position,
+                'placeholders': sorted({match.strip() for match in matches})
+            })
+            
+            marker = f" @@SLOT{slot}@@ "
+            for run in para.runs:
+                run.text = ""
+            if para.runs:
+                para.runs[0].text = marker
+            else:
+                para.add_run(marker)
+        
+        serialized = etree.tostring(root, encoding='UTF-8', xml_declaration=True, standalone=True)
+        pieces = SLOT_MARKER.split(serialized)
+        
+        return pieces[0::2], [int(slot) for slot in pieces[1::2]]
+    
+    @staticmethod
+    def _node_position(node) -> List[int]:
+        """Posición exacta del nodo como índices de hijo desde la raíz de la parte"""
+        position = []
+        parent = node.getparent()
+        while parent is not None:
+            position.append(parent.index(node))
+            node, parent = parent, parent.getparent()
+        return position[::-1]
+    
+    # ========================================
+    # RENDERIZADO
+    # ========================================
+    
+    @staticmethod
+    def _render_slot(text: str, prefix: str, data: dict) -> bytes:
+        """Reemplaza placeholders en el texto de un párrafo y lo escapa para el XML"""
+        for key, value in data.items():
+            placeholder = f"{{{{{key}}}}}"
+            if placeholder in text:
+                str_value = str(value) if value is not None else ""
+                text = text.replace(placeholder, str_value)
+        
+        if INVALID_XML_CHARS.search(text):
+            raise ValueError("El texto contiene caracteres de control no admitidos en XML")
+        
+        escaped = escape(text)
+        
+        # Tabulaciones y saltos de línea como elementos, igual que python-docx
+        if '\t' in escaped or '\n' in escaped or '\r' in escaped:
+            reopen = f'<{prefix}:t xml:space="preserve">'
+            escaped = (escaped
+                       .replace('\t', f'</{prefix}:t><{prefix}:tab/>{reopen}')
+                       .replace('\n', f'</{prefix}:t><{prefix}:br/>{reopen}')
+                       .replace('\r', f'</{prefix}:t><{prefix}:br/>{reopen}'))
+        
+        return escaped.encode('utf-8')
+    
+    def render(self, data: dict) -> bytes:
+        """
+        Renderiza un certificado a nivel de paquete ZIP: las partes sin
+        placeholders se reutilizan tal cual y en las demás solo se insertan
+        los textos de los párrafos indexados.
+        
+        Args:
+            data: Diccionario placeholder -> valor
+        
+        Returns:
+            Bytes del docx generado
+        """
+        values = [self._render_slot(text, prefix, data) for text, prefix in self._slots]
+        
+        buffer = io.BytesIO(self._static_zip)
+        with zipfile.ZipFile(buffer, 'a', zipfile.ZIP_DEFLATED) as target:
+            for part_name, (chunks, slots) in self._part_plans.items():
+                pieces = [chunks[0]]
+                for slot, chunk in zip(slots, chunks[1:]):
+                    pieces.append(values[slot])
+                    pieces.append(chunk)
+                target.writestr(part_name, b''.join(pieces))
+        
+        return buffer.getvalue()
+    
+    def new_document(self) -> Document:
+        """
+        Retorna una copia independiente del documento para renderizar.
+        La copia en memoria evita releer y volver a analizar el docx.
+        
+        Returns:
+            Documento listo para reemplazar placeholders
+        """
+        return deepcopy(self._pristine)
+    
+    def locate_paragraphs(self, document: Document) -> List[Paragraph]:
+        """
+        Resuelve el índice sobre una copia del documento (new_document).
+        
+        Args:
+            document: Documento con la misma estructura que la plantilla
+        
+        Returns:
+            Párrafos con placeholders de todas las partes, en orden del índice
+        """
+        parts = {
+            str(part.partname).lstrip('/'): part
+            for part in document.part.package.iter_parts()
+        }
+        
+        paragraphs = []
+        for entry in self.index:
+            part = parts.get(entry['part'])
+            node = getattr(part, 'element', None)
+            if node is None:
+                continue
+            for child_index in entry['position']:
+                node = node[child_index]
+            paragraphs.append(Paragraph(node, None))
+        
+        return paragraphs
+
+
+class TemplateCache:
+    """Caché de plantillas por proceso, clave ruta + mtime + tamaño"""
+    
+    _entries: Dict[str, CachedTemplate] = {}
+    _lock = threading.Lock()
+    
+    # Tiempo acumulado de lectura y análisis de plantillas en el proceso
+    stats = {
+        'loads': 0,
+        'hits': 0,
+        'load_seconds': 0.0
+    }
+    
+    @staticmethod
+    def _signature(path: str) -> Tuple[int, int]:
+        """Firma del archivo: (mtime_ns, tamaño)"""
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+    
+    @classmethod
+    def get(cls, template_path: str) -> CachedTemplate:
+        """
+        Retorna la plantilla analizada, cargándola si no está en caché o si
+        el archivo cambió desde la última carga.
+        
+        Args:
+            template_path: Ruta a la plantilla Word
+        
+        Returns:
+            Plantilla analizada
+        
+        Raises:
+            OSError: Si el archivo no existe o no se puede leer
+            Exception: Si el docx no se puede analizar
+        """
+        path = os.path.abspath(template_path)
+        signature = cls._signature(path)
+        
+        with cls._lock:
+            entry = cls._entries.get(path)
+            if entry is not None and entry.signature == signature:
+                cls.stats['hits'] += 1
+                return entry
+            
+            start = time.perf_counter()
+            with open(path, 'rb') as f:
+                content = f.read()
+            entry = CachedTemplate(path, signature, content)
+            
+            cls._entries[path] = entry
+            cls.stats['loads'] += 1
+            cls.stats['load_seconds'] += time.perf_counter() - start
+            
+            return entry
+    
+    @classmethod
+    def clear(cls) -> None:
+        """Vacía la caché (las próximas consultas recargan del disco)"""
+        with cls._lock:
+            cls._entries.clear()
+    
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """
+        Retorna estadísticas acumuladas del proceso.
+        
+        Returns:
+            Diccionario con cargas, aciertos y segundos de carga
+        """
+        with cls._lock:
+            stats = dict(cls.stats)
+        stats['load_seconds'] = round(stats['load_seconds'], 4)
+        return stats
@@ -8,7 +8,8 @@ import re
 from pathlib import Path
 from typing import Tuple, List
 import pandas as pd
-from docx import Document
+
+from core.certificates.template_cache import TemplateCache
 
 
 class CertificateValidator:
@@ -61,9 +62,9 @@ class CertificateValidator:
         if not os.path.isfile(template_path):
             return False, f"La ruta no es un archivo válido: {template_path}"
         
-        # Intentar abrir con python-docx
+        # Intentar abrir con python-docx (compartido vía caché de plantillas)
         try:
-            doc = Document(template_path)
+            doc = TemplateCache.get(template_path).document
             # Verificar que tiene al menos un párrafo
             if not doc.paragraphs:
                 return False, "La plantilla está vacía o corrupta"
@@ -72,6 +73,26 @@ class CertificateValidator:
         
         return True, ""
     
+    @staticmethod
+    def validate_native_template(template_path: str) -> Tuple[bool, str]:
+        """
+        Valida que la plantilla pueda renderizarse con el PDF nativo.
+        
+        Args:
+            template_path: Ruta a la plantilla
+            
+        Returns:
+            Tupla (éxito, mensaje_error)
+        """
+        from core.certificates.native_pdf_generator import NativePDFGenerator
+        
+        try:
+            NativePDFGenerator.check_template(TemplateCache.get(template_path).document)
+        except ValueError as e:
+            return False, str(e)
+        
+        return True, ""
+    
     @staticmethod
     def validate_template_placeholders(template_path: str) -> Tuple[bool, List[str]]:
         """
@@ -84,20 +105,10 @@ class CertificateValidator:
             Tupla (éxito, lista_placeholders_o_mensaje_error)
         """
         try:
-            doc = Document(template_path)
-            
-            # Buscar todos los placeholders {{...}}
-            placeholders = set()
-            pattern = r'\{\{([^}]+)\}\}'
-            
-            for para in doc.paragraphs:
-                matches = re.findall(pattern, para.text)
-                for match in matches:
-                    # Limpiar espacios
-                    placeholders.add(match.strip())
-            
-            # Convertir a lista ordenada
-            placeholders_list = sorted(list(placeholders))
+            # Índice de placeholders {{...}} de la plantilla en caché: cubre cuerpo,
+            # tablas, encabezados, pies y cuadros de texto (el mismo que usa el generador)
+            placeholders_list = TemplateCache.get(template_path).placeholders
+            placeholders = set(placeholders_list)
             
             # Validar que estén todos los requeridos
             missing = []
@@ -109,7 +120,7 @@ class CertificateValidator:
                 error_msg = f"Faltan placeholders requeridos: {', '.join(missing)}"
                 return False, [error_msg]
             
-            return True, placeholders_list
+            return True, list(placeholders_list)
             
         except Exception as e:
             return False, [f"Error al extraer placeholders: {str(e)}"]
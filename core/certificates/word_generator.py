@@ -5,36 +5,67 @@ Genera certificados individuales y en batch con reemplazo de placeholders.
 
 import os
 import re
+import time
+from copy import deepcopy
 from pathlib import Path
-from typing import Tuple, Dict, List, Optional, Callable, Any
+from typing import Tuple, Dict, List, Optional, Callable, Any, Iterable, Iterator, Union
 import pandas as pd
 from docx import Document
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+from core.certificates.template_cache import TemplateCache
+from core.certificates.async_writer import AsyncWriter
+
+
+# Patrones precompilados (se aplican sobre columnas completas en generate_batch)
+INVALID_FILENAME_CHARS = re.compile(r'[/\\:*?"<>|]')
+WHITESPACE_RUNS = re.compile(r'\s+')
 
 
 class WordCertificateGenerator:
     """Generador de certificados Word desde plantilla"""
     
+    # Extensión de los archivos producidos por generate_single
+    OUTPUT_EXTENSION = '.docx'
+    
+    # Etapa de escritura de generate_batch: hilos de E/S y documentos en cola
+    WRITER_THREADS = 2
+    WRITER_QUEUE_SIZE = 32
+    
+    # Mapeo de columnas del DataFrame a placeholders de la plantilla
+    COLUMN_MAPPING = {
+        'APELLIDOS Y NOMBRES': 'APELLIDOS_Y_NOMBRES',
+        'FECHAS_CERTIFICADO': 'FECHAS_CERTIFICADO',
+        'DÍAS_LABORADOS': 'DÍAS_LABORADOS',
+        'CARGO': 'CARGO',
+        'CLIENTE': 'CLIENTE',
+        'FECHA_GENERAR': 'FECHA_GENERAR'
+    }
+    
     def __init__(self, template_path: str):
         """
         Inicializa el generador con una plantilla.
         
         Args:
             template_path: Ruta a la plantilla Word
-            
+        
         Raises:
             ValueError: Si la plantilla no existe o no es válida
         """
         self.template_path = template_path
         self.template = None
+        self.template_entry = None
         self._load_template()
     
     def _load_template(self) -> None:
-        """Carga la plantilla Word en memoria"""
+        """Carga la plantilla Word desde la caché de plantillas del proceso"""
         if not os.path.exists(self.template_path):
             raise ValueError(f"La plantilla no existe: {self.template_path}")
         
         try:
-            self.template = Document(self.template_path)
+            self.template_entry = TemplateCache.get(self.template_path)
+            self.template = self.template_entry.document
         except Exception as e:
             raise ValueError(f"Error al cargar plantilla: {str(e)}")
     
@@ -45,29 +76,30 @@ class WordCertificateGenerator:
         Returns:
             Lista de placeholders únicos encontrados (sin llaves)
         """
-        placeholders = set()
-        pattern = r'\{\{([^}]+)\}\}'
-        
-        for para in self.template.paragraphs:
-            matches = re.findall(pattern, para.text)
-            for match in matches:
-                placeholders.add(match.strip())
-        
-        return sorted(list(placeholders))
+        return list(self.template_entry.placeholders)
     
-    def _replace_placeholders(self, doc: Document, data: dict) -> Document:
+    def _replace_placeholders(self,
+                              doc: Document,
+                              data: dict,
+                              paragraphs: Optional[List[Any]] = None) -> Document:
         """
         Reemplaza placeholders en un documento.
         
         Args:
             doc: Documento Word
             data: Diccionario con datos para reemplazar
-            
+            paragraphs: Párrafos a procesar (None = párrafos del cuerpo); con el
+                        índice de la plantilla incluye tablas, encabezados,
+                        pies y cuadros de texto
+        
         Returns:
             Documento modificado
         """
-        # Iterar sobre todos los párrafos
-        for para in doc.paragraphs:
+        if paragraphs is None:
+            paragraphs = doc.paragraphs
+        
+        # Iterar sobre los párrafos
+        for para in paragraphs:
             # Obtener el texto original
             original_text = para.text
             modified_text = original_text
@@ -99,26 +131,16 @@ class WordCertificateGenerator:
         Convierte nombres de columnas al formato de placeholders.
         
         Args:
-            row_data: Fila del DataFrame
-            
+            row_data: Fila del DataFrame (o diccionario columna -> valor)
+        
         Returns:
             Diccionario con datos preparados
         """
         data = {}
         
-        # Mapeo de columnas a placeholders
-        column_mapping = {
-            'APELLIDOS Y NOMBRES': 'APELLIDOS_Y_NOMBRES',
-            'FECHAS_CERTIFICADO': 'FECHAS_CERTIFICADO',
-            'DÍAS_LABORADOS': 'DÍAS_LABORADOS',
-            'CARGO': 'CARGO',
-            'CLIENTE': 'CLIENTE',
-            'FECHA_GENERAR': 'FECHA_GENERAR'
-        }
-        
-        # Convertir datos
-        for col_name, placeholder_name in column_mapping.items():
-            if col_name in row_data.index:
+        # Convertir datos (acepta filas pd.Series o diccionarios)
+        for col_name, placeholder_name in self.COLUMN_MAPPING.items():
+            if col_name in row_data:
                 value = row_data[col_name]
                 data[placeholder_name] = value
             else:
@@ -126,6 +148,50 @@ class WordCertificateGenerator:
         
         return data
     
+    def _iter_data_dicts(self, df: pd.DataFrame) -> Iterator[dict]:
+        """
+        Prepara los diccionarios de datos de todo el DataFrame por columnas.
+        Las seis columnas de placeholders se extraen una sola vez como listas,
+        evitando construir una pd.Series por fila.
+        
+        Args:
+            df: DataFrame con datos de certificados
+        
+        Returns:
+            Iterador de diccionarios placeholder -> valor, alineado con las filas
+        """
+        placeholders = tuple(self.COLUMN_MAPPING.values())
+        columnas = [
+            df[col].tolist() if col in df.columns else [''] * len(df)
+            for col in self.COLUMN_MAPPING
+        ]
+        
+        return (dict(zip(placeholders, valores)) for valores in zip(*columnas))
+    
+    @staticmethod
+    def _sanitize_filenames(nombres: pd.Series, max_length: int = 100) -> List[str]:
+        """
+        Sanitiza una columna completa de nombres de archivo (versión vectorizada
+        de _sanitize_filename).
+        
+        Args:
+            nombres: Serie con apellidos y nombres
+            max_length: Longitud máxima
+        
+        Returns:
+            Lista de nombres sanitizados alineada con la serie
+        """
+        serie = nombres.where(nombres.notna(), '').astype(str)
+        
+        limpio = (serie
+                  .str.replace(INVALID_FILENAME_CHARS, '', regex=True)
+                  .str.replace(WHITESPACE_RUNS, ' ', regex=True)
+                  .str.strip()
+                  .str[:max_length]
+                  .str.strip())
+        
+        return limpio.where(limpio != '', 'SIN_NOMBRE').tolist()
+    
     def _sanitize_filename(self, apellidos_nombres: str, max_length: int = 100) -> str:
         """
         Sanitiza nombre de archivo.
@@ -133,7 +199,7 @@ class WordCertificateGenerator:
         Args:
             apellidos_nombres: Nombre para el archivo
             max_length: Longitud máxima
-            
+        
         Returns:
             Nombre sanitizado
         """
@@ -143,11 +209,10 @@ class WordCertificateGenerator:
         nombre = str(apellidos_nombres).strip()
         
         # Eliminar caracteres no válidos
-        invalid_chars = r'[/\\:*?"<>|]'
-        nombre = re.sub(invalid_chars, '', nombre)
+        nombre = INVALID_FILENAME_CHARS.sub('', nombre)
         
         # Reemplazar espacios múltiples
-        nombre = re.sub(r'\s+', ' ', nombre)
+        nombre = WHITESPACE_RUNS.sub(' ', nombre)
         
         nombre = nombre.strip()
         
@@ -160,6 +225,108 @@ class WordCertificateGenerator:
         
         return nombre
     
+    def _render_bytes(self, data_dict: dict) -> bytes:
+        """
+        Renderiza un certificado en memoria.
+        
+        Args:
+            data_dict: Diccionario placeholder -> valor
+        
+        Returns:
+            Bytes del documento generado
+        """
+        # Solo se reescriben los nodos indexados; el resto del paquete se reutiliza
+        return self.template_entry.render(data_dict)
+    
+    def _render_cached(self,
+                       data_dict: dict,
+                       cache: Optional[Any] = None,
+                       template_digest: Optional[str] = None) -> bytes:
+        """
+        Renderiza un certificado en memoria reutilizando la caché si existe.
+        
+        Args:
+            data_dict: Diccionario placeholder -> valor
+            cache: RenderCache opcional
+            template_digest: Hash de la plantilla (requerido si hay caché)
+        
+        Returns:
+            Bytes del documento generado
+        """
+        if cache is None:
+            return self._render_bytes(data_dict)
+        
+        cache_key = cache.render_key(template_digest, data_dict)
+        content = cache.read(cache_key, self.OUTPUT_EXTENSION)
+        if content is None:
+            content = self._render_bytes(data_dict)
+            cache.store_bytes(cache_key, self.OUTPUT_EXTENSION, content)
+        return content
+    
+    def render_to_bytes(self, row_data: Any) -> bytes:
+        """
+        Genera un certificado en memoria, sin escribir en disco.
+        
+        Args:
+            row_data: Fila con datos del certificado (pd.Series o diccionario)
+        
+        Returns:
+            Bytes del certificado (docx; PDF en el generador nativo)
+        
+        Raises:
+            Exception: Si falla el renderizado
+        """
+        return self._render_bytes(self._prepare_data_dict(row_data))
+    
+    def iter_render(self,
+                    rows: Union[pd.DataFrame, Iterable[Any]],
+                    cache: Optional[Any] = None
+                    ) -> Iterator[Tuple[Optional[bytes], Optional[str]]]:
+        """
+        Genera certificados en memoria de forma perezosa, uno por fila.
+        Solo se mantiene en memoria el certificado en curso, por lo que el
+        consumo no crece con el tamaño del lote.
+        
+        Args:
+            rows: DataFrame o iterable de filas (pd.Series o diccionarios)
+            cache: RenderCache opcional
+        
+        Yields:
+            Tupla (bytes, None) si tuvo éxito o (None, mensaje de error)
+        """
+        template_digest = self.template_entry.digest if cache else None
+        
+        if isinstance(rows, pd.DataFrame):
+            data_dicts = self._iter_data_dicts(rows)
+        else:
+            data_dicts = (self._prepare_data_dict(row) for row in rows)
+        
+        for data_dict in data_dicts:
+            try:
+                yield self._render_cached(data_dict, cache, template_digest), None
+            except Exception as e:
+                yield None, f"Error al generar certificado: {str(e)}"
+    
+    def render_many(self,
+                    rows: Union[pd.DataFrame, Iterable[Any]],
+                    cache: Optional[Any] = None) -> List[Optional[bytes]]:
+        """
+        Genera varios certificados en memoria.
+        
+        Args:
+            rows: DataFrame o iterable de filas (pd.Series o diccionarios)
+            cache: RenderCache opcional
+        
+        Returns:
+            Lista de bytes alineada con las filas (None en las filas con error)
+        """
+        return [content for content, _ in self.iter_render(rows, cache=cache)]
+    
+    @staticmethod
+    def _write_output(output_path: str, content: bytes) -> None:
+        """Escribe un certificado renderizado en su ruta de salida (temporal + rename)"""
+        AsyncWriter.write_atomic(output_path, content)
+    
     def generate_single(self, 
                        row_data: pd.Series, 
                        output_path: str) -> Tuple[bool, str]:
@@ -169,57 +336,47 @@ class WordCertificateGenerator:
         Args:
             row_data: Fila con datos del certificado
             output_path: Ruta de salida completa del archivo
-            
+        
         Returns:
             Tupla (éxito, mensaje)
         """
         try:
-            # Crear una copia de la plantilla
-            doc = Document(self.template_path)
-            
-            # Preparar datos
-            data_dict = self._prepare_data_dict(row_data)
-            
-            # Reemplazar placeholders
-            doc = self._replace_placeholders(doc, data_dict)
-            
-            # Asegurar que el directorio existe
-            output_dir = os.path.dirname(output_path)
-            if output_dir and not os.path.exists(output_dir):
-                os.makedirs(output_dir, exist_ok=True)
-            
-            # Guardar documento
-            doc.save(output_path)
-            
+            self._write_output(output_path, self.render_to_bytes(row_data))
             return True, output_path
-            
+        
         except Exception as e:
             return False, f"Error al generar certificado: {str(e)}"
     
-    def _handle_duplicate_filename(self, output_folder: str, base_filename: str) -> str:
+    def _handle_duplicate_filename(self,
+                                   output_folder: str,
+                                   base_filename: str,
+                                   exists: Optional[Callable[[str], bool]] = None) -> str:
         """
         Maneja nombres de archivo duplicados agregando sufijos.
         
         Args:
             output_folder: Carpeta de salida
             base_filename: Nombre base del archivo (sin extensión)
-            
+            exists: Función que indica si una ruta ya está ocupada
+                    (por defecto os.path.exists; en modo ZIP, las entradas del archivo)
+        
         Returns:
             Nombre de archivo único
         """
-        output_path = os.path.join(output_folder, f"{base_filename}.docx")
+        exists = exists or os.path.exists
+        output_path = os.path.join(output_folder, f"{base_filename}{self.OUTPUT_EXTENSION}")
         
         # Si no existe, usar tal cual
-        if not os.path.exists(output_path):
+        if not exists(output_path):
             return output_path
         
         # Si existe, agregar sufijo numérico
         counter = 1
         while True:
-            new_filename = f"{base_filename}_{counter}.docx"
+            new_filename = f"{base_filename}_{counter}{self.OUTPUT_EXTENSION}"
             output_path = os.path.join(output_folder, new_filename)
             
-            if not os.path.exists(output_path):
+            if not exists(output_path):
                 return output_path
             
             counter += 1
@@ -231,7 +388,9 @@ class WordCertificateGenerator:
     def generate_batch(self,
                       df: pd.DataFrame,
                       output_folder: str,
-                      progress_callback: Optional[Callable[[int, str, int, int], None]] = None
+                      progress_callback: Optional[Callable[[int, str, int, int], None]] = None,
+                      cache: Optional[Any] = None,
+                      archive: Optional[Any] = None
                       ) -> Dict[str, Any]:
         """
         Genera múltiples certificados en batch.
@@ -240,7 +399,12 @@ class WordCertificateGenerator:
             df: DataFrame con datos de certificados
             output_folder: Carpeta de salida
             progress_callback: Función callback(índice, mensaje, actual, total)
-            
+            cache: RenderCache opcional; en acierto se copia el docx cacheado
+                   en lugar de renderizarlo
+            archive: ZipArchiveWriter opcional; cada certificado se escribe
+                     directamente en el ZIP sin crear archivos sueltos (las rutas
+                     de resultados son las de las entradas dentro del archivo)
+        
         Returns:
             Diccionario con resultados:
             {
@@ -248,11 +412,16 @@ class WordCertificateGenerator:
                 'exitosos': int,
                 'fallidos': int,
                 'archivos_generados': List[str],
-                'errores': List[Dict]
+                'archivos_por_fila': List[Optional[str]],
+                'errores': List[Dict],
+                'throughput': Dict,  # contadores de las etapas render y write
+                'tiempos_por_fila': {'render': List[Optional[float]],
+                                     'write': List[Optional[float]]}
             }
         """
-        # Asegurar que la carpeta existe
-        os.makedirs(output_folder, exist_ok=True)
+        # Asegurar que la carpeta existe (en modo ZIP no se crean archivos sueltos)
+        if archive is None:
+            os.makedirs(output_folder, exist_ok=True)
         
         # Inicializar resultados
         results = {
@@ -260,28 +429,76 @@ class WordCertificateGenerator:
             'exitosos': 0,
             'fallidos': 0,
             'archivos_generados': [],
+            'archivos_por_fila': [],
             'errores': []
         }
         
-        # Procesar cada fila
-        for idx, (_, row) in enumerate(df.iterrows(), 1):
-            try:
-                # Obtener apellidos y nombres para el archivo
-                apellidos_nombres = row.get('APELLIDOS Y NOMBRES', 'SIN_NOMBRE')
-                
-                # Sanitizar nombre
-                nombre_sanitizado = self._sanitize_filename(apellidos_nombres)
-                
-                # Generar nombre de archivo con manejo de duplicados
-                base_filename = f"Certificado_{nombre_sanitizado}"
-                output_path = self._handle_duplicate_filename(output_folder, base_filename)
-                
-                # Generar certificado
-                success, message = self.generate_single(row, output_path)
-                
-                if success:
+        # Hash de la plantilla para las claves de caché (calculado al cargarla)
+        template_digest = self.template_entry.digest if cache else None
+        
+        # Acceso por columnas: nombres y nombres de archivo para todo el lote
+        if 'APELLIDOS Y NOMBRES' in df.columns:
+            nombres = df['APELLIDOS Y NOMBRES']
+        else:
+            nombres = pd.Series(['SIN_NOMBRE'] * len(df), index=df.index, dtype=object)
+        nombres_sanitizados = self._sanitize_filenames(nombres)
+        
+        filas = zip(nombres.tolist(), nombres_sanitizados, self._iter_data_dicts(df))
+        
+        # Etapa de escritura: hilos de E/S con cola acotada (en modo ZIP, un
+        # único hilo porque las entradas se escriben en secuencia)
+        writer = AsyncWriter(
+            sink=archive.write if archive else None,
+            workers=1 if archive else self.WRITER_THREADS,
+            max_pending=self.WRITER_QUEUE_SIZE
+        )
+        
+        # Rutas asignadas en este lote (aún pueden estar en la cola de escritura)
+        reservadas = set()
+        existe = archive.contains if archive else os.path.exists
+        
+        render_stats = {'items': 0, 'seconds': 0.0, 'cache_copies': 0}
+        tiempos_render: List[Optional[float]] = []
+        
+        try:
+            # Procesar cada fila
+            for idx, (apellidos_nombres, nombre_sanitizado, data_dict) in enumerate(filas, 1):
+                try:
+                    # Generar nombre de archivo con manejo de duplicados
+                    base_filename = f"Certificado_{nombre_sanitizado}"
+                    output_path = self._handle_duplicate_filename(
+                        output_folder,
+                        base_filename,
+                        exists=lambda path: path in reservadas or existe(path)
+                    )
+                    reservadas.add(output_path)
+                    
+                    # Generar certificado en memoria (o reutilizarlo desde la caché)
+                    start = time.perf_counter()
+                    
+                    cache_key = cache.render_key(template_digest, data_dict) if cache else None
+                    
+                    if archive is None and cache_key and cache.fetch(
+                            cache_key, self.OUTPUT_EXTENSION, output_path):
+                        # Acierto en disco: copiar la entrada sin renderizar
+                        render_stats['cache_copies'] += 1
+                    elif archive is None and cache_key:
+                        # Fallo ya contado por fetch: renderizar y guardar sin otra búsqueda
+                        content = self._render_bytes(data_dict)
+                        cache.store_bytes(cache_key, self.OUTPUT_EXTENSION, content)
+                        writer.submit(output_path, content, tag=(idx, apellidos_nombres))
+                    else:
+                        content = self._render_cached(data_dict, cache, template_digest)
+                        writer.submit(output_path, content, tag=(idx, apellidos_nombres))
+                    
+                    elapsed = time.perf_counter() - start
+                    render_stats['items'] += 1
+                    render_stats['seconds'] += elapsed
+                    tiempos_render.append(elapsed)
+                    
                     results['exitosos'] += 1
                     results['archivos_generados'].append(output_path)
+                    results['archivos_por_fila'].append(output_path)
                     
                     # Callback de progreso
                     if progress_callback:
@@ -291,41 +508,161 @@ class WordCertificateGenerator:
                             results['exitosos'],
                             results['total']
                         )
-                else:
+                
+                except Exception as e:
                     results['fallidos'] += 1
+                    results['archivos_por_fila'].append(None)
+                    tiempos_render.append(None)
+                    apellidos = apellidos_nombres
+                    error_msg = f"Excepción: {str(e)}"
+                    
                     results['errores'].append({
                         'fila': idx,
-                        'apellidos': apellidos_nombres,
-                        'error': message
+                        'apellidos': apellidos,
+                        'error': error_msg
                     })
                     
-                    # Callback de progreso con error
+                    # Callback de progreso con excepción
                     if progress_callback:
                         progress_callback(
                             idx,
-                            f"ERROR: {apellidos_nombres} - {message}",
+                            f"EXCEPCIÓN: {apellidos} - {error_msg}",
                             results['exitosos'],
                             results['total']
                         )
+        
+        finally:
+            write_errors = writer.close()
+        
+        # Errores de escritura: la fila pasa a fallida
+        for (idx, apellidos), path, error in write_errors:
+            results['exitosos'] -= 1
+            results['fallidos'] += 1
+            results['archivos_generados'].remove(path)
+            results['archivos_por_fila'][idx - 1] = None
+            results['errores'].append({
+                'fila': idx,
+                'apellidos': apellidos,
+                'error': f"Error al escribir certificado: {error}"
+            })
+        
+        render_seconds = render_stats['seconds']
+        results['throughput'] = {
+            'render': {
+                'items': render_stats['items'],
+                'cache_copies': render_stats['cache_copies'],
+                'seconds': round(render_seconds, 4),
+                'per_second': round(render_stats['items'] / render_seconds, 2) if render_seconds else 0.0
+            },
+            'write': writer.get_stats()
+        }
+        
+        # Latencias por fila (segundos) alineadas con el DataFrame
+        tiempos_escritura: List[Optional[float]] = [None] * len(tiempos_render)
+        for (idx, _), elapsed in writer.latencies:
+            tiempos_escritura[idx - 1] = elapsed
+        
+        results['tiempos_por_fila'] = {
+            'render': tiempos_render,
+            'write': tiempos_escritura
+        }
+        
+        return results
+    
+    def generate_merged(self,
+                        df: pd.DataFrame,
+                        output_path: str,
+                        progress_callback: Optional[Callable[[int, str, int, int], None]] = None
+                        ) -> Dict[str, Any]:
+        """
+        Genera un único documento Word con un certificado por fila.
+        Cada certificado conserva las secciones (y encabezados) de la plantilla
+        y comienza en una página nueva.
+        
+        Args:
+            df: DataFrame con datos de certificados
+            output_path: Ruta del documento unido
+            progress_callback: Función callback(índice, mensaje, actual, total)
+        
+        Returns:
+            Diccionario con resultados:
+            {
+                'output_path': str,
+                'total': int,
+                'exitosos': int,
+                'fallidos': int,
+                'errores': List[Dict]
+            }
+        """
+        results = {
+            'output_path': output_path,
+            'total': len(df),
+            'exitosos': 0,
+            'fallidos': 0,
+            'errores': []
+        }
+        
+        merged = None
+        final_sectpr = None
+        
+        if 'APELLIDOS Y NOMBRES' in df.columns:
+            nombres = df['APELLIDOS Y NOMBRES'].tolist()
+        else:
+            nombres = ['DESCONOCIDO'] * len(df)
+        
+        filas = zip(nombres, self._iter_data_dicts(df))
+        
+        for idx, (apellidos, data_dict) in enumerate(filas, 1):
+            try:
+                doc = self.template_entry.new_document()
+                doc = self._replace_placeholders(
+                    doc,
+                    data_dict,
+                    self.template_entry.locate_paragraphs(doc)
+                )
+                
+                if merged is None:
+                    merged = doc
+                    final_sectpr = merged.element.body.find(qn('w:sectPr'))
+                else:
+                    # Cerrar la última sección del certificado anterior (salto de página)
+                    separator = OxmlElement('w:p')
+                    ppr = OxmlElement('w:pPr')
+                    ppr.append(deepcopy(final_sectpr))
+                    separator.append(ppr)
+                    final_sectpr.addprevious(separator)
+                    
+                    # Misma plantilla: las relaciones (rId) coinciden en ambos documentos
+                    for element in list(doc.element.body):
+                        if element.tag != qn('w:sectPr'):
+                            final_sectpr.addprevious(element)
                 
+                results['exitosos'] += 1
+            
             except Exception as e:
                 results['fallidos'] += 1
-                apellidos = row.get('APELLIDOS Y NOMBRES', 'DESCONOCIDO')
-                error_msg = f"Excepción: {str(e)}"
-                
                 results['errores'].append({
                     'fila': idx,
                     'apellidos': apellidos,
-                    'error': error_msg
+                    'error': f"Excepción: {str(e)}"
                 })
-                
-                # Callback de progreso con excepción
-                if progress_callback:
-                    progress_callback(
-                        idx,
-                        f"EXCEPCIÓN: {apellidos} - {error_msg}",
-                        results['exitosos'],
-                        results['total']
-                    )
+            
+            if progress_callback:
+                progress_callback(
+                    idx,
+                    f"Unido: {apellidos}",
+                    results['exitosos'],
+                    results['total']
+                )
+        
+        if merged is not None:
+            # Word exige identificadores únicos para cada dibujo
+            for drawing_id, doc_pr in enumerate(merged.element.body.iter(qn('wp:docPr')), 1):
+                doc_pr.set('id', str(drawing_id))
+            
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            merged.save(output_path)
         
-        return results
\ No newline at end of file
+        return results
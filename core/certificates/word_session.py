@@ -0,0 +1,354 @@
+"""
+Módulo de sesiones de automatización de MS Word.
+Mantiene una instancia de Word viva por hilo durante todo el lote en lugar
+de iniciar y cerrar Word por cada archivo. La interacción COM queda detrás
+de WordAutomation para poder sustituirla por un objeto falso fuera de Windows.
+Un watchdog termina el proceso de Word si un documento supera el tiempo máximo
+(diálogos modales, documentos dañados) y la instancia se reemplaza; si no
+puede terminarlo, marca la sesión como bloqueada para que el pool abandone
+el hilo y lo reemplace.
+"""
+
+import csv
+import uuid
+import threading
+import subprocess
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from core.certificates.conversion_errors import ConversionTimeout
+
+
+class WordAutomation(ABC):
+    """
+    Interfaz de una instancia de Word capaz de convertir documentos a PDF.
+    Los objetos COM viven en el apartamento del hilo que los creó: start,
+    convert y quit se llaman desde ese hilo; kill es la única operación
+    válida desde otro (no usa COM).
+    """
+    
+    @abstractmethod
+    def start(self) -> None:
+        """Inicia la instancia (COM, aplicación oculta)"""
+    
+    @abstractmethod
+    def convert(self, word_path: str, pdf_path: str) -> None:
+        """
+        Convierte un documento a PDF.
+        
+        Args:
+            word_path: Ruta absoluta del .docx
+            pdf_path: Ruta absoluta del PDF de salida
+        
+        Raises:
+            Exception: Si Word no pudo abrir o exportar el documento
+        """
+    
+    @abstractmethod
+    def quit(self) -> None:
+        """Cierra la instancia y libera COM (no debe lanzar excepciones)"""
+    
+    @abstractmethod
+    def kill(self) -> bool:
+        """
+        Termina el proceso de la instancia desde otro hilo (watchdog o cierre
+        de la sesión), sin llamadas COM; una llamada convert bloqueada debe
+        terminar con una excepción.
+        
+        Returns:
+            False si la instancia no pudo terminarse (el hilo sigue bloqueado)
+        """
+
+
+class Win32WordAutomation(WordAutomation):
+    """Instancia de Word mediante win32com (solo Windows)"""
+    
+    # Formato de SaveAs para PDF
+    PDF_FORMAT = 17
+    
+    # Clase de ventana de Word (para localizar el proceso de la instancia)
+    WINDOW_CLASS = "OpusApp"
+    
+    # Ejecutable de Word (respaldo para localizar el proceso sin ventana)
+    IMAGE_NAME = "WINWORD.EXE"
+    
+    # Los inicios se serializan para que la diferencia de procesos sea inequívoca
+    _start_lock = threading.Lock()
+    
+    def __init__(self):
+        self.app = None
+        self.pid = None
+        self._com_initialized = False
+    
+    def start(self) -> None:
+        import pythoncom
+        import win32com.client
+        
+        # Inicializar COM en el hilo que usará la instancia
+        pythoncom.CoInitialize()
+        self._com_initialized = True
+        
+        with self._start_lock:
+            before = self._word_pids()
+            
+            # DispatchEx crea una instancia propia (Dispatch reutilizaría la del usuario)
+            self.app = win32com.client.DispatchEx("Word.Application")
+            self.app.Visible = False
+            self.app.DisplayAlerts = 0  # No mostrar alertas
+            
+            # Sin ventana localizable: el proceso WINWORD.EXE nuevo es el de la instancia
+            self.pid = self._find_pid() or self._new_pid(before)
+    
+    @classmethod
+    def _word_pids(cls) -> Set[int]:
+        """PIDs de los procesos WINWORD.EXE en ejecución (vacío si no se pueden listar)"""
+        try:
+            output = subprocess.run(
+                ['tasklist', '/FI', f'IMAGENAME eq {cls.IMAGE_NAME}', '/FO', 'CSV', '/NH'],
+                capture_output=True, text=True, timeout=15,
+                creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+            ).stdout
+        except Exception:
+            return set()
+        
+        pids = set()
+        for row in csv.reader(output.splitlines()):
+            if len(row) > 1 and row[0].upper() == cls.IMAGE_NAME and row[1].isdigit():
+                pids.add(int(row[1]))
+        return pids
+    
+    def _new_pid(self, before: Set[int]) -> Optional[int]:
+        """PID del único WINWORD.EXE que no existía antes del inicio (None si es ambiguo)"""
+        new_pids = self._word_pids() - before
+        return new_pids.pop() if len(new_pids) == 1 else None
+    
+    def _find_pid(self) -> Optional[int]:
+        """PID del proceso WINWORD.EXE de esta instancia (título de ventana único)"""
+        try:
+            import win32gui
+            import win32process
+            
+            caption = f"certificados-{uuid.uuid4().hex}"
+            self.app.Caption = caption
+            hwnd = win32gui.FindWindow(self.WINDOW_CLASS, caption)
+            if not hwnd:
+                return None
+            
+            _, pid = win32process.GetWindowThreadProcessId(hwnd)
+            return pid
+        except Exception:
+            return None
+    
+    def convert(self, word_path: str, pdf_path: str) -> None:
+        doc = self.app.Documents.Open(word_path, ReadOnly=True, AddToRecentFiles=False)
+        try:
+            doc.SaveAs(pdf_path, FileFormat=self.PDF_FORMAT)
+        finally:
+            doc.Close(False)
+    
+    def quit(self) -> None:
+        try:
+            if self.app is not None:
+                self.app.Quit()
+        except Exception:
+            pass
+        finally:
+            self.app = None
+            if self._com_initialized:
+                import pythoncom
+                pythoncom.CoUninitialize()
+                self._com_initialized = False
+    
+    def kill(self) -> bool:
+        # Terminar el proceso hace que la llamada COM bloqueada falle con error RPC
+        if self.pid is None:
+            return False
+        
+        try:
+            import win32api
+            import win32con
+            
+            handle = win32api.OpenProcess(win32con.PROCESS_TERMINATE, False, self.pid)
+            try:
+                win32api.TerminateProcess(handle, 1)
+            finally:
+                win32api.CloseHandle(handle)
+            return True
+        except Exception:
+            return False
+
+
+class WordSession:
+    """
+    Pool de instancias de Word: una por hilo, reutilizada entre documentos.
+    La instancia se recicla tras RECYCLE_AFTER documentos o ante un error, y
+    se termina si un documento supera TIMEOUT segundos.
+    """
+    
+    # Documentos convertidos por instancia antes de reiniciarla (fugas de memoria de Word)
+    RECYCLE_AFTER = 200
+    
+    # Segundos máximos por documento antes de terminar la instancia
+    TIMEOUT = 120
+    
+    def __init__(self,
+                 factory: Optional[Callable[[], WordAutomation]] = None,
+                 recycle_after: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        """
+        Inicializa la sesión (las instancias se crean al primer uso de cada hilo).
+        
+        Args:
+            factory: Constructor de instancias (por defecto Win32WordAutomation)
+            recycle_after: Documentos por instancia antes de reciclarla
+            timeout: Segundos máximos por documento (por defecto TIMEOUT)
+        """
+        self.factory = factory or Win32WordAutomation
+        self.recycle_after = recycle_after or self.RECYCLE_AFTER
+        self.timeout = timeout or self.TIMEOUT
+        
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._instances: List[WordAutomation] = []
+        
+        # Se activa si el watchdog no pudo terminar una instancia bloqueada
+        self.hung = threading.Event()
+        
+        self.stats = {
+            'started': 0,
+            'recycled': 0,
+            'discarded': 0,
+            'timeouts': 0,
+            'abandoned': 0,
+            'documents': 0
+        }
+    
+    def _acquire(self) -> WordAutomation:
+        """Instancia del hilo actual, iniciándola si no existe"""
+        instance = getattr(self._local, 'instance', None)
+        if instance is None:
+            instance = self.factory()
+            try:
+                instance.start()
+            except Exception:
+                instance.quit()
+                raise
+            
+            self._local.instance = instance
+            self._local.documents = 0
+            with self._lock:
+                self._instances.append(instance)
+                self.stats['started'] += 1
+        
+        return instance
+    
+    def _discard(self, stat: str) -> None:
+        """Cierra la instancia del hilo actual"""
+        instance = getattr(self._local, 'instance', None)
+        if instance is None:
+            return
+        
+        self._local.instance = None
+        instance.quit()
+        
+        with self._lock:
+            if instance in self._instances:
+                self._instances.remove(instance)
+            if stat:
+                self.stats[stat] += 1
+    
+    def convert(self, word_path: str, pdf_path: str) -> None:
+        """
+        Convierte un documento con la instancia del hilo actual.
+        Si la conversión falla, la instancia se descarta y el siguiente
+        documento (o reintento) arranca una nueva. Un watchdog termina la
+        instancia si el documento supera el tiempo máximo.
+        
+        Args:
+            word_path: Ruta absoluta del .docx
+            pdf_path: Ruta absoluta del PDF de salida
+        
+        Raises:
+            ConversionTimeout: Si el documento superó el tiempo máximo
+            Exception: El error de Word o de inicio de la instancia
+        """
+        instance = self._acquire()
+        
+        expired = threading.Event()
+        # Estadística al descartar tras el timeout (ya contado si no se pudo terminar)
+        timeout_stat = ['timeouts']
+        
+        def watchdog():
+            expired.set()
+            if not instance.kill():
+                timeout_stat[0] = None
+                # El hilo sigue bloqueado en convert: se cuenta el timeout aquí y
+                # quien supervisa la sesión debe abandonarla
+                with self._lock:
+                    self.stats['timeouts'] += 1
+                    self.stats['abandoned'] += 1
+                self.hung.set()
+        
+        timer = threading.Timer(self.timeout, watchdog)
+        timer.daemon = True
+        timer.start()
+        
+        try:
+            instance.convert(word_path, pdf_path)
+        except Exception as e:
+            if expired.is_set():
+                self._discard(timeout_stat[0])
+                raise ConversionTimeout(
+                    f"La conversión superó {self.timeout:g} s: {word_path}"
+                ) from e
+            self._discard('discarded')
+            raise
+        finally:
+            timer.cancel()
+        
+        if expired.is_set():
+            # Terminó justo cuando el watchdog actuaba: la instancia ya no es fiable
+            self._discard(timeout_stat[0])
+            raise ConversionTimeout(f"La conversión superó {self.timeout:g} s: {word_path}")
+        
+        self._local.documents += 1
+        with self._lock:
+            self.stats['documents'] += 1
+        
+        if self._local.documents >= self.recycle_after:
+            self._discard('recycled')
+    
+    def release(self) -> None:
+        """Cierra la instancia del hilo actual (al terminar un hilo de trabajo)"""
+        self._discard(None)
+    
+    def close(self) -> None:
+        """
+        Cierra la instancia del hilo actual y termina por su proceso (kill)
+        las que quedaron abiertas en otros hilos: un Quit por COM desde otro
+        apartamento no es válido y se bloquearía con una instancia colgada.
+        """
+        self.release()
+        
+        with self._lock:
+            instances, self._instances = self._instances, []
+        
+        for instance in instances:
+            instance.kill()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna los contadores de la sesión.
+        
+        Returns:
+            Diccionario con instancias iniciadas, recicladas, descartadas,
+            terminadas por timeout, abandonadas (no se pudieron terminar) y documentos
+        """
+        with self._lock:
+            return dict(self.stats)
+    
+    def __enter__(self) -> 'WordSession':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,231 @@
+"""
+Módulo de salida empaquetada de certificados.
+Escribe cada certificado directamente dentro de un archivo ZIP (uno por
+ejecución o dividido por tamaño) en lugar de crear miles de archivos sueltos.
+Al reanudar una ejecución, el ZIP se reconstruye: las partes previas se
+apartan, las entradas vigentes se copian al archivo nuevo y el resto
+(obsoletas o que se regeneran) se descarta, sin entradas duplicadas.
+"""
+
+import os
+import glob
+import zipfile
+from typing import Dict, Iterable, List, Optional, Set
+
+
+class ZipArchiveWriter:
+    """Escritor de certificados en ZIP con división opcional por tamaño"""
+    
+    # Extensiones ya comprimidas internamente: se guardan sin recomprimir
+    STORED_EXTENSIONS = ('.docx', '.zip', '.png', '.jpg')
+    
+    # Cabeceras local + central aproximadas por entrada
+    ENTRY_OVERHEAD = 128
+    
+    # Sufijo de las partes de una ejecución previa mientras se reconstruye el ZIP
+    PREVIOUS_SUFFIX = ".prev"
+    
+    def __init__(self,
+                 root_folder: str,
+                 archive_name: str,
+                 max_size_mb: Optional[int] = None):
+        """
+        Inicializa el escritor.
+        
+        Args:
+            root_folder: Carpeta de la ejecución; las rutas se guardan relativas a ella
+            archive_name: Nombre base del archivo (sin extensión)
+            max_size_mb: Tamaño máximo por archivo en MB (None = un único archivo)
+        """
+        self.root_folder = root_folder
+        self.archive_name = archive_name
+        self.max_size_bytes = max_size_mb * 1024 * 1024 if max_size_mb else None
+        
+        self.archives: List[str] = []
+        self._members: Set[str] = set()
+        self._zip = None
+        self._current_size = 0
+        
+        # Entradas de una ejecución previa (reanudación): miembro -> parte apartada
+        self._previous: Dict[str, str] = {}
+        self._previous_parts: List[str] = []
+        self._previous_zips: Dict[str, zipfile.ZipFile] = {}
+        self._set_aside_previous()
+        
+        self._open_next()
+    
+    def _set_aside_previous(self) -> None:
+        """
+        Aparta las partes existentes del archivo (ejecución reanudada) y
+        registra sus entradas. Las partes apartadas de una reconstrucción
+        interrumpida se conservan: sus entradas se indexan primero y las de
+        las partes más nuevas las reemplazan.
+        """
+        pattern = os.path.join(glob.escape(self.root_folder), glob.escape(self.archive_name))
+        current = sorted(glob.glob(f"{pattern}.zip") + glob.glob(f"{pattern}_part*.zip"))
+        previous = glob.glob(f"{pattern}*.zip{self.PREVIOUS_SUFFIX}*")
+        
+        for path in current:
+            counter = 1
+            while os.path.exists(f"{path}{self.PREVIOUS_SUFFIX}{counter}"):
+                counter += 1
+            aside = f"{path}{self.PREVIOUS_SUFFIX}{counter}"
+            os.replace(path, aside)
+            previous.append(aside)
+        
+        self._previous_parts = sorted(previous, key=os.path.getmtime)
+        for path in self._previous_parts:
+            try:
+                with zipfile.ZipFile(path) as zf:
+                    for member in zf.namelist():
+                        self._previous[member] = path
+            except zipfile.BadZipFile:
+                # Parte truncada por una caída: sus entradas se regeneran
+                continue
+    
+    def _open_next(self) -> None:
+        """Cierra el archivo actual (si existe) y abre la siguiente parte"""
+        if self._zip is not None:
+            self._zip.close()
+        
+        if self.max_size_bytes:
+            name = f"{self.archive_name}_part{len(self.archives) + 1:03d}.zip"
+        else:
+            name = f"{self.archive_name}.zip"
+        
+        path = os.path.join(self.root_folder, name)
+        self._zip = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._current_size = 0
+        self.archives.append(path)
+    
+    def member_name(self, path: str) -> str:
+        """
+        Convierte una ruta de salida en nombre de entrada del ZIP.
+        
+        Args:
+            path: Ruta (real o virtual) dentro de la carpeta de la ejecución
+        
+        Returns:
+            Ruta relativa con separadores '/'
+        """
+        relative = os.path.relpath(path, self.root_folder)
+        return relative.replace(os.sep, '/')
+    
+    def contains(self, path: str) -> bool:
+        """
+        Indica si hay una entrada para la ruta: escrita en esta ejecución (en
+        cualquier parte) o en una parte previa aún no descartada.
+        """
+        member = self.member_name(path)
+        return member in self._members or member in self._previous
+    
+    def read(self, path: str) -> bytes:
+        """
+        Lee una entrada escrita en una ejecución previa.
+        
+        Args:
+            path: Ruta de salida de la entrada
+        
+        Returns:
+            Contenido de la entrada
+        
+        Raises:
+            KeyError: Si la entrada no está en las partes previas
+        """
+        member = self.member_name(path)
+        source = self._previous[member]
+        
+        if source not in self._previous_zips:
+            self._previous_zips[source] = zipfile.ZipFile(source)
+        return self._previous_zips[source].read(member)
+    
+    def carry_over(self, paths: Iterable[str]) -> int:
+        """
+        Copia al archivo nuevo las entradas previas que siguen vigentes y
+        descarta del índice las demás.
+        
+        Args:
+            paths: Rutas de salida vigentes según el manifiesto
+        
+        Returns:
+            Número de entradas copiadas
+        """
+        vigentes = set()
+        copied = 0
+        for path in paths:
+            member = self.member_name(path)
+            vigentes.add(member)
+            if member in self._members or member not in self._previous:
+                continue
+            self.write(path, self.read(path))
+            copied += 1
+        
+        # Las entradas obsoletas dejan de ocupar su nombre; las partes previas
+        # se conservan en disco hasta discard_previous por si la ejecución se corta
+        self._previous = {member: source for member, source in self._previous.items()
+                          if member in vigentes}
+        return copied
+    
+    def discard_previous(self) -> None:
+        """Elimina las partes previas (tras cerrar el archivo reconstruido)"""
+        for zf in self._previous_zips.values():
+            zf.close()
+        self._previous_zips = {}
+        
+        for path in self._previous_parts:
+            if os.path.exists(path):
+                os.remove(path)
+        self._previous = {}
+        self._previous_parts = []
+    
+    def write(self, path: str, data: bytes) -> str:
+        """
+        Escribe el contenido de un archivo como entrada del ZIP.
+        
+        Args:
+            path: Ruta de salida (define el nombre de la entrada)
+            data: Contenido del archivo
+        
+        Returns:
+            Ruta del archivo ZIP que contiene la entrada
+        """
+        if (self.max_size_bytes and self._current_size > 0 and
+                self._current_size + len(data) > self.max_size_bytes):
+            self._open_next()
+        
+        member = self.member_name(path)
+        compression = (zipfile.ZIP_STORED
+                       if member.lower().endswith(self.STORED_EXTENSIONS)
+                       else zipfile.ZIP_DEFLATED)
+        
+        self._zip.writestr(member, data, compress_type=compression)
+        self._members.add(member)
+        
+        info = self._zip.getinfo(member)
+        self._current_size += info.compress_size + self.ENTRY_OVERHEAD
+        
+        return self.archives[-1]
+    
+    def write_file(self, path: str, source_path: str) -> str:
+        """
+        Copia un archivo existente dentro del ZIP.
+        
+        Args:
+            path: Ruta de salida (define el nombre de la entrada)
+            source_path: Archivo a copiar
+        
+        Returns:
+            Ruta del archivo ZIP que contiene la entrada
+        """
+        with open(source_path, 'rb') as f:
+            return self.write(path, f.read())
+    
+    def close(self) -> None:
+        """Cierra la parte actual del ZIP (las partes previas no descartadas se conservan)"""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        
+        for zf in self._previous_zips.values():
+            zf.close()
+        self._previous_zips = {}
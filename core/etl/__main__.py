@@ -0,0 +1,72 @@
+# core/etl/__main__.py
+"""
+Punto de entrada de línea de comandos del ETL (sin interfaz gráfica)
+Procesa uno o más archivos RAW; no importa PyQt5, por lo que sirve para
+tareas programadas en servidores.
+
+Uso:
+    python -m core.etl archivo1.xlsx [archivo2.parquet ...] [--output-dir carpeta] [--quiet]
+"""
+import sys
+import json
+import argparse
+import warnings
+from typing import List
+
+from .etl_service import ETLService
+
+# Suprimir warnings de openpyxl
+warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
+
+
+def _imprimir_progreso(porcentaje: int, mensaje: str):
+    """Imprime el progreso en stderr (stdout queda para el JSON)"""
+    print(f"[{porcentaje:3d}%] {mensaje}", file=sys.stderr, flush=True)
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Ejecuta el ETL sobre cada archivo e imprime las estadísticas en JSON
+    
+    Args:
+        argv: Argumentos (None = sys.argv)
+    
+    Returns:
+        Código de salida (0 si todos los archivos se procesaron, 1 si alguno falló)
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m core.etl",
+        description="Procesa exports RAW y genera el archivo limpio para certificados"
+    )
+    parser.add_argument('archivos', nargs='+', help="Archivos RAW (.xlsx o .parquet)")
+    parser.add_argument('--output-dir', default=None,
+                        help="Carpeta de salida (por defecto data/clean)")
+    parser.add_argument('--quiet', action='store_true', help="No mostrar el progreso")
+    args = parser.parse_args(argv)
+    
+    # Consolas sin UTF-8 (Windows): no fallar por los emojis del progreso
+    for stream in (sys.stdout, sys.stderr):
+        if hasattr(stream, 'reconfigure'):
+            stream.reconfigure(errors='replace')
+    
+    resultados = []
+    for archivo in args.archivos:
+        servicio = ETLService()
+        if not args.quiet:
+            servicio.set_progress_callback(_imprimir_progreso)
+        
+        exito, mensaje, estadisticas = servicio.procesar_completo(archivo, args.output_dir)
+        resultados.append({
+            'archivo': archivo,
+            'exito': exito,
+            'mensaje': mensaje,
+            'estadisticas': estadisticas
+        })
+    
+    print(json.dumps(resultados, indent=2, ensure_ascii=False, default=str))
+    
+    return 0 if all(resultado['exito'] for resultado in resultados) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -23,10 +23,10 @@ class DataLoader:
     @staticmethod
     def cargar_archivo(ruta: str) -> Tuple[bool, str, Optional[pd.DataFrame]]:
         """
-        Carga el archivo Excel RAW
+        Carga el archivo RAW (Excel o Parquet)
         
         Args:
-            ruta: Ruta al archivo Excel
+            ruta: Ruta al archivo .xlsx o .parquet
             
         Returns:
             Tupla (éxito, mensaje, DataFrame)
@@ -35,8 +35,13 @@ class DataLoader:
             if not os.path.exists(ruta):
                 return False, f"El archivo no existe: {ruta}", None
             
-            # Leer con dtype str para preservar formatos
-            df = pd.read_excel(ruta, dtype=str)
+            if Path(ruta).suffix.lower() == '.parquet':
+                # Requiere pyarrow o fastparquet; valores como texto igual que en Excel
+                df = pd.read_parquet(ruta)
+                df = df.astype(object).where(df.isna(), df.astype(str))
+            else:
+                # Leer con dtype str para preservar formatos
+                df = pd.read_excel(ruta, dtype=str)
             
             mensaje = f"Archivo cargado ({len(df):,} registros)"
             return True, mensaje, df
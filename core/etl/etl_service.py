@@ -61,106 +61,161 @@ class ETLService:
         
         return " ".join(partes)
     
-    def procesar_completo(self, ruta_archivo_raw: str) -> Tuple[bool, str, Dict]:
+    def _ejecutar_paso(self, nombre: str, funcion: Callable, *args):
+        """
+        Ejecuta un paso del pipeline y registra su duración
+        
+        Args:
+            nombre: Nombre del paso en estadisticas['tiempos_etapas']
+            funcion: Función del servicio a ejecutar
+            *args: Argumentos de la función
+            
+        Returns:
+            Resultado de la función
+        """
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args)
+        finally:
+            self.estadisticas['tiempos_etapas'][nombre] = round(time.perf_counter() - inicio, 4)
+    
+    def procesar_completo(self,
+                          ruta_archivo_raw: str,
+                          carpeta_salida: Optional[str] = None) -> Tuple[bool, str, Dict]:
         """
         Ejecuta el pipeline completo de procesamiento ETL
         
         Args:
-            ruta_archivo_raw: Ruta al archivo Excel de entrada
+            ruta_archivo_raw: Ruta al archivo de entrada (.xlsx o .parquet)
+            carpeta_salida: Carpeta del archivo limpio (None = data/clean)
             
         Returns:
-            Tupla (éxito, mensaje, estadísticas)
+            Tupla (éxito, mensaje, estadísticas); estadisticas['tiempos_etapas']
+            contiene los segundos de cada paso
         """
         inicio_tiempo = time.time()
+        self.estadisticas['tiempos_etapas'] = {}
         
         self._report_progress(0, "🚀 Iniciando procesamiento ETL...")
         
         try:
             # PASO 1: Carga y validación inicial
             self._report_progress(2, "📂 Cargando archivo Excel...")
-            exito, mensaje, self.df = DataLoader.cargar_archivo(ruta_archivo_raw)
+            exito, mensaje, self.df = self._ejecutar_paso(
+                'cargar_archivo', DataLoader.cargar_archivo, ruta_archivo_raw
+            )
             if not exito:
                 return False, mensaje, self.estadisticas
             self.estadisticas['registros_originales'] = len(self.df)
             
             self._report_progress(5, "🔍 Filtrando columnas necesarias...")
-            exito, mensaje, self.df = DataLoader.filtrar_columnas_necesarias(self.df)
+            exito, mensaje, self.df = self._ejecutar_paso(
+                'filtrar_columnas_necesarias', DataLoader.filtrar_columnas_necesarias, self.df
+            )
             if not exito:
                 return False, mensaje, self.estadisticas
             self.estadisticas['columnas_eliminadas'] = len(self.df.columns) - len(DataLoader.COLUMNAS_REQUERIDAS)
             
             self._report_progress(9, "🔍 Validando estructura de datos...")
-            exito, mensaje = DataLoader.validar_columnas(self.df)
+            exito, mensaje = self._ejecutar_paso(
+                'validar_columnas', DataLoader.validar_columnas, self.df
+            )
             if not exito:
                 return False, mensaje, self.estadisticas
             
             # PASO 2: Limpieza de datos
             self._report_progress(13, "🧹 Eliminando filas con datos nulos...")
-            exito, mensaje, self.df = DataCleaner.eliminar_filas_nulas(self.df)
+            exito, mensaje, self.df = self._ejecutar_paso(
+                'eliminar_filas_nulas', DataCleaner.eliminar_filas_nulas, self.df
+            )
             if not exito:
                 return False, mensaje, self.estadisticas
             self.estadisticas['filas_nulas_eliminadas'] = self.estadisticas['registros_originales'] - len(self.df)
             
             self._report_progress(17, "🚫 Limpiando registros anulados...")
-            exito, mensaje, self.df = DataCleaner.limpiar_anulados(self.df)
+            exito, mensaje, self.df = self._ejecutar_paso(
+                'limpiar_anulados', DataCleaner.limpiar_anulados, self.df
+            )
             if not exito:
                 return False, mensaje, self.estadisticas
             self.estadisticas['registros_anulados'] = self.estadisticas['registros_originales'] - len(self.df) - self.estadisticas['filas_nulas_eliminadas']
             
             self._report_progress(21, "🔧 Formateando columnas...")
-            exito, mensaje, self.df = DataCleaner.formatear_columnas(self.df)
+            exito, mensaje, self.df = self._ejecutar_paso(
+                'formatear_columnas', DataCleaner.formatear_columnas, self.df
+            )
             if not exito:
                 return False, mensaje, self.estadisticas
             
             self._report_progress(25, "📅 Detectando fechas inválidas...")
-            exito, mensaje, self.df = DataCleaner.detectar_fechas_invalidas(self.df)
+            exito, mensaje, self.df = self._ejecutar_paso(
+                'detectar_fechas_invalidas', DataCleaner.detectar_fechas_invalidas, self.df
+            )
             if not exito:
                 return False, mensaje, self.estadisticas
             self.estadisticas['fechas_invalidas'] = self.estadisticas['registros_originales'] - len(self.df) - self.estadisticas['filas_nulas_eliminadas'] - self.estadisticas['registros_anulados']
             
             self._report_progress(29, "♻️ Eliminando registros duplicados...")
-            exito, mensaje, self.df = DataCleaner.eliminar_duplicados(self.df)
+            exito, mensaje, self.df = self._ejecutar_paso(
+                'eliminar_duplicados', DataCleaner.eliminar_duplicados, self.df
+            )
             if not exito:
                 return False, mensaje, self.estadisticas
             self.estadisticas['duplicados_eliminados'] = self.estadisticas['registros_originales'] - len(self.df) - self.estadisticas['filas_nulas_eliminadas'] - self.estadisticas['registros_anulados'] - self.estadisticas['fechas_invalidas']
             
             # PASO 3: Procesamiento de contratos
             self._report_progress(33, "📅 Dividiendo contratos por mes...")
-            exito, mensaje, self.df = ContractSplitter.dividir_contratos_por_mes(self.df)
+            exito, mensaje, self.df = self._ejecutar_paso(
+                'dividir_contratos_por_mes', ContractSplitter.dividir_contratos_por_mes, self.df
+            )
             if not exito:
                 return False, mensaje, self.estadisticas
             self.estadisticas['contratos_divididos'] = len(self.df) - (self.estadisticas['registros_originales'] - self.estadisticas['filas_nulas_eliminadas'] - self.estadisticas['registros_anulados'] - self.estadisticas['fechas_invalidas'] - self.estadisticas['duplicados_eliminados'])
             
             self._report_progress(45, "📆 Agregando MES_ANALIZADO...")
-            exito, mensaje, self.df = DateProcessor.agregar_mes_analizado(self.df)
+            exito, mensaje, self.df = self._ejecutar_paso(
+                'agregar_mes_analizado', DateProcessor.agregar_mes_analizado, self.df
+            )
             if not exito:
                 return False, mensaje, self.estadisticas
             
             # PASO 4: Consolidación y generación de certificados
             self._report_progress(55, "📋 Consolidando períodos contiguos...")
-            exito, mensaje, self.df = PeriodConsolidator.consolidar_y_generar_fechas(self.df)
+            exito, mensaje, self.df = self._ejecutar_paso(
+                'consolidar_y_generar_fechas',
+                PeriodConsolidator.consolidar_y_generar_fechas,
+                self.df
+            )
             if not exito:
                 return False, mensaje, self.estadisticas
             self.estadisticas['certificados_generados'] = len(self.df)
             
             self._report_progress(70, "⏱️ Calculando días laborados...")
-            exito, mensaje, self.df = DateProcessor.calcular_dias_laborados(self.df)
+            exito, mensaje, self.df = self._ejecutar_paso(
+                'calcular_dias_laborados', DateProcessor.calcular_dias_laborados, self.df
+            )
             if not exito:
                 return False, mensaje, self.estadisticas
             
             self._report_progress(80, "🗓️ Agregando FECHA_GENERAR...")
-            exito, mensaje, self.df = DateProcessor.agregar_fecha_generar(self.df)
+            exito, mensaje, self.df = self._ejecutar_paso(
+                'agregar_fecha_generar', DateProcessor.agregar_fecha_generar, self.df
+            )
             if not exito:
                 return False, mensaje, self.estadisticas
             
             self._report_progress(87, "🔤 Convirtiendo fechas a texto en español...")
-            exito, mensaje, self.df = DateProcessor.convertir_fechas_a_texto(self.df)
+            exito, mensaje, self.df = self._ejecutar_paso(
+                'convertir_fechas_a_texto', DateProcessor.convertir_fechas_a_texto, self.df
+            )
             if not exito:
                 return False, mensaje, self.estadisticas
             
             # PASO 5: Guardado final
             self._report_progress(95, "💾 Guardando archivo procesado...")
-            exito, mensaje, ruta_salida = FileGenerator.guardar_archivo(self.df)
+            exito, mensaje, ruta_salida = self._ejecutar_paso(
+                'guardar_archivo', FileGenerator.guardar_archivo, self.df, carpeta_salida
+            )
             if not exito:
                 return False, mensaje, self.estadisticas
             
@@ -6,19 +6,20 @@ import pandas as pd
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple
+from typing import Tuple, Optional
 from config.paths import AppPaths
 
 class FileGenerator:
     """Servicio para generación de archivos de salida"""
     
     @staticmethod
-    def guardar_archivo(df: pd.DataFrame) -> Tuple[bool, str, str]:
+    def guardar_archivo(df: pd.DataFrame, carpeta_salida: Optional[str] = None) -> Tuple[bool, str, str]:
         """
         Guarda el DataFrame procesado
         
         Args:
             df: DataFrame a guardar
+            carpeta_salida: Carpeta de destino (None = data/clean)
             
         Returns:
             Tupla (éxito, mensaje, ruta de salida)
@@ -26,10 +27,11 @@ class FileGenerator:
         try:
             timestamp = datetime.now().strftime("%d.%m.%Y_%H.%M.%S")
             nombre_archivo = f"clean_{timestamp}.xlsx"
-            ruta_salida = AppPaths.get_clean_dir() / nombre_archivo
+            carpeta = Path(carpeta_salida) if carpeta_salida else AppPaths.get_clean_dir()
+            ruta_salida = carpeta / nombre_archivo
             
             # Asegurar que el directorio existe
-            AppPaths.get_clean_dir().mkdir(parents=True, exist_ok=True)
+            carpeta.mkdir(parents=True, exist_ok=True)
             
             df.to_excel(ruta_salida, index=False, engine='openpyxl')
             
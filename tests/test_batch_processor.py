@@ -0,0 +1,60 @@
+"""
+Pruebas de CertificateBatchProcessor con la plantilla y los datos sintéticos
+de los benchmarks (sin MS Word).
+"""
+
+import os
+
+import pytest
+
+from benchmarks.synthetic import make_certificates_df, make_template
+from core.certificates.batch_processor import CertificateBatchProcessor
+from core.certificates.run_manifest import RunManifest
+
+
+@pytest.fixture
+def template(tmp_path):
+    """Plantilla sintética: tiene {{CLIENTE}} en el encabezado"""
+    return make_template(str(tmp_path / "plantilla.docx"))
+
+
+def test_native_rejects_header_placeholders_before_any_output(template, tmp_path):
+    processor = CertificateBatchProcessor(template, str(tmp_path / "salida"))
+    
+    results = processor.process(make_certificates_df(5), {'pdf_backend': 'native'})
+    
+    assert not results['success']
+    assert "encabezados o pies de página" in results['errors'][0]
+    assert results['word_results'] is None
+    assert os.listdir(processor.word_folder) == []
+
+
+def test_folder_conversion_plan_counts_pending_rows(template, tmp_path):
+    processor = CertificateBatchProcessor(template, str(tmp_path / "salida"))
+    options = processor._validate_options({'generate_word': False})
+    manifest = RunManifest(processor.output_folder)
+    
+    plan = processor._plan_resume(make_certificates_df(4), manifest, options)
+    
+    assert plan['pendientes_pdf'] == [0, 1, 2, 3]
+    assert plan['resumen'] == {'omitidos': 0, 'pendientes_word': 0, 'pendientes_pdf': 4}
+
+
+def test_zip_mode_keeps_manifest_inside_archive(template, tmp_path):
+    df = make_certificates_df(3)
+    options = {'output_mode': 'zip', 'convert_pdf': False}
+    processor = CertificateBatchProcessor(template, str(tmp_path / "salida"))
+    
+    results = processor.process(df, options)
+    
+    assert results['success']
+    assert os.listdir(processor.output_folder) == [os.path.basename(results['archives'][0])]
+    
+    # La reanudación recupera el manifiesto desde el ZIP
+    resumed = CertificateBatchProcessor(template, str(tmp_path / "salida"),
+                                        resume_folder=processor.output_folder)
+    results = resumed.process(df, options)
+    
+    assert results['success']
+    assert results['resume']['omitidos'] == 3
+    assert not os.path.exists(os.path.join(resumed.output_folder, RunManifest.MANIFEST_FILENAME))
@@ -0,0 +1,63 @@
+"""
+Pruebas de los motores de conversión: un PDF de una ejecución previa no
+cuenta como éxito si la conversión actual falla.
+"""
+
+import os
+import stat
+import platform
+
+import pytest
+
+from core.certificates.converter_backends import (
+    MINIMAL_PDF, ConverterBackend, LibreOfficeBackend, WordCOMBackend
+)
+from tests.test_word_session import factory_for
+
+
+@pytest.fixture
+def stale(tmp_path):
+    """Docx de prueba con un PDF anterior no vacío en el destino"""
+    word_path = tmp_path / "doc.docx"
+    word_path.write_bytes(b"docx")
+    pdf_path = tmp_path / "doc.pdf"
+    pdf_path.write_bytes(MINIMAL_PDF)
+    return str(word_path), str(pdf_path)
+
+
+def test_word_failure_ignores_previous_pdf(stale):
+    word_path, pdf_path = stale
+    backend = WordCOMBackend(factory_for([], script=['permanente']))
+    session = backend.open_session()
+    
+    success, message = backend.convert_one(word_path, pdf_path, session, retry=1)
+    backend.close_session(session)
+    
+    assert not success
+    assert message.startswith("Error permanente")
+    assert not os.path.exists(pdf_path)
+
+
+@pytest.mark.skipif(platform.system() == "Windows", reason="soffice falso como script sh")
+def test_libreoffice_failure_ignores_previous_pdf(stale, tmp_path):
+    word_path, pdf_path = stale
+    soffice = tmp_path / "soffice"
+    soffice.write_text("#!/bin/sh\necho 'Error: source file could not be loaded' >&2\nexit 1\n")
+    soffice.chmod(soffice.stat().st_mode | stat.S_IEXEC)
+    
+    backend = LibreOfficeBackend(soffice_path=str(soffice))
+    backend.RETRY_DELAY = 0
+    
+    results = list(backend.convert_many([(word_path, pdf_path)], retry=1))
+    
+    assert [(path, success) for path, success, _ in results] == [(word_path, False)]
+    assert not os.path.exists(pdf_path)
+
+
+def test_incomplete_backend_fails_on_creation():
+    class SinConversion(ConverterBackend):
+        def _probe(self):
+            return True
+    
+    with pytest.raises(TypeError):
+        SinConversion()
@@ -0,0 +1,25 @@
+"""
+Pruebas de RenderCache: las salidas servidas desde la caché son archivos
+independientes de la entrada.
+"""
+
+import os
+
+from core.certificates.render_cache import RenderCache
+
+
+def test_fetched_output_does_not_share_the_entry(tmp_path):
+    cache = RenderCache(str(tmp_path / "cache"))
+    cache.store_bytes("clave", ".pdf", b"%PDF contenido")
+    
+    first = tmp_path / "primero.pdf"
+    assert cache.fetch("clave", ".pdf", str(first))
+    os.utime(first, (1_000_000, 1_000_000))
+    
+    # Un acierto posterior marca la entrada como reciente sin tocar la salida previa
+    assert cache.fetch("clave", ".pdf", str(tmp_path / "segundo.pdf"))
+    assert first.stat().st_mtime == 1_000_000
+    
+    # Editar la salida no altera la entrada de la caché
+    first.write_bytes(b"editado")
+    assert cache.read("clave", ".pdf") == b"%PDF contenido"
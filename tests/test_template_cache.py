@@ -0,0 +1,49 @@
+"""
+Pruebas del plan de renderizado de TemplateCache con placeholders partidos
+entre runs, como los guarda Word al editar la plantilla.
+"""
+
+import io
+
+import pytest
+from docx import Document
+
+from core.certificates.template_cache import TemplateCache
+
+
+@pytest.fixture
+def split_template(tmp_path):
+    """
+    Plantilla con placeholders partidos entre runs en el cuerpo y en una
+    tabla: el XML de la parte no contiene '{{' literal.
+    """
+    document = Document()
+    
+    para = document.add_paragraph("Cliente: ")
+    for piece in ("{", "{CLIEN", "TE}}"):
+        para.add_run(piece)
+    
+    cell = document.add_table(rows=1, cols=1).cell(0, 0)
+    for piece in ("Cargo: {", "{CARGO}}"):
+        cell.paragraphs[0].add_run(piece)
+    
+    path = tmp_path / "partida.docx"
+    document.save(str(path))
+    
+    yield str(path)
+    TemplateCache.clear()
+
+
+def test_split_placeholders_are_indexed(split_template):
+    entry = TemplateCache.get(split_template)
+    
+    assert entry.placeholders == ['CARGO', 'CLIENTE']
+
+
+def test_split_placeholders_are_rendered(split_template):
+    entry = TemplateCache.get(split_template)
+    
+    rendered = Document(io.BytesIO(entry.render({'CLIENTE': 'ACME', 'CARGO': 'JEFE'})))
+    
+    assert rendered.paragraphs[0].text == "Cliente: ACME"
+    assert rendered.tables[0].cell(0, 0).text == "Cargo: JEFE"
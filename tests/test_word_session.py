@@ -0,0 +1,216 @@
+"""
+Pruebas de WordSession con instancias de Word falsas (sin MS Word).
+"""
+
+import threading
+
+import pytest
+
+from core.certificates.word_session import WordAutomation, WordSession
+from core.certificates.converter_backends import MINIMAL_PDF, WordCOMBackend
+from core.certificates.conversion_errors import ConversionTimeout
+
+
+class ScriptedAutomation(WordAutomation):
+    """
+    Instancia falsa que sigue un guion compartido: cada convert toma la
+    siguiente acción ('ok', 'transitorio', 'permanente', 'cuelgue');
+    sin guion, convierte.
+    """
+    
+    def __init__(self, script=None, killable=True, created=None):
+        self.script = script if script is not None else []
+        self.killable = killable
+        self.running = False
+        self.quit_calls = 0
+        self.killed = threading.Event()
+        if created is not None:
+            created.append(self)
+    
+    def start(self):
+        self.running = True
+    
+    def convert(self, word_path, pdf_path):
+        assert self.running, "convert sobre una instancia sin iniciar"
+        action = self.script.pop(0) if self.script else 'ok'
+        
+        if action == 'transitorio':
+            raise RuntimeError("Llamada rechazada por el destinatario")
+        if action == 'permanente':
+            raise RuntimeError("El documento está dañado")
+        if action == 'cuelgue':
+            self.killed.wait()
+            raise RuntimeError("El servidor RPC no está disponible")
+        
+        with open(pdf_path, 'wb') as f:
+            f.write(MINIMAL_PDF)
+    
+    def quit(self):
+        self.running = False
+        self.quit_calls += 1
+    
+    def kill(self):
+        if not self.killable:
+            return False
+        self.killed.set()
+        return True
+
+
+def factory_for(created, script=None, killable=True):
+    """Constructor de instancias que registra cada una en created"""
+    return lambda: ScriptedAutomation(script, killable, created)
+
+
+@pytest.fixture
+def docs(tmp_path):
+    """Rutas (docx, pdf) de prueba; el docx no se lee"""
+    def make(name):
+        word_path = tmp_path / f"{name}.docx"
+        word_path.write_bytes(b"docx")
+        return str(word_path), str(tmp_path / f"{name}.pdf")
+    return make
+
+
+def test_instance_is_opened_once_and_reused(docs):
+    created = []
+    session = WordSession(factory_for(created))
+    
+    for idx in range(3):
+        session.convert(*docs(f"doc{idx}"))
+    
+    assert len(created) == 1
+    stats = session.get_stats()
+    assert stats['started'] == 1
+    assert stats['documents'] == 3
+    
+    session.close()
+    assert created[0].quit_calls >= 1
+    assert not created[0].running
+
+
+def test_each_thread_gets_its_own_instance(docs):
+    created = []
+    session = WordSession(factory_for(created))
+    
+    threads = [threading.Thread(target=session.convert, args=docs(f"hilo{idx}"))
+               for idx in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(created) == 2
+    assert session.get_stats()['started'] == 2
+    
+    # Las instancias de otros hilos se terminan por proceso, sin Quit por COM
+    session.close()
+    assert all(instance.killed.is_set() for instance in created)
+    assert all(instance.quit_calls == 0 for instance in created)
+
+
+def test_incomplete_automation_fails_on_creation():
+    class SinKill(WordAutomation):
+        def start(self):
+            pass
+        
+        def convert(self, word_path, pdf_path):
+            pass
+        
+        def quit(self):
+            pass
+    
+    with pytest.raises(TypeError):
+        SinKill()
+
+
+def test_instance_is_recycled_after_n_documents(docs):
+    created = []
+    session = WordSession(factory_for(created), recycle_after=2)
+    
+    for idx in range(5):
+        session.convert(*docs(f"doc{idx}"))
+    
+    stats = session.get_stats()
+    assert stats['recycled'] == 2
+    assert stats['started'] == 3
+    assert stats['documents'] == 5
+    assert [instance.running for instance in created] == [False, False, True]
+    session.close()
+
+
+def test_transient_error_is_retried_on_a_new_instance(docs):
+    created = []
+    backend = WordCOMBackend(factory_for(created, script=['transitorio', 'ok']))
+    backend.RETRY_DELAY = 0
+    session = backend.open_session()
+    
+    word_path, pdf_path = docs("reintento")
+    success, message = backend.convert_one(word_path, pdf_path, session, retry=3)
+    backend.close_session(session)
+    
+    assert success and message == pdf_path
+    assert len(created) == 2
+    assert backend.session_stats['discarded'] == 1
+    assert backend.session_stats['documents'] == 1
+
+
+def test_permanent_error_is_not_retried(docs):
+    created = []
+    backend = WordCOMBackend(factory_for(created, script=['permanente', 'ok']))
+    backend.RETRY_DELAY = 0
+    session = backend.open_session()
+    
+    success, message = backend.convert_one(*docs("dañado"), session, retry=3)
+    backend.close_session(session)
+    
+    assert not success
+    assert message.startswith("Error permanente")
+    assert len(created) == 1
+    assert backend.session_stats['documents'] == 0
+
+
+def test_watchdog_kills_hung_instance_and_replaces_it(docs):
+    created = []
+    session = WordSession(factory_for(created, script=['cuelgue']), timeout=0.1)
+    
+    with pytest.raises(ConversionTimeout):
+        session.convert(*docs("colgado"))
+    
+    assert created[0].killed.is_set()
+    assert session.get_stats()['timeouts'] == 1
+    assert not session.hung.is_set()
+    
+    # El siguiente documento arranca una instancia nueva
+    session.convert(*docs("siguiente"))
+    assert len(created) == 2
+    assert session.get_stats()['documents'] == 1
+    session.close()
+
+
+def test_unkillable_hang_marks_session_as_hung(docs):
+    created = []
+    session = WordSession(factory_for(created, script=['cuelgue'], killable=False), timeout=0.1)
+    
+    errors = []
+    
+    def convert():
+        try:
+            session.convert(*docs("bloqueado"))
+        except Exception as e:
+            errors.append(e)
+    
+    thread = threading.Thread(target=convert, daemon=True)
+    thread.start()
+    
+    assert session.hung.wait(5)
+    assert thread.is_alive()
+    stats = session.get_stats()
+    assert stats['timeouts'] == 1
+    assert stats['abandoned'] == 1
+    
+    # Liberar el hilo bloqueado al terminar la prueba
+    created[0].killed.set()
+    thread.join(5)
+    assert isinstance(errors[0], ConversionTimeout)
+    # El timeout ya se contó al marcar la sesión como bloqueada
+    assert session.get_stats()['timeouts'] == 1